@@ -0,0 +1,61 @@
+"""hourly and daily analytics rollups
+
+Revision ID: add_analytics_rollups
+Revises: add_request_metrics
+Create Date: 2026-10-17 18:00:00.000000
+
+The tables start empty: the first rollup run begins at the oldest event, log
+or request metric and backfills ANALYTICS_ROLLUP_MAX_HOURS per run, or all at
+once with python -m app.jobs.rollup_analytics.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_analytics_rollups'
+down_revision = 'add_request_metrics'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    for table in ('event_counts_hourly', 'event_counts_daily'):
+        op.create_table(
+            table,
+            sa.Column('bucket_start', sa.DateTime(), nullable=False),
+            sa.Column('event_type', sa.String(), nullable=False),
+            sa.Column('event_category', sa.String(), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+            sa.PrimaryKeyConstraint('bucket_start', 'event_type', 'event_category')
+        )
+    op.create_table(
+        'request_metrics_daily',
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('method', sa.String(length=10), nullable=False),
+        sa.Column('route', sa.String(), nullable=False),
+        sa.Column('status_class', sa.String(length=3), nullable=False),
+        sa.Column('request_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sampled_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_ms_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('duration_ms_max', sa.Float(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('bucket_start', 'method', 'route', 'status_class')
+    )
+    op.create_table(
+        'daily_active_users',
+        sa.Column('day', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'user_id')
+    )
+    op.create_table(
+        'rollup_state',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('high_water_mark', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+def downgrade():
+    op.drop_table('rollup_state')
+    op.drop_table('daily_active_users')
+    op.drop_table('request_metrics_daily')
+    op.drop_table('event_counts_daily')
+    op.drop_table('event_counts_hourly')
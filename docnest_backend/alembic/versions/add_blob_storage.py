@@ -0,0 +1,39 @@
+"""add content-addressed blob storage
+
+Revision ID: add_blob_storage
+Revises: add_google_auth_fields
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_blob_storage'
+down_revision = 'add_google_auth_fields'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('storage_key', sa.String(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('content_type', sa.String(), nullable=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('sha256'),
+        sa.UniqueConstraint('storage_key')
+    )
+
+    # Existing documents keep their own objects (blob_sha256 stays NULL)
+    op.add_column('documents', sa.Column('blob_sha256', sa.String(length=64), nullable=True))
+    op.create_foreign_key('fk_documents_blob_sha256', 'documents', 'blobs', ['blob_sha256'], ['sha256'])
+    op.create_index('ix_documents_blob_sha256', 'documents', ['blob_sha256'])
+
+def downgrade():
+    op.drop_index('ix_documents_blob_sha256', table_name='documents')
+    op.drop_constraint('fk_documents_blob_sha256', 'documents', type_='foreignkey')
+    op.drop_column('documents', 'blob_sha256')
+    op.drop_table('blobs')
@@ -0,0 +1,49 @@
+"""move categories into their own table with document counts
+
+Revision ID: add_categories_table
+Revises: add_hot_query_indexes
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_categories_table'
+down_revision = 'add_hot_query_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'categories',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('owner_id', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('document_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('owner_id', 'name', name='uq_categories_owner_name')
+    )
+
+    # Every category that has documents, with its current count
+    op.execute("""
+        INSERT INTO categories (id, owner_id, name, document_count, created_at)
+        SELECT gen_random_uuid()::text, owner_id, category, count(*), min(created_at)
+        FROM documents
+        GROUP BY owner_id, category
+    """)
+
+    # Custom categories that have no documents yet
+    op.execute("""
+        INSERT INTO categories (id, owner_id, name, document_count, created_at)
+        SELECT gen_random_uuid()::text, u.id, c.name, 0, now()
+        FROM users u, unnest(u.custom_categories) AS c(name)
+        WHERE c.name IS NOT NULL
+        ON CONFLICT (owner_id, name) DO NOTHING
+    """)
+
+def downgrade():
+    # users.custom_categories was kept in sync, nothing to copy back
+    op.drop_table('categories')
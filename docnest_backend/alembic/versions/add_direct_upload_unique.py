@@ -0,0 +1,37 @@
+"""make direct-upload keys unique among documents
+
+Revision ID: add_direct_upload_unique
+Revises: partition_log_tables
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_direct_upload_unique'
+down_revision = 'partition_log_tables'
+branch_labels = None
+depends_on = None
+
+DIRECT_UPLOAD_KEY = sa.text("file_path LIKE 'documents/%/uploads/%'")
+
+def upgrade():
+    # Blob-backed documents share their blob's key, so only direct-upload
+    # keys are unique. Duplicates left by concurrent finalize calls must be
+    # removed first, or the build fails and leaves an invalid index behind.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ux_documents_direct_upload_key', 'documents', ['file_path'],
+            unique=True,
+            postgresql_where=DIRECT_UPLOAD_KEY,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ux_documents_direct_upload_key', table_name='documents',
+            postgresql_concurrently=True, if_exists=True
+        )
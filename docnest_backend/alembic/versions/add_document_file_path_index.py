@@ -0,0 +1,21 @@
+"""index documents.file_path for storage reconciliation
+
+Revision ID: add_document_file_path_index
+Revises: add_blob_storage
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_document_file_path_index'
+down_revision = 'add_blob_storage'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # The orphan reconciliation job looks up listed keys in pages of 1000
+    op.create_index('ix_documents_file_path', 'documents', ['file_path'])
+
+def downgrade():
+    op.drop_index('ix_documents_file_path', table_name='documents')
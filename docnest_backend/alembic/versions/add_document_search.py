@@ -0,0 +1,45 @@
+"""full-text search vector over document names and descriptions
+
+Revision ID: add_document_search
+Revises: add_usage_counters
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_document_search'
+down_revision = 'add_usage_counters'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Generated, so Postgres keeps it current on every insert and update of
+    # name or description; names rank above descriptions (weight A vs B)
+    op.execute("""
+        ALTER TABLE documents ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+        ) STORED
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_documents_search_vector',
+            'documents',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_documents_search_vector',
+            table_name='documents',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+    op.drop_column('documents', 'search_vector')
@@ -0,0 +1,48 @@
+"""index the document list and analytics queries
+
+Revision ID: add_hot_query_indexes
+Revises: add_document_file_path_index
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_hot_query_indexes'
+down_revision = 'add_document_file_path_index'
+branch_labels = None
+depends_on = None
+
+API_REQUEST = sa.text("event_type = 'api_request'")
+
+INDEXES = [
+    # Document list: owner_id (+ category), newest first, id breaking created_at ties
+    ('ix_documents_owner_created', 'documents', ['owner_id', 'created_at', 'id'], {}),
+    ('ix_documents_owner_category_created', 'documents', ['owner_id', 'category', 'created_at', 'id'], {}),
+    # /analytics/logs
+    ('ix_activity_logs_created_at', 'activity_logs', ['created_at'], {}),
+    ('ix_activity_logs_action_created', 'activity_logs', ['action', 'created_at'], {}),
+    # /analytics/events and /analytics/summary
+    ('ix_analytics_events_created_at', 'analytics_events', ['created_at'], {}),
+    ('ix_analytics_events_type_created', 'analytics_events', ['event_type', 'created_at'], {}),
+    ('ix_analytics_events_api_request_created', 'analytics_events', ['created_at', 'duration'],
+     {'postgresql_where': API_REQUEST, 'sqlite_where': API_REQUEST}),
+]
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, but it keeps
+    # the tables writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs
+            )
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
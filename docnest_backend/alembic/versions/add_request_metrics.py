@@ -0,0 +1,50 @@
+"""hourly per-route request metrics
+
+Revision ID: add_request_metrics
+Revises: add_text_extraction
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_request_metrics'
+down_revision = 'add_text_extraction'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'request_metrics',
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('method', sa.String(length=10), nullable=False),
+        sa.Column('route', sa.String(), nullable=False),
+        sa.Column('status_class', sa.String(length=3), nullable=False),
+        sa.Column('request_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sampled_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_ms_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('duration_ms_max', sa.Float(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('bucket_start', 'method', 'route', 'status_class')
+    )
+
+    # Request timings no longer go to analytics_events as api_request rows
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_analytics_events_api_request_created',
+            table_name='analytics_events',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_analytics_events_api_request_created',
+            'analytics_events',
+            ['created_at', 'duration'],
+            postgresql_where=sa.text("event_type = 'api_request'"),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+    op.drop_table('request_metrics')
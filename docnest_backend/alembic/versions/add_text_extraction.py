@@ -0,0 +1,92 @@
+"""extracted file text in the search vector, with extraction status
+
+Revision ID: add_text_extraction
+Revises: add_document_search
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_text_extraction'
+down_revision = 'add_document_search'
+branch_labels = None
+depends_on = None
+
+EXTRACTABLE = """
+    file_type IN ('application/pdf', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document')
+    OR file_type LIKE 'text/%'
+"""
+
+def upgrade():
+    op.create_table(
+        'text_extractions',
+        sa.Column('document_id', sa.String(), nullable=False),
+        sa.Column('source_key', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('extracted_chars', sa.Integer(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('document_id')
+    )
+    op.create_index(
+        'ix_text_extractions_status_next_attempt',
+        'text_extractions',
+        ['status', 'next_attempt_at']
+    )
+    op.add_column('documents', sa.Column('content_text', sa.Text(), nullable=True))
+
+    # A generated column's expression cannot be altered: rebuild it with the
+    # file text at the lowest weight, then rebuild its GIN index concurrently
+    op.drop_index('ix_documents_search_vector', table_name='documents', if_exists=True)
+    op.drop_column('documents', 'search_vector')
+    op.execute("""
+        ALTER TABLE documents ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(content_text, '')), 'C')
+        ) STORED
+    """)
+
+    # Every existing file is queued; the pipeline's sweep works through them
+    op.execute(f"""
+        INSERT INTO text_extractions (document_id, source_key, status, attempts, next_attempt_at, updated_at)
+        SELECT id, file_path, CASE WHEN {EXTRACTABLE} THEN 'pending' ELSE 'unsupported' END, 0, now(), now()
+        FROM documents
+        WHERE file_path IS NOT NULL
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_documents_search_vector',
+            'documents',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+def downgrade():
+    op.drop_index('ix_documents_search_vector', table_name='documents', if_exists=True)
+    op.drop_column('documents', 'search_vector')
+    op.drop_column('documents', 'content_text')
+    op.execute("""
+        ALTER TABLE documents ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+        ) STORED
+    """)
+    op.create_index(
+        'ix_documents_search_vector',
+        'documents',
+        ['search_vector'],
+        postgresql_using='gin'
+    )
+    op.drop_index('ix_text_extractions_status_next_attempt', table_name='text_extractions')
+    op.drop_table('text_extractions')
@@ -0,0 +1,52 @@
+"""per-user and per-category storage usage counters
+
+Revision ID: add_usage_counters
+Revises: add_categories_table
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_usage_counters'
+down_revision = 'add_categories_table'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'user_usage',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('total_bytes', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('document_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.add_column(
+        'categories',
+        sa.Column('total_bytes', sa.BigInteger(), nullable=False, server_default='0')
+    )
+
+    # One aggregate scan now, so requests never need one
+    op.execute("""
+        INSERT INTO user_usage (user_id, total_bytes, document_count, updated_at)
+        SELECT owner_id, coalesce(sum(file_size), 0), count(*), now()
+        FROM documents
+        GROUP BY owner_id
+    """)
+    op.execute("""
+        UPDATE categories c
+        SET total_bytes = d.total_bytes
+        FROM (
+            SELECT owner_id, category, coalesce(sum(file_size), 0) AS total_bytes
+            FROM documents
+            GROUP BY owner_id, category
+        ) d
+        WHERE c.owner_id = d.owner_id AND c.name = d.category
+    """)
+
+def downgrade():
+    op.drop_column('categories', 'total_bytes')
+    op.drop_table('user_usage')
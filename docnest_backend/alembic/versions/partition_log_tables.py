@@ -0,0 +1,92 @@
+"""monthly range partitions for analytics_events and activity_logs
+
+Revision ID: partition_log_tables
+Revises: add_analytics_rollups
+Create Date: 2026-10-17 19:00:00.000000
+
+Each table is rebuilt as a table partitioned by month on created_at: one
+partition per month from the oldest row to PARTITION_MONTHS_AHEAD months from
+now, plus a default partition for anything outside them. created_at joins the
+primary key, as Postgres requires of a partition key. Later months are created
+by python -m app.jobs.maintain_partitions, which also applies the retention.
+
+The rows are copied into the new tables, which are locked meanwhile: run it
+when analytics writes can wait, and roll the analytics up first
+(python -m app.jobs.rollup_analytics) if old months are to be expired soon.
+"""
+import os
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'partition_log_tables'
+down_revision = 'add_analytics_rollups'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    'analytics_events': [
+        ('ix_analytics_events_created_at', ['created_at'], None),
+        ('ix_analytics_events_type_created', ['event_type', 'created_at'], None),
+    ],
+    'activity_logs': [
+        ('ix_activity_logs_created_at', ['created_at'], None),
+        ('ix_activity_logs_action_created', ['action', 'created_at'], None),
+    ],
+}
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+def _rebuild(table, partitioned):
+    """Recreate `table` with the same columns, copy its rows over and drop the old one"""
+    old = f'{table}_old'
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'ALTER INDEX {table}_pkey RENAME TO {old}_pkey')
+    for name, _, _ in INDEXES[table]:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+
+    op.execute(
+        f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)'
+        + (' PARTITION BY RANGE (created_at)' if partitioned else '')
+    )
+    op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id{", created_at" if partitioned else ""})')
+    op.execute(f'ALTER TABLE {table} ADD FOREIGN KEY (user_id) REFERENCES users (id)')
+    # On a partitioned table these are templates, created on every partition
+    for name, columns, where in INDEXES[table]:
+        op.create_index(name, table, columns, postgresql_where=sa.text(where) if where else None)
+
+    if partitioned:
+        # The partition key cannot be NULL; such rows predate the column default
+        op.execute(f"UPDATE {old} SET created_at = '1970-01-01' WHERE created_at IS NULL")
+        current = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        # Monthly partitions start at the oldest row of the last ten years; older
+        # rows, the backfilled 1970 ones included, go to the default partition
+        oldest = op.get_bind().execute(
+            sa.text(f'SELECT min(created_at) FROM {old} WHERE created_at >= :since'),
+            {'since': _add_months(current, -120)}
+        ).scalar()
+        month = min(oldest or current, current).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        last = _add_months(current, int(os.getenv('PARTITION_MONTHS_AHEAD', '3')))
+        while month <= last:
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+            )
+            month = _add_months(month, 1)
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    op.execute(f'DROP TABLE {old}')
+    op.execute(f'ANALYZE {table}')
+
+def upgrade():
+    for table in INDEXES:
+        _rebuild(table, partitioned=True)
+
+def downgrade():
+    for table in INDEXES:
+        _rebuild(table, partitioned=False)
@@ -1,8 +1,8 @@
 # app/api/v1/analytics_router.py
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from app.db.session import get_db
 from app.core.auth import get_current_user
 from app.models.user import User
@@ -10,113 +10,80 @@ from app.models.activity_log import ActivityLog
 from app.models.analytics_event import AnalyticsEvent
 from app.schemas.analytics import (
     ActivityLogResponse,
+    ActivityLogListAdapter,
     AnalyticsEventResponse,
+    AnalyticsEventListAdapter,
     AnalyticsSummary
 )
-from sqlalchemy import func, and_, distinct
+from app.services.analytics_rollups import AnalyticsRollupService
+from app.utils.pagination import NEXT_CURSOR_HEADER, page_size, paginate
+from app.utils.responses import list_response
+from sqlalchemy import select
 
 analytics_router = APIRouter()
 
 @analytics_router.get("/logs", response_model=List[ActivityLogResponse])
 async def get_activity_logs(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     action: Optional[str] = None,
     resource_type: Optional[str] = None,
-    limit: int = Query(50, le=100),
-    offset: int = 0
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size)
 ):
     """Get activity logs with optional filtering"""
-    query = db.query(ActivityLog)
+    query = select(ActivityLog)
     
     if start_date:
-        query = query.filter(ActivityLog.created_at >= start_date)
+        query = query.where(ActivityLog.created_at >= start_date)
     if end_date:
-        query = query.filter(ActivityLog.created_at <= end_date)
+        query = query.where(ActivityLog.created_at <= end_date)
     if action:
-        query = query.filter(ActivityLog.action == action)
+        query = query.where(ActivityLog.action == action)
     if resource_type:
-        query = query.filter(ActivityLog.resource_type == resource_type)
+        query = query.where(ActivityLog.resource_type == resource_type)
         
-    return query.order_by(ActivityLog.created_at.desc())\
-                .offset(offset)\
-                .limit(limit)\
-                .all()
+    rows, next_cursor = await paginate(db, query, ActivityLog, cursor, limit)
+    return list_response(ActivityLogListAdapter, rows, {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
 
 @analytics_router.get("/events", response_model=List[AnalyticsEventResponse])
 async def get_analytics_events(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
     event_type: Optional[str] = None,
     event_category: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    limit: int = Query(50, le=100),
-    offset: int = 0
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size)
 ):
     """Get analytics events with optional filtering"""
-    query = db.query(AnalyticsEvent)
+    query = select(AnalyticsEvent)
     
     if event_type:
-        query = query.filter(AnalyticsEvent.event_type == event_type)
+        query = query.where(AnalyticsEvent.event_type == event_type)
     if event_category:
-        query = query.filter(AnalyticsEvent.event_category == event_category)
+        query = query.where(AnalyticsEvent.event_category == event_category)
     if start_date:
-        query = query.filter(AnalyticsEvent.created_at >= start_date)
+        query = query.where(AnalyticsEvent.created_at >= start_date)
     if end_date:
-        query = query.filter(AnalyticsEvent.created_at <= end_date)
+        query = query.where(AnalyticsEvent.created_at <= end_date)
         
-    return query.order_by(AnalyticsEvent.created_at.desc())\
-                .offset(offset)\
-                .limit(limit)\
-                .all()
+    rows, next_cursor = await paginate(db, query, AnalyticsEvent, cursor, limit)
+    return list_response(AnalyticsEventListAdapter, rows, {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
 
 @analytics_router.get("/summary", response_model=AnalyticsSummary)
 async def get_analytics_summary(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
     days: int = Query(30, ge=1, le=365)
 ):
-    """Get analytics summary for the specified time period"""
-    start_date = datetime.utcnow() - timedelta(days=days)
-    
-    # Get event counts by type
-    event_counts = db.query(
-        AnalyticsEvent.event_type,
-        func.count(AnalyticsEvent.id).label('count')
-    ).filter(
-        AnalyticsEvent.created_at >= start_date
-    ).group_by(
-        AnalyticsEvent.event_type
-    ).all()
-    
-    # Get average request duration
-    avg_duration = db.query(
-        func.avg(AnalyticsEvent.duration)
-    ).filter(
-        and_(
-            AnalyticsEvent.event_type == 'api_request',
-            AnalyticsEvent.created_at >= start_date
-        )
-    ).scalar()
-    
-    # Get daily active users
-    daily_users = db.query(
-        func.date_trunc('day', ActivityLog.created_at).label('date'),
-        func.count(distinct(ActivityLog.user_id)).label('count')
-    ).filter(
-        ActivityLog.created_at >= start_date
-    ).group_by(
-        func.date_trunc('day', ActivityLog.created_at)
-    ).all()
-    
-    return {
-        'event_counts': dict(event_counts),
-        'avg_request_duration_ms': round(avg_duration) if avg_duration else None,
-        'daily_active_users': [
-            {'date': day.date, 'count': day.count}
-            for day in daily_users
-        ]
-    }
\ No newline at end of file
+    """
+    Get analytics summary for the specified time period
+
+    Served from the hourly and daily rollups (app/services/analytics_rollups.py);
+    only activity since the last rollup run is read from the raw tables.
+    """
+    return await AnalyticsRollupService(db).summary(days)
@@ -2,7 +2,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, Body
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import ValidationError
 
 from app.core.auth import (
@@ -14,11 +14,12 @@ from app.core.auth import (
 
 
 )
-from app.core.exceptions import CategoryLimitExceeded, CategoryValidationError
+from app.core.exceptions import CategoryLimitExceeded, CategoryValidationError, CategoryInUse
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, TokenResponse
 from app.db.session import get_db
 from app.services.google_auth_service import GoogleAuthService
+from app.services.category_service import CategoryService, normalize_category
 from app.core.exceptions import (
     InvalidCredentialsException,
     UserAlreadyExistsException,
@@ -31,10 +32,10 @@ auth_router = APIRouter()
 @auth_router.post("/login", response_model=TokenResponse)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, str]:
     try:
-        user = authenticate_user(db, form_data.username, form_data.password)
+        user = await authenticate_user(db, form_data.username, form_data.password)
         if not user:
             raise InvalidCredentialsException()
 
@@ -46,7 +47,7 @@ async def login(
 
         # Update last login
         user.last_login = datetime.utcnow()
-        db.commit()
+        await db.commit()
 
         return {
             "access_token": create_access_token(data={"sub": user.id}),
@@ -64,7 +65,7 @@ async def login(
 @auth_router.post("/google/signin", response_model=TokenResponse)
 async def google_signin(
     token: str = Body(..., embed=True),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     try:
         google_service = GoogleAuthService()
@@ -72,7 +73,7 @@ async def google_signin(
         user = await google_service.get_or_create_user(db, user_data)
         
         user.last_login = datetime.utcnow()
-        db.commit()
+        await db.commit()
         
         access_token = create_access_token(data={"sub": user.id})
         
@@ -88,7 +89,7 @@ async def google_signin(
 # @auth_router.post("/register", response_model=UserResponse)
 # async def register(
 #     *,
-#     db: Session = Depends(get_db),
+#     db: AsyncSession = Depends(get_db),
 #     user_in: UserCreate
 # ) -> User:
 #     """
@@ -138,7 +139,7 @@ async def google_signin(
 @auth_router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     Get current user's profile information
@@ -148,12 +149,12 @@ async def get_current_user_profile(
     """
     try:
         # Refresh user data from database
-        db.refresh(current_user)
+        await db.refresh(current_user)
         
         # Ensure custom_categories is initialized
         if current_user.custom_categories is None:
             current_user.custom_categories = []
-            db.commit()
+            await db.commit()
             
         return current_user
     except Exception as e:
@@ -166,7 +167,7 @@ async def get_current_user_profile(
 @auth_router.put("/me", response_model=UserResponse)
 async def update_user_profile(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
     custom_categories: List[str] = Body(None),
 ) -> User:
@@ -182,6 +183,7 @@ async def update_user_profile(
     Raises:
         CategoryLimitExceeded: If custom categories exceed limit
         CategoryValidationError: If category names are invalid
+        CategoryInUse: If a removed category still has documents
     """
     MAX_CUSTOM_CATEGORIES = 20
     
@@ -203,21 +205,21 @@ async def update_user_profile(
                     )
             
             # Normalize categories
-            normalized_categories = [cat.lower().strip() for cat in custom_categories]
+            normalized_categories = [normalize_category(cat) for cat in custom_categories]
             
-            # Update user's custom categories
-            current_user.custom_categories = normalized_categories
+            # Update user's custom categories (rows and profile list)
+            await CategoryService(db).set_custom_categories(current_user, normalized_categories)
             current_user.modified_at = datetime.utcnow()
             
-        db.commit()
-        db.refresh(current_user)
+        await db.commit()
+        await db.refresh(current_user)
         return current_user
         
-    except (CategoryLimitExceeded, CategoryValidationError) as e:
-        db.rollback()
+    except (CategoryLimitExceeded, CategoryValidationError, CategoryInUse) as e:
+        await db.rollback()
         raise e
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error updating user profile: {e}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -253,7 +255,7 @@ async def refresh_token(
 @auth_router.post("/logout")
 async def logout(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, str]:
     """
     Logout current user and update last login time
@@ -268,10 +270,10 @@ async def logout(
     try:
         # Update last login time
         current_user.last_login = datetime.utcnow()
-        db.commit()
+        await db.commit()
         return {"message": "Successfully logged out"}
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -0,0 +1,41 @@
+# app/api/v1/metrics_router.py
+from fastapi import APIRouter, Depends
+from typing import Dict, Any
+
+from app.core.auth import require_metrics_token
+from app.core.storage_executor import get_storage_executor
+from app.db.session import async_engine, engine
+from app.jobs.reconcile_storage import get_last_reconcile_stats
+from app.services.analytics_writer import get_analytics_writer
+from app.services.extraction_pipeline import get_extraction_pipeline
+from app.services.storage.url_cache import get_presigned_url_cache
+
+# Process internals, for operators only: every endpoint requires METRICS_TOKEN
+metrics_router = APIRouter(dependencies=[Depends(require_metrics_token)])
+
+@metrics_router.get("/storage")
+async def get_storage_metrics() -> Dict[str, Any]:
+    """Storage I/O pool utilisation, presigned URL cache and orphan reconciliation progress"""
+    return {
+        "executor": get_storage_executor().stats(),
+        "presigned_url_cache": get_presigned_url_cache().stats(),
+        "reconcile": get_last_reconcile_stats()
+    }
+
+@metrics_router.get("/db")
+async def get_db_metrics() -> Dict[str, Any]:
+    """Connection pool usage: checked out, overflow, checkout latency and timeouts"""
+    return {
+        "api": async_engine.pool.stats(),
+        "sync": engine.pool.stats()
+    }
+
+@metrics_router.get("/extraction")
+async def get_extraction_metrics() -> Dict[str, Any]:
+    """Text extraction queue depth and outcomes since startup"""
+    return get_extraction_pipeline().stats()
+
+@metrics_router.get("/analytics")
+async def get_analytics_metrics() -> Dict[str, Any]:
+    """Buffered analytics writer: buffer depth, batches written and dropped events"""
+    return get_analytics_writer().stats()
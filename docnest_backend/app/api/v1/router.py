@@ -3,19 +3,41 @@
 import re
 from app.models.user import User
 from app.services.document import DocumentService
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from app.services.category_service import CategoryService, DEFAULT_CATEGORIES, normalize_category
+from app.services.usage_service import UsageService
+from app.services.search_service import SearchService
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional, Dict, Any
 from app.db.session import get_db
 from app.core.auth import get_current_user
-from app.schemas.document import DocumentCreate, DocumentResponse, DocumentUpdate
-from app.services.s3_service import S3Service
+from app.schemas.category import CategoryResponse
+from app.schemas.usage import UsageResponse
+from app.schemas.document import (
+    DocumentCreate,
+    DocumentResponse,
+    DocumentListAdapter,
+    DocumentSearchResult,
+    TextExtractionStatus,
+    DocumentUpdate,
+    UploadUrlRequest,
+    UploadUrlResponse,
+    UploadFinalize,
+    SLIM_LIST_FIELDS
+)
+from app.services.storage import get_storage_backend
+from app.services.storage.response import object_response
+from app.services.storage.url_cache import get_presigned_url_cache
 from app.models.document import Document
+from app.models.text_extraction import TextExtraction
 from pydantic import parse_obj_as
 import os
-from sqlalchemy import func
-from app.core.exceptions import CategoryValidationError, CategoryLimitExceeded, CategoryNotFound, CategoryInUse
+from sqlalchemy import func, select
+from app.utils.http_range import parse_range_header
+from app.utils.pagination import NEXT_CURSOR_HEADER, page_size
+from app.utils.responses import list_response
+from app.core.exceptions import CategoryValidationError, CategoryLimitExceeded, CategoryNotFound, CategoryInUse, StorageQuotaExceeded
 
 api_router = APIRouter()
 
@@ -26,7 +48,7 @@ async def create_document(
     description: Optional[str] = Form(None),
     category: str = Form(...),
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
     """
@@ -35,18 +57,7 @@ async def create_document(
     document_service = DocumentService(db=db, user=current_user, request=request)
 
     try:
-        # Normalize category
-        category = category.lower().strip()
-
-        # Define all valid categories
-        custom_categories = current_user.custom_categories or []
-        default_categories = ["government", "medical", "educational", "other"]
-        valid_categories = set(default_categories) | set(custom_categories)
-
-        # If category doesn't exist yet, add it to user's custom categories
-        if category not in valid_categories:
-            current_user.custom_categories = list(set(custom_categories + [category]))
-            db.commit()
+        category = normalize_category(category)
 
         # Create document
         document = await document_service.create_document(
@@ -61,119 +72,197 @@ async def create_document(
 
         return document
 
+    except StorageQuotaExceeded:
+        await db.rollback()
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error creating document: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
+@api_router.post("/documents/upload-url", response_model=UploadUrlResponse)
+async def create_upload_url(
+    upload_in: UploadUrlRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    """
+    Step 1 of a direct upload: get a presigned POST to send the file straight
+    to storage, bypassing the API. Follow with POST /documents/finalize.
+    """
+    document_service = DocumentService(db=db, user=current_user, request=request)
+    return await document_service.create_upload_url(current_user.id, upload_in)
+
+@api_router.post("/documents/finalize", response_model=DocumentResponse)
+async def finalize_upload(
+    finalize_in: UploadFinalize,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    """
+    Step 2 of a direct upload: verify the uploaded object and create the document.
+    """
+    document_service = DocumentService(db=db, user=current_user, request=request)
+
+    try:
+        finalize_in.category = normalize_category(finalize_in.category)
+        return await document_service.finalize_upload(current_user.id, finalize_in)
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+def _list_fields(fields: Optional[str], view: str) -> Optional[List[str]]:
+    """Columns requested with ?fields= or ?view=slim, None for full documents"""
+    if fields:
+        requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in requested if name not in DocumentResponse.model_fields]
+        if unknown or not requested:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}. "
+                       f"Allowed fields: {', '.join(DocumentResponse.model_fields)}"
+            )
+        return requested
+    if view == "slim":
+        return list(SLIM_LIST_FIELDS)
+    return None
+
 @api_router.get("/documents/", response_model=List[DocumentResponse])
 async def list_documents(
-    category: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    fields: Optional[str] = None,
+    view: Literal["full", "slim"] = "full",
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    List the current user's documents, newest first, one page at a time.
+    Optionally filter by category. The next page's cursor is returned in
+    the X-Next-Cursor header.
+
+    ?fields=id,name,... (or ?view=slim for the list screens' columns)
+    returns only those keys, read as plain rows without loading Documents.
+    """
+    selected = _list_fields(fields, view)
+    document_service = DocumentService(db=db, user=current_user)
+    documents, next_cursor = await document_service.get_user_documents(
+        db, current_user.id, category, cursor, limit, fields=selected
+    )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+
+    if selected:
+        # Columns come straight from the database, so skip per-row validation
+        return ORJSONResponse(
+            content=[{name: row._mapping[name] for name in selected} for row in documents],
+            headers=headers
+        )
+
+    return list_response(DocumentListAdapter, documents, headers)
+
+# Registered before /documents/{document_id}, which would otherwise match "search"
+@api_router.get("/documents/search", response_model=List[DocumentSearchResult])
+async def search_documents(
+    q: str = Query(..., min_length=1, max_length=200),
+    category: Optional[str] = None,
+    limit: int = Depends(page_size),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
-    List all documents owned by the current user.
-    Optionally filter by category.
+    Search the current user's documents by name and description, best match
+    first. Every word is matched as a prefix, in the file's extracted text
+    too; matches are wrapped in <mark> in name_highlight and in the snippet.
     """
-    query = db.query(Document).filter(Document.owner_id == current_user.id)
     if category:
-        query = query.filter(Document.category == category)
-    return query.order_by(Document.created_at.desc()).all()
+        category = normalize_category(category)
+    return await SearchService(db).search(current_user.id, q, limit, category)
 
 @api_router.get("/documents/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
     Get a specific document by ID.
     """
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.owner_id == current_user.id
-    ).first()
+    document = (await db.execute(
+        select(Document).where(
+            Document.id == document_id,
+            Document.owner_id == current_user.id
+        )
+    )).scalars().first()
     
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     return document
 
+@api_router.get("/documents/{document_id}/extraction", response_model=TextExtractionStatus)
+async def get_text_extraction(
+    document_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Progress of extracting the document's file text for search.
+    """
+    extraction = (await db.execute(
+        select(TextExtraction)
+        .join(Document, Document.id == TextExtraction.document_id)
+        .where(
+            TextExtraction.document_id == document_id,
+            Document.owner_id == current_user.id
+        )
+    )).scalars().first()
+
+    if not extraction:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return extraction
+
 @api_router.put("/documents/{document_id}", response_model=DocumentResponse)
 async def update_document(
     document_id: str,
+    request: Request,
     name: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
     category: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
     Update a document. All fields are optional.
     """
-    try:
-        # Get existing document
-        document = db.query(Document).filter(
-            Document.id == document_id,
-            Document.owner_id == current_user.id
-        ).first()
-        
-        if not document:
-            raise HTTPException(status_code=404, detail="Document not found")
-
-        # Initialize S3 service
-        s3_service = S3Service()
-        old_file_path = None
-
-        # Update file if provided
-        if file:
-            try:
-                # Store old file path for cleanup
-                old_file_path = document.file_path
-                
-                # Upload new file
-                file_path, file_size, file_type = await s3_service.upload_file(
-                    file,
-                    folder=f"documents/{current_user.id}"
-                )
-                
-                # Update document with new file info
-                document.file_path = file_path
-                document.file_size = file_size
-                document.file_type = file_type
-                document.version += 1
-                
-            except Exception as e:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Error uploading file: {str(e)}"
-                )
-
-        # Update other fields if provided
-        if name is not None:
-            document.name = name
-        if description is not None:
-            document.description = description
-        if category is not None:
-            document.category = category
-
-        db.commit()
-        db.refresh(document)
-
-        # Delete old file if it was replaced
-        if old_file_path:
-            await s3_service.delete_file(old_file_path)
+    document_service = DocumentService(db=db, user=current_user, request=request)
 
-        return document
+    try:
+        return await document_service.update_document(
+            document_id=document_id,
+            owner_id=current_user.id,
+            document_in={
+                "name": name,
+                "description": description,
+                "category": category
+            },
+            file=file
+        )
         
+    except StorageQuotaExceeded:
+        raise
     except Exception as e:
-        # Clean up new file if database operation failed
-        if file and 'file_path' in locals():
-            await s3_service.delete_file(file_path)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -182,53 +271,34 @@ async def update_document(
 @api_router.delete("/documents/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_document(
     document_id: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
     Delete a document.
+    The stored file is removed once no other document shares its content.
     """
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.owner_id == current_user.id
-    ).first()
-    
-    if not document:
-        raise HTTPException(status_code=404, detail="Document not found")
-
-    try:
-        # Store file path before deleting from database
-        file_path = document.file_path
-        
-        # Delete from database
-        db.delete(document)
-        db.commit()
-        
-        # Delete file from S3 if it exists
-        if file_path:
-            s3_service = S3Service()
-            await s3_service.delete_file(file_path)
-            
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error deleting document: {str(e)}"
-        )
+    document_service = DocumentService(db=db, user=current_user, request=request)
+    await document_service.delete_document(db, document_id, current_user.id)
 
 @api_router.get("/documents/{document_id}/download")
 async def download_document(
     document_id: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ) -> StreamingResponse:
     """
-    Download a document from S3 using document name as filename
+    Download a document using document name as filename.
+    Supports single byte ranges (206 Partial Content) for resumable downloads.
     """
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.owner_id == current_user.id
-    ).first()
+    document = (await db.execute(
+        select(Document).where(
+            Document.id == document_id,
+            Document.owner_id == current_user.id
+        )
+    )).scalars().first()
     
     if not document:
         raise HTTPException(
@@ -243,12 +313,13 @@ async def download_document(
         )
 
     try:
-        s3_service = S3Service()
-        file_content, content_type, content_length = await s3_service.download_file(
-            document.file_path
+        stream = await get_storage_backend().open(
+            document.file_path,
+            byte_range=parse_range_header(request.headers.get("range")),
+            if_range=request.headers.get("if-range")
         )
 
-        # Get extension from the S3 file path
+        # Get extension from the stored file path
         ext = os.path.splitext(document.file_path)[-1]
         
         # Create filename from document name and original extension
@@ -257,15 +328,14 @@ async def download_document(
         # Clean filename to be safe for downloads (remove any potentially unsafe characters)
         safe_filename = "".join(c for c in filename if c.isalnum() or c in "._- ")
 
-        return StreamingResponse(
-            file_content,
-            media_type=content_type,
-            headers={
-                'Content-Disposition': f'attachment; filename="{safe_filename}"',
-                'Content-Length': str(content_length)
-            }
+        return object_response(
+            stream,
+            filename=safe_filename,
+            accept_encoding=request.headers.get("accept-encoding")
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -275,16 +345,18 @@ async def download_document(
 @api_router.get("/documents/{document_id}/share")
 async def get_document_share_info(
     document_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
     Get document sharing information including metadata and download URL
     """
-    document = db.query(Document).filter(
-        Document.id == document_id,
-        Document.owner_id == current_user.id
-    ).first()
+    document = (await db.execute(
+        select(Document).where(
+            Document.id == document_id,
+            Document.owner_id == current_user.id
+        )
+    )).scalars().first()
     
     if not document:
         raise HTTPException(
@@ -296,8 +368,8 @@ async def get_document_share_info(
         # Generate temporary download URL if file exists
         download_url = None
         if document.file_path:
-            s3_service = S3Service()
-            download_url = await s3_service.generate_presigned_url(
+            download_url = await get_presigned_url_cache().get_url(
+                get_storage_backend(),
                 document.file_path,
                 expires_in=3600  # URL expires in 1 hour
             )
@@ -330,27 +402,28 @@ async def get_document_share_info(
     
 
 # Add new category management endpoints
-@api_router.get("/categories", response_model=List[str])
+@api_router.get("/categories", response_model=List[CategoryResponse])
 async def get_categories(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
-    Get all categories (both default and custom) for the current user
+    Get all categories (both default and custom) for the current user,
+    with the number of documents in each
     """
-    default_categories = ["government", "medical", "educational", "other"]
-    return default_categories + (current_user.custom_categories or [])
+    return await CategoryService(db).list_categories(current_user.id)
 
 @api_router.post("/categories/{category_name}", status_code=status.HTTP_201_CREATED)
 async def add_category(
     category_name: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> dict:
     """
     Add a new custom category for the current user.
     """
     # Convert to lowercase and strip whitespace
-    category_name = category_name.lower().strip()
+    category_name = normalize_category(category_name)
     
     # Validate category name format using corrected regex pattern
     if not re.match(r'^[a-z0-9][a-z0-9 _-]{0,28}[a-z0-9]$', category_name):
@@ -360,27 +433,18 @@ async def add_category(
         )
     
     # Don't allow default categories
-    default_categories = {'government', 'medical', 'educational', 'other'}
-    if category_name in default_categories:
+    if category_name in DEFAULT_CATEGORIES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot add default category"
         )
 
-    # Initialize custom_categories if None
-    if current_user.custom_categories is None:
-        current_user.custom_categories = []
-
-    # Check if category already exists
-    if category_name in current_user.custom_categories:
+    if not await CategoryService(db).add_category(current_user, category_name):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Category already exists"
         )
-
-    # Add new category
-    current_user.custom_categories.append(category_name)
-    db.commit()
+    await db.commit()
 
     return {"message": f"Category '{category_name}' added successfully"}
 
@@ -388,51 +452,39 @@ async def add_category(
 async def rename_category(
     old_category_name: str,
     new_category_name: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ) -> dict:
     """
     Rename a custom category
     """
-    old_category_name = old_category_name.lower().strip()
-    new_category_name = new_category_name.lower().strip()
+    old_category_name = normalize_category(old_category_name)
+    new_category_name = normalize_category(new_category_name)
 
     # Validate new category name
-    if not re.match(r'^[a-z0-9][a-z0-9\s-_]{0,28}[a-z0-9]$', new_category_name):
+    if not re.match(r'^[a-z0-9][a-z0-9 _-]{0,28}[a-z0-9]$', new_category_name):
         raise CategoryValidationError(
             "Category name must be 2-30 characters, containing only letters, numbers, spaces, hyphens, and underscores"
         )
 
-    # Verify old category exists and is custom
-    default_categories = ["government", "medical", "educational", "other"]
-    if old_category_name in default_categories:
-        raise CategoryValidationError("Cannot rename default category")
-
-    custom_categories = current_user.custom_categories or []
-    if old_category_name not in custom_categories:
-        raise CategoryNotFound()
-
-    # Check if new name already exists
-    if new_category_name in default_categories or new_category_name in custom_categories:
-        raise CategoryValidationError("Category name already exists")
-
-    # Update category name in user's custom categories
-    custom_categories[custom_categories.index(old_category_name)] = new_category_name
-    current_user.custom_categories = custom_categories
-
-    # Update category name in all relevant documents
-    documents = db.query(Document)\
-        .filter(
-            Document.owner_id == current_user.id,
-            Document.category == old_category_name
-        ).all()
-
-    for doc in documents:
-        doc.category = new_category_name
-
-    db.commit()
+    # Category row and documents move in one transaction, without loading documents
+    documents_updated = await CategoryService(db).rename_category(
+        current_user, old_category_name, new_category_name
+    )
+    await db.commit()
 
     return {
         "message": f"Category renamed from '{old_category_name}' to '{new_category_name}' successfully",
-        "documents_updated": len(documents)
-    }
\ No newline at end of file
+        "documents_updated": documents_updated
+    }
+
+@api_router.get("/usage", response_model=UsageResponse)
+async def get_usage(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Storage used by the current user, in total and per category, read from
+    the running counters rather than summed over documents
+    """
+    return await UsageService(db).get_usage(current_user.id)
@@ -0,0 +1,55 @@
+# app/api/v1/storage_router.py
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile, status
+
+from app.services.storage import get_storage_backend
+from app.services.storage.base import verify_object_token
+from app.services.storage.response import object_response
+from app.utils.http_range import parse_range_header
+
+storage_router = APIRouter()
+
+@storage_router.get("/objects/{token}")
+async def get_object(token: str, request: Request):
+    """
+    Serve an object through a signed, expiring link.
+    Stands in for S3 presigned URLs when running on the local or memory backend.
+    """
+    payload = verify_object_token(token)
+    stream = await get_storage_backend().open(
+        payload["key"],
+        byte_range=parse_range_header(request.headers.get("range")),
+        if_range=request.headers.get("if-range")
+    )
+    return object_response(stream, accept_encoding=request.headers.get("accept-encoding"))
+
+@storage_router.post("/uploads/{token}", status_code=status.HTTP_204_NO_CONTENT)
+async def upload_object(
+    token: str,
+    request: Request,
+    file: UploadFile = File(...)
+):
+    """
+    Accept a direct upload issued by POST /documents/upload-url.
+    Local stand-in for an S3 presigned POST: enforces the same content type and
+    size conditions, then writes the object under the signed key.
+    """
+    payload = verify_object_token(token, scope="storage:put")
+
+    form = await request.form()
+    content_type = form.get("Content-Type") or file.content_type
+    if content_type != payload["content_type"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Content-Type does not match the upload policy"
+        )
+
+    file.file.seek(0, 2)
+    size = file.file.tell()
+    file.file.seek(0)
+    if size < 1 or size > payload["max_size"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File size outside the allowed range"
+        )
+
+    await get_storage_backend().upload(file, payload["key"])
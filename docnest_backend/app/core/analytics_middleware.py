@@ -1,43 +1,193 @@
-# # app/core/analytics_middleware.py
-# from fastapi import Request
-# from starlette.middleware.base import BaseHTTPMiddleware
-# from ..services.analytics_service import AnalyticsService
-# from ..db.session import SessionLocal
-# import time
-
-# class AnalyticsMiddleware(BaseHTTPMiddleware):
-#     async def dispatch(self, request: Request, call_next):
-#         # Start timer
-#         start_time = time.time()
-        
-#         # Process request
-#         response = await call_next(request)
-        
-#         # Calculate duration
-#         duration = int((time.time() - start_time) * 1000)  # Convert to milliseconds
-        
-#         # Track API usage
-#         try:
-#             db = SessionLocal()
-#             analytics_service = AnalyticsService(db)
-            
-#             properties = {
-#                 "path": str(request.url.path),
-#                 "method": request.method,
-#                 "status_code": response.status_code
-#             }
-            
-#             analytics_service.track_event(
-#                 event_type="api_request",
-#                 event_category="api",
-#                 properties=properties,
-#                 request=request,
-#                 duration=duration
-#             )
-            
-#         except Exception as e:
-#             print(f"Error tracking analytics: {e}")
-#         finally:
-#             db.close()
-        
-#         return response
\ No newline at end of file
+# app/core/analytics_middleware.py
+"""
+Per-route request latency without a database write per request.
+
+AnalyticsMiddleware is a pure ASGI middleware: it times each request and adds
+it to an in-memory aggregate keyed by hour, method, route template and status
+class. flush_request_metrics() upserts the aggregate into request_metrics on
+a schedule, so the database sees one row per key per flush however busy the
+API is. Requests can be sampled, globally or per route template.
+"""
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+# Requests no route matched (404s, scanners) share one key to bound cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+# (hour since epoch, method, route template, status class)
+_Key = Tuple[int, str, str, str]
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """'/health=0,/api/v1/documents/{document_id}=0.1' -> {route: rate}"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        route, _, rate = item.rpartition("=")
+        rates[route.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class RequestStats:
+    """Thread-safe running request counts and durations, drained by flush()"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> [estimated requests, sampled requests, duration sum, duration max]
+        self._aggregates: Dict[_Key, List[float]] = {}
+        self._flushed_rows = 0
+
+    def record(self, method: str, route: str, status_code: int, duration_ms: float, weight: float = 1.0) -> None:
+        key = (int(time.time() // 3600), method, route, f"{status_code // 100}xx")
+        with self._lock:
+            aggregate = self._aggregates.get(key)
+            if aggregate is None:
+                self._aggregates[key] = [weight, 1, duration_ms, duration_ms]
+            else:
+                aggregate[0] += weight
+                aggregate[1] += 1
+                aggregate[2] += duration_ms
+                aggregate[3] = max(aggregate[3], duration_ms)
+
+    def drain(self) -> Dict[_Key, List[float]]:
+        with self._lock:
+            aggregates, self._aggregates = self._aggregates, {}
+        return aggregates
+
+    def restore(self, aggregates: Dict[_Key, List[float]]) -> None:
+        """Put back aggregates whose flush failed, merging with newer ones"""
+        with self._lock:
+            for key, (weight, sampled, total, longest) in aggregates.items():
+                aggregate = self._aggregates.setdefault(key, [0.0, 0, 0.0, 0.0])
+                aggregate[0] += weight
+                aggregate[1] += sampled
+                aggregate[2] += total
+                aggregate[3] = max(aggregate[3], longest)
+
+    async def flush(self, db: AsyncSession) -> int:
+        """Add the drained aggregates to request_metrics in one statement; returns rows upserted"""
+        from ..db.upsert import dialect_greatest, dialect_insert
+        from ..models.request_metric import RequestMetric
+
+        aggregates = self.drain()
+        if not aggregates:
+            return 0
+
+        rows = [
+            {
+                "bucket_start": datetime.utcfromtimestamp(hour * 3600),
+                "method": method,
+                "route": route,
+                "status_class": status_class,
+                "request_count": round(weight),
+                "sampled_count": sampled,
+                "duration_ms_sum": total,
+                "duration_ms_max": longest
+            }
+            for (hour, method, route, status_class), (weight, sampled, total, longest) in aggregates.items()
+        ]
+        table = RequestMetric.__table__
+        stmt = dialect_insert(db, table)
+        try:
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[table.c.bucket_start, table.c.method, table.c.route, table.c.status_class],
+                    set_={
+                        "request_count": table.c.request_count + stmt.excluded.request_count,
+                        "sampled_count": table.c.sampled_count + stmt.excluded.sampled_count,
+                        "duration_ms_sum": table.c.duration_ms_sum + stmt.excluded.duration_ms_sum,
+                        "duration_ms_max": dialect_greatest(db, table.c.duration_ms_max, stmt.excluded.duration_ms_max)
+                    }
+                ),
+                rows
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            self.restore(aggregates)
+            raise
+        self._flushed_rows += len(rows)
+        return len(rows)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"pending_keys": len(self._aggregates), "flushed_rows": self._flushed_rows}
+
+
+_request_stats = RequestStats()
+
+
+def get_request_stats() -> RequestStats:
+    return _request_stats
+
+
+async def flush_request_metrics() -> None:
+    """Scheduled job (REQUEST_ANALYTICS_FLUSH_SECONDS) and final flush on shutdown"""
+    from ..db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        await get_request_stats().flush(db)
+
+
+class AnalyticsMiddleware:
+    """
+    Time every HTTP request and record it, sampled, by route template.
+
+    The template ("/api/v1/documents/{document_id}") comes from the route
+    FastAPI matched, so ids in paths do not multiply the keys. Duration runs
+    until the response body has been sent.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        stats: Optional[RequestStats] = None,
+        sample_rate: Optional[float] = None,
+        route_sample_rates: Optional[Dict[str, float]] = None,
+        rng: Callable[[], float] = random.random
+    ):
+        self.app = app
+        self.stats = stats or get_request_stats()
+        sample_rate = settings.REQUEST_ANALYTICS_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.route_sample_rates = (
+            parse_sample_rates(settings.REQUEST_ANALYTICS_ROUTE_SAMPLE_RATES)
+            if route_sample_rates is None else route_sample_rates
+        )
+        self.rng = rng
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the (shared) scope
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            rate = self.route_sample_rates.get(route, self.sample_rate)
+            if rate >= 1 or (rate > 0 and self.rng() < rate):
+                self.stats.record(
+                    scope["method"],
+                    route,
+                    status_code,
+                    (time.perf_counter() - started) * 1000,
+                    weight=1 / rate
+                )
@@ -1,8 +1,11 @@
+import hmac
 from datetime import datetime, timedelta
 from typing import Optional, Union
-from fastapi import Depends, status
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 
@@ -82,7 +85,7 @@ def create_refresh_token(data: dict) -> str:
     return encoded_jwt
 
 async def get_current_user(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
     """
@@ -111,13 +114,27 @@ async def get_current_user(
     except JWTError:
         raise TokenValidationError()
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if user is None:
         raise TokenValidationError()
     if not user.is_active:
         raise InactiveUserException()
     return user
 
+async def require_metrics_token(x_metrics_token: Optional[str] = Header(None)) -> None:
+    """
+    Admit operators only: the request must carry settings.METRICS_TOKEN.
+
+    Raises:
+        HTTPException: 404 while no token is configured, 403 for a missing or wrong one
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_metrics_token or not hmac.compare_digest(
+        x_metrics_token.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid metrics token")
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -137,8 +154,8 @@ async def get_current_active_user(
         raise InactiveUserException()
     return current_user
 
-def authenticate_user(
-    db: Session,
+async def authenticate_user(
+    db: AsyncSession,
     email: str,
     password: str
 ) -> User:
@@ -157,7 +174,9 @@ def authenticate_user(
         InvalidCredentialsException: If credentials are invalid
         InactiveUserException: If user account is inactive
     """
-    user = db.query(User).filter(User.email == email).first()
+    user = (await db.execute(
+        select(User).where(User.email == email)
+    )).scalars().first()
     if not user or not verify_password(password, user.hashed_password):
         raise InvalidCredentialsException()
     if not user.is_active:
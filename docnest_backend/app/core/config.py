@@ -18,6 +18,15 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "docnest-db")
     DATABASE_URL: Optional[str] = os.getenv("DATABASE_URL")  # For Render
     SQLALCHEMY_DATABASE_URI: Optional[str] = None
+    # Connection pool, per engine and per worker process (see app/db/pool.py)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds; -1 never recycles
+    # Ping on every checkout; with a recycle shorter than server/proxy idle timeouts this can be turned off
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+    # PgBouncer in transaction pooling mode: no named prepared statement reuse
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "False").lower() == "true"
 
     # JWT settings
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY")
@@ -34,15 +43,96 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", str(10 * 1024 * 1024)))  # 10MB default
     ALLOWED_EXTENSIONS: List[str] = [".pdf", ".doc", ".docx", ".jpg", ".jpeg", ".png"]
+    # Uploads are read and sent to S3 in parts of this size (S3 minimum part size is 5MB)
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))  # 8MB default
+    # Only the first bytes of an upload are handed to libmagic for MIME detection
+    MIME_SNIFF_BYTES: int = int(os.getenv("MIME_SNIFF_BYTES", str(8 * 1024)))
+    # Lifetime of presigned direct-upload policies (POST /documents/upload-url)
+    PRESIGNED_UPLOAD_EXPIRES: int = int(os.getenv("PRESIGNED_UPLOAD_EXPIRES", "900"))
+    # Per-user storage quota in bytes, checked before an upload is read; 0 means unlimited
+    STORAGE_QUOTA_BYTES: int = int(os.getenv("STORAGE_QUOTA_BYTES", "0"))
+    # Per-process LRU of presigned download URLs (see app/services/storage/url_cache.py)
+    PRESIGNED_URL_CACHE_SIZE: int = int(os.getenv("PRESIGNED_URL_CACHE_SIZE", "1024"))
+    # A cached URL is only reused while it stays valid for at least this long
+    PRESIGNED_URL_MIN_REMAINING_MINUTES: int = int(os.getenv("PRESIGNED_URL_MIN_REMAINING_MINUTES", "10"))
+    # Store compressible uploads gzip-encoded (see app/services/storage/compression.py).
+    # Trade-off: a byte range of a gzip object is served by decoding from its start,
+    # so PDFs, audio and video (fetched by range) are always stored raw; compression
+    # only saves space on text-like files downloaded whole
+    STORAGE_COMPRESSION: bool = os.getenv("STORAGE_COMPRESSION", "False").lower() == "true"
+    STORAGE_COMPRESSION_LEVEL: int = int(os.getenv("STORAGE_COMPRESSION_LEVEL", "6"))
+    STORAGE_COMPRESSION_SAMPLE_BYTES: int = int(os.getenv("STORAGE_COMPRESSION_SAMPLE_BYTES", str(256 * 1024)))
+    # Keep the compressed form only if the sample shrinks to at most this fraction
+    STORAGE_COMPRESSION_MAX_RATIO: float = float(os.getenv("STORAGE_COMPRESSION_MAX_RATIO", "0.8"))
+    # Downloads are relayed from S3 to the client in chunks of this size
+    DOWNLOAD_CHUNK_SIZE: int = int(os.getenv("DOWNLOAD_CHUNK_SIZE", str(64 * 1024)))  # 64KB default
+
+    # Cursor pagination of document lists and analytics feeds (?limit=, X-Next-Cursor)
+    PAGE_SIZE_DEFAULT: int = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+    PAGE_SIZE_MAX: int = int(os.getenv("PAGE_SIZE_MAX", "200"))
     
     # CORS settings
     ALLOWED_ORIGINS: List[str] = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
 
+    # Storage backend: "s3", "local" (files under UPLOAD_DIR) or "memory" (tests/benchmarks)
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "s3")
+    # Externally reachable base URL, used for links served by the API itself
+    PUBLIC_BASE_URL: str = os.getenv("PUBLIC_BASE_URL", "http://localhost:8000")
+
     # AWS Settings
-    AWS_ACCESS_KEY_ID: str = os.getenv("AWS_ACCESS_KEY_ID")
-    AWS_SECRET_ACCESS_KEY: str = os.getenv("AWS_SECRET_ACCESS_KEY")
+    AWS_ACCESS_KEY_ID: Optional[str] = os.getenv("AWS_ACCESS_KEY_ID")
+    AWS_SECRET_ACCESS_KEY: Optional[str] = os.getenv("AWS_SECRET_ACCESS_KEY")
     AWS_REGION: str = os.getenv("AWS_REGION", "us-east-1")
-    AWS_BUCKET_NAME: str = os.getenv("AWS_BUCKET_NAME")
+    AWS_BUCKET_NAME: Optional[str] = os.getenv("AWS_BUCKET_NAME")
+    AWS_S3_ENDPOINT_URL: Optional[str] = os.getenv("AWS_S3_ENDPOINT_URL")  # e.g. MinIO / LocalStack
+    # Shared S3 client tuning (see app/core/storage_client.py)
+    S3_MAX_POOL_CONNECTIONS: int = int(os.getenv("S3_MAX_POOL_CONNECTIONS", "50"))
+    S3_TCP_KEEPALIVE: bool = os.getenv("S3_TCP_KEEPALIVE", "True").lower() == "true"
+    S3_RETRY_MODE: str = os.getenv("S3_RETRY_MODE", "adaptive")  # legacy, standard or adaptive
+    S3_MAX_ATTEMPTS: int = int(os.getenv("S3_MAX_ATTEMPTS", "3"))
+    S3_CONNECT_TIMEOUT: float = float(os.getenv("S3_CONNECT_TIMEOUT", "5"))
+    S3_READ_TIMEOUT: float = float(os.getenv("S3_READ_TIMEOUT", "60"))
+    # Blocking storage calls run on a dedicated thread pool (see app/core/storage_executor.py)
+    STORAGE_IO_MAX_WORKERS: int = int(os.getenv("STORAGE_IO_MAX_WORKERS", "32"))
+    STORAGE_IO_MAX_QUEUE: int = int(os.getenv("STORAGE_IO_MAX_QUEUE", "256"))
+    # Orphaned-object reconciliation (python -m app.jobs.reconcile_storage); 0 disables the schedule
+    ORPHAN_RECONCILE_INTERVAL_HOURS: float = float(os.getenv("ORPHAN_RECONCILE_INTERVAL_HOURS", "0"))
+    # Objects younger than this are never treated as orphans (in-flight and direct uploads)
+    ORPHAN_RECONCILE_GRACE_HOURS: float = float(os.getenv("ORPHAN_RECONCILE_GRACE_HOURS", "24"))
+    ORPHAN_RECONCILE_DRY_RUN: bool = os.getenv("ORPHAN_RECONCILE_DRY_RUN", "False").lower() == "true"
+    # Background text extraction for search (see app/services/extraction_pipeline.py); 0 workers disables it
+    EXTRACTION_WORKERS: int = int(os.getenv("EXTRACTION_WORKERS", "2"))  # processes
+    EXTRACTION_QUEUE_SIZE: int = int(os.getenv("EXTRACTION_QUEUE_SIZE", "1000"))
+    EXTRACTION_MAX_ATTEMPTS: int = int(os.getenv("EXTRACTION_MAX_ATTEMPTS", "5"))
+    EXTRACTION_RETRY_SECONDS: float = float(os.getenv("EXTRACTION_RETRY_SECONDS", "30"))  # doubled per attempt
+    EXTRACTION_SWEEP_SECONDS: float = float(os.getenv("EXTRACTION_SWEEP_SECONDS", "60"))
+    # Indexed text per document; a Postgres tsvector is capped at 1MB
+    EXTRACTION_MAX_CHARS: int = int(os.getenv("EXTRACTION_MAX_CHARS", "200000"))
+    # Buffered analytics writes (see app/services/analytics_writer.py); events beyond the buffer are dropped
+    ANALYTICS_BUFFER_SIZE: int = int(os.getenv("ANALYTICS_BUFFER_SIZE", "10000"))
+    ANALYTICS_BATCH_SIZE: int = int(os.getenv("ANALYTICS_BATCH_SIZE", "500"))
+    ANALYTICS_FLUSH_SECONDS: float = float(os.getenv("ANALYTICS_FLUSH_SECONDS", "2"))
+    # Per-route request latency (see app/core/analytics_middleware.py), aggregated in memory
+    REQUEST_ANALYTICS_ENABLED: bool = os.getenv("REQUEST_ANALYTICS_ENABLED", "True").lower() == "true"
+    REQUEST_ANALYTICS_SAMPLE_RATE: float = float(os.getenv("REQUEST_ANALYTICS_SAMPLE_RATE", "1.0"))
+    # Per-route overrides, e.g. "/health=0,/api/v1/documents/{document_id}/download=0.1"
+    REQUEST_ANALYTICS_ROUTE_SAMPLE_RATES: str = os.getenv("REQUEST_ANALYTICS_ROUTE_SAMPLE_RATES", "/health=0")
+    REQUEST_ANALYTICS_FLUSH_SECONDS: float = float(os.getenv("REQUEST_ANALYTICS_FLUSH_SECONDS", "60"))
+    # Analytics rollups behind /analytics/summary (see app/services/analytics_rollups.py); 0 disables the schedule
+    ANALYTICS_ROLLUP_INTERVAL_MINUTES: float = float(os.getenv("ANALYTICS_ROLLUP_INTERVAL_MINUTES", "15"))
+    # An hour is rolled up this long after it ends; keep above the analytics and request flush intervals
+    ANALYTICS_ROLLUP_LAG_SECONDS: float = float(os.getenv("ANALYTICS_ROLLUP_LAG_SECONDS", "300"))
+    ANALYTICS_ROLLUP_MAX_HOURS: int = int(os.getenv("ANALYTICS_ROLLUP_MAX_HOURS", "744"))  # per run
+    # Monthly partitions of analytics_events and activity_logs (python -m app.jobs.maintain_partitions)
+    PARTITION_MAINTENANCE_INTERVAL_HOURS: float = float(os.getenv("PARTITION_MAINTENANCE_INTERVAL_HOURS", "24"))
+    PARTITION_MONTHS_AHEAD: int = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+    # Whole months of raw events and logs kept before the current one; 0 keeps everything
+    ANALYTICS_RETENTION_MONTHS: int = int(os.getenv("ANALYTICS_RETENTION_MONTHS", "0"))
+    # "drop" deletes expired partitions, "archive" detaches them into ANALYTICS_ARCHIVE_SCHEMA
+    ANALYTICS_RETENTION_ACTION: str = os.getenv("ANALYTICS_RETENTION_ACTION", "drop")
+    ANALYTICS_ARCHIVE_SCHEMA: str = os.getenv("ANALYTICS_ARCHIVE_SCHEMA", "archive")
+    # Operator token for /metrics, sent as the X-Metrics-Token header; unset disables the endpoints
+    METRICS_TOKEN: Optional[str] = os.getenv("METRICS_TOKEN") or None
     # Add to your settings
     DEBUG_S3_OPERATIONS: bool = True  # Set to True in development
 
@@ -54,10 +144,13 @@ class Settings(BaseSettings):
             "JWT_SECRET_KEY": self.JWT_SECRET_KEY,
             "GOOGLE_CLIENT_ID": self.GOOGLE_CLIENT_ID,
             "GOOGLE_CLIENT_SECRET": self.GOOGLE_CLIENT_SECRET,
-            "AWS_ACCESS_KEY_ID": self.AWS_ACCESS_KEY_ID,
-            "AWS_SECRET_ACCESS_KEY": self.AWS_SECRET_ACCESS_KEY,
-            "AWS_BUCKET_NAME": self.AWS_BUCKET_NAME
         }
+        if self.STORAGE_BACKEND == "s3":
+            required_settings.update({
+                "AWS_ACCESS_KEY_ID": self.AWS_ACCESS_KEY_ID,
+                "AWS_SECRET_ACCESS_KEY": self.AWS_SECRET_ACCESS_KEY,
+                "AWS_BUCKET_NAME": self.AWS_BUCKET_NAME
+            })
 
         missing_settings = [k for k, v in required_settings.items() if not v]
         if missing_settings and self.ENVIRONMENT != "development":
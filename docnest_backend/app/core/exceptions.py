@@ -68,4 +68,11 @@ class CategoryInUse(HTTPException):
         super().__init__(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete category that is in use by documents"
+        )
+
+class StorageQuotaExceeded(HTTPException):
+    def __init__(self, quota_bytes: int):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Storage quota of {quota_bytes/1024/1024}MB exceeded"
         )
\ No newline at end of file
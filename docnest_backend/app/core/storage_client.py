@@ -0,0 +1,75 @@
+# app/core/storage_client.py
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+from .config import settings
+
+# One client per (service, region, endpoint), created on first use and shared by
+# every request in the process. boto3 clients are thread-safe, and each owns a
+# urllib3 connection pool, so reusing them keeps TCP/TLS connections warm.
+_clients: Dict[Tuple[str, Optional[str], Optional[str]], Any] = {}
+_lock = threading.Lock()
+
+
+def _client_config() -> Config:
+    return Config(
+        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=settings.S3_TCP_KEEPALIVE,
+        connect_timeout=settings.S3_CONNECT_TIMEOUT,
+        read_timeout=settings.S3_READ_TIMEOUT,
+        retries={
+            'mode': settings.S3_RETRY_MODE,
+            'max_attempts': settings.S3_MAX_ATTEMPTS
+        }
+    )
+
+
+def get_s3_client(
+    region_name: Optional[str] = None,
+    endpoint_url: Optional[str] = None
+):
+    """
+    Return the process-wide S3 client, creating it on first use.
+
+    Args:
+        region_name: AWS region, defaults to settings.AWS_REGION
+        endpoint_url: Custom endpoint, defaults to settings.AWS_S3_ENDPOINT_URL
+
+    Returns:
+        botocore.client.S3: Shared client instance
+    """
+    region_name = region_name or settings.AWS_REGION
+    endpoint_url = endpoint_url or settings.AWS_S3_ENDPOINT_URL
+    key = ('s3', region_name, endpoint_url)
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            # boto3's default session is not thread-safe, build from a private one
+            session = boto3.session.Session(
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=region_name
+            )
+            client = session.client(
+                's3',
+                endpoint_url=endpoint_url,
+                config=_client_config()
+            )
+            _clients[key] = client
+    return client
+
+
+def reset_storage_clients() -> None:
+    """Drop all cached clients (tests, or after forking a worker process)"""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -0,0 +1,139 @@
+# app/core/storage_executor.py
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+from .config import settings
+
+T = TypeVar("T")
+_SENTINEL = object()
+
+
+class StorageExecutor:
+    """
+    Bounded thread pool for blocking object-storage calls.
+
+    boto3 is synchronous, so every S3 request is handed to this pool instead of
+    running on the event loop. At most `max_workers` calls run at once; once
+    `max_queue` calls are waiting, new ones are rejected with 503 rather than
+    piling up behind a slow bucket.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="storage-io"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run fn(*args, **kwargs) on the storage pool and await its result"""
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Storage is busy, please retry"
+                )
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+
+        submitted = time.perf_counter()
+
+        def call() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._total_wait += started - submitted
+            failed = False
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._total_run += time.perf_counter() - started
+                    if failed:
+                        self._failed += 1
+                    else:
+                        self._completed += 1
+
+        def release_if_cancelled(future: Future) -> None:
+            # A caller cancelled while still queued (client gone, timeout):
+            # call() never runs, so its queue slot is given back here
+            if future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        future = self._executor.submit(call)
+        future.add_done_callback(release_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    async def iterate(self, iterator: Iterator[T]) -> AsyncIterator[T]:
+        """Drain a blocking iterator (e.g. a StreamingBody) one item at a time on the pool"""
+        while True:
+            item = await self.run(next, iterator, _SENTINEL)
+            if item is _SENTINEL:
+                return
+            yield item
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queue_depth": self._queued,
+                "peak_queue_depth": self._peak_queued,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait / finished * 1000, 2) if finished else 0.0,
+                "avg_run_ms": round(self._total_run / finished * 1000, 2) if finished else 0.0
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+_storage_executor: Optional[StorageExecutor] = None
+_lock = threading.Lock()
+
+
+def get_storage_executor() -> StorageExecutor:
+    """Return the process-wide storage executor, creating it on first use"""
+    global _storage_executor
+    if _storage_executor is None:
+        with _lock:
+            if _storage_executor is None:
+                _storage_executor = StorageExecutor(
+                    max_workers=settings.STORAGE_IO_MAX_WORKERS,
+                    max_queue=settings.STORAGE_IO_MAX_QUEUE
+                )
+    return _storage_executor
+
+
+def shutdown_storage_executor() -> None:
+    global _storage_executor
+    with _lock:
+        if _storage_executor is not None:
+            _storage_executor.shutdown()
+            _storage_executor = None
@@ -0,0 +1,31 @@
+# app/db/locks.py
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@asynccontextmanager
+async def try_advisory_lock(name: str, engine: Optional[AsyncEngine] = None) -> AsyncIterator[bool]:
+    """
+    Cross-process mutex for jobs every API worker schedules; yields whether it was acquired.
+
+    A transaction-level advisory lock, held on a dedicated connection until the
+    block exits, so it also holds through PgBouncer in transaction mode. Other
+    databases run a single process here and always get the lock.
+    """
+    if engine is None:
+        from .session import async_engine as engine
+
+    if engine.dialect.name != "postgresql":
+        yield True
+        return
+
+    async with engine.connect() as conn:
+        async with conn.begin():
+            acquired = await conn.scalar(
+                text("SELECT pg_try_advisory_xact_lock(hashtext(:name))"),
+                {"name": name}
+            )
+            yield bool(acquired)
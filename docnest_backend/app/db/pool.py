@@ -0,0 +1,88 @@
+# app/db/pool.py
+import threading
+import time
+from typing import Any, Dict
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+
+class InstrumentedPoolMixin:
+    """
+    Counts checkouts on a connection pool: how long they take (queueing for a
+    free connection, connecting and pre-ping included) and how many time out
+    with "QueuePool limit reached".
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_checkout_time = 0.0
+        self._max_checkout_time = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._stats_lock:
+                self._checkouts += 1
+                self._total_checkout_time += elapsed
+                self._max_checkout_time = max(self._max_checkout_time, elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            checkouts = self._checkouts
+            return {
+                "pool_size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_in": self.checkedin(),
+                "checked_out": self.checkedout(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": checkouts,
+                "timeouts": self._timeouts,
+                "avg_checkout_ms": round(self._total_checkout_time / checkouts * 1000, 2) if checkouts else 0.0,
+                "max_checkout_ms": round(self._max_checkout_time * 1000, 2)
+            }
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(async_engine: bool = False) -> Dict[str, Any]:
+    """create_engine/create_async_engine keyword arguments from the DB_POOL_* settings"""
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if async_engine else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "echo": settings.DEBUG
+    }
+
+    if settings.DB_PGBOUNCER and async_engine:
+        # In transaction pooling mode consecutive statements may run on different
+        # server connections, so asyncpg must not reuse named prepared statements
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__"
+        }
+
+    return options
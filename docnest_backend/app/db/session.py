@@ -1,18 +1,61 @@
+from typing import AsyncIterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import engine_options
+
+# Async drivers for the configured (sync) database URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Same database, addressed through its async driver (postgresql:// -> postgresql+asyncpg://)"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    parsed = parsed.set(drivername=ASYNC_DRIVERS[backend])
+    if "sslmode" in parsed.query and backend != "sqlite":
+        # libpq's sslmode (e.g. on hosted DATABASE_URLs) is spelled ssl for asyncpg
+        parsed = parsed.difference_update_query(["sslmode"]).update_query_dict({"ssl": parsed.query["sslmode"]})
+    return parsed.render_as_string(hide_password=False)
+
 
+# Sync engine: Alembic, init_db and maintenance scripts (app/jobs)
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
-    pool_pre_ping=True,
-    echo=settings.DEBUG
+    **engine_options()
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine: every API request
+async_engine = create_async_engine(
+    async_database_url(settings.SQLALCHEMY_DATABASE_URI),
+    **engine_options(async_engine=True)
+)
+# Objects stay usable after commit; with AsyncSession an expired attribute
+# cannot be lazily reloaded and would raise instead
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Dependency
-def get_db():
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,38 @@
+# app/db/upsert.py
+from typing import Union
+
+from sqlalchemy import DateTime, func, literal_column, type_coerce
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Union[Session, AsyncSession], table):
+    """
+    INSERT construct for the session's dialect, exposing on_conflict_do_*.
+
+    Postgres in production, SQLite for tests; both support ON CONFLICT ... RETURNING.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
+
+
+def dialect_greatest(db: Union[Session, AsyncSession], *values):
+    """Larger of the values: GREATEST() on Postgres, the scalar max() on SQLite"""
+    if db.get_bind().dialect.name == "sqlite":
+        return func.max(*values)
+    return func.greatest(*values)
+
+
+def dialect_day(db: Union[Session, AsyncSession], column):
+    """
+    Timestamp truncated to midnight, comparable with stored day columns.
+
+    date_trunc() on Postgres; on SQLite, the text form SQLAlchemy stores
+    DateTime values in. The arguments are literals so that the same expression
+    in SELECT and GROUP BY renders identically.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return type_coerce(func.strftime(literal_column("'%Y-%m-%d 00:00:00.000000'"), column), DateTime)
+    return type_coerce(func.date_trunc(literal_column("'day'"), column), DateTime)
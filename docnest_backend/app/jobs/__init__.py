@@ -0,0 +1,2 @@
+# app/jobs/__init__.py
+"""Maintenance jobs, runnable as `python -m app.jobs.<name>` or on the in-process schedule"""
@@ -0,0 +1,255 @@
+# app/jobs/maintain_partitions.py
+"""
+Create and expire the monthly partitions of analytics_events and activity_logs.
+
+Both tables are range-partitioned on created_at (alembic revision
+partition_log_tables), one partition per month named <table>_pYYYY_MM, plus a
+<table>_default partition catching rows no monthly partition covers. The job:
+
+- creates the partitions for the next PARTITION_MONTHS_AHEAD months, moving
+  any rows that landed in the default partition meanwhile;
+- drops, or detaches into ANALYTICS_ARCHIVE_SCHEMA, whole partitions older
+  than ANALYTICS_RETENTION_MONTHS. Dropping a partition frees its space at
+  once, where DELETE would leave dead rows for vacuum. Months the analytics
+  rollups have not covered yet are never expired, so /analytics/summary keeps
+  its history after the raw rows are gone.
+
+Postgres only; on other databases the job does nothing.
+
+    python -m app.jobs.maintain_partitions --dry-run
+"""
+import argparse
+import asyncio
+import json
+import logging
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.analytics_rollup import RollupState
+from ..services.analytics_rollups import ROLLUP_NAME
+
+logger = logging.getLogger("docnest")
+
+PARTITIONED_TABLES = ("analytics_events", "activity_logs")
+RETENTION_ACTIONS = ("drop", "archive")
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def plan_partitions(
+    existing: Iterable[datetime],
+    now: datetime,
+    months_ahead: int,
+    retention_months: int,
+    rolled_up_until: Optional[datetime]
+) -> Tuple[List[datetime], List[datetime]]:
+    """
+    Months to create and months to expire
+
+    Args:
+        existing: First day of each month that has a partition
+        now: Current time (UTC)
+        months_ahead: Future months that must have a partition
+        retention_months: Whole months kept before the current one, 0 keeps everything
+        rolled_up_until: Analytics rollup high-water mark; later months are kept
+
+    Returns:
+        Tuple[List[datetime], List[datetime]]: (to create, to expire), oldest first
+    """
+    existing = set(existing)
+    current = month_start(now)
+    create = [
+        month for month in (add_months(current, offset) for offset in range(months_ahead + 1))
+        if month not in existing
+    ]
+
+    expire = []
+    if retention_months > 0:
+        cutoff = add_months(current, -retention_months)
+        expire = [
+            month for month in sorted(existing)
+            if month < cutoff and rolled_up_until is not None and add_months(month, 1) <= rolled_up_until
+        ]
+    return create, expire
+
+
+def _existing_partitions(db: Session, table: str) -> Dict[datetime, str]:
+    pattern = re.compile(rf"^{table}_p(\d{{4}})_(\d{{2}})$")
+    names = db.execute(
+        text("""
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            WHERE parent.relname = :table
+        """),
+        {"table": table}
+    ).scalars()
+    partitions = {}
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            partitions[datetime(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def _create_partition(db: Session, table: str, month: datetime) -> None:
+    """
+    Create and attach one month's partition
+
+    Built as a plain table and attached, rather than CREATE ... PARTITION OF,
+    so rows already in the default partition for that month can be moved in
+    first; attaching fails while the default partition still holds any.
+    """
+    name = partition_name(table, month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+    db.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    db.execute(
+        text(f"""
+            WITH moved AS (
+                DELETE FROM {table}_default WHERE created_at >= :start AND created_at < :end RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """),
+        bounds
+    )
+    # Indexes and the primary key are created on attach, from the parent's
+    db.execute(text(
+        f"ALTER TABLE {table} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{bounds['start']:%Y-%m-%d}') TO ('{bounds['end']:%Y-%m-%d}')"
+    ))
+
+
+def _expire_partition(db: Session, table: str, name: str, action: str) -> None:
+    if action == "archive":
+        schema = settings.ANALYTICS_ARCHIVE_SCHEMA
+        db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+        db.execute(text(f"ALTER TABLE {name} SET SCHEMA {schema}"))
+    else:
+        db.execute(text(f"DROP TABLE {name}"))
+
+
+def maintain_partitions(
+    db: Session,
+    now: Optional[datetime] = None,
+    months_ahead: Optional[int] = None,
+    retention_months: Optional[int] = None,
+    action: Optional[str] = None,
+    dry_run: bool = False
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Create upcoming partitions and expire old ones, each table in its own transaction
+
+    Args:
+        db: Database session
+        now: Current time (UTC), for tests
+        months_ahead: Defaults to PARTITION_MONTHS_AHEAD
+        retention_months: Defaults to ANALYTICS_RETENTION_MONTHS
+        action: "drop" or "archive", defaults to ANALYTICS_RETENTION_ACTION
+        dry_run: Report what would change without changing anything
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: Partitions created and expired, per table
+    """
+    now = now or datetime.utcnow()
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    retention_months = settings.ANALYTICS_RETENTION_MONTHS if retention_months is None else retention_months
+    action = action or settings.ANALYTICS_RETENTION_ACTION
+    if action not in RETENTION_ACTIONS:
+        raise ValueError(f"Unknown retention action {action!r}, expected one of {RETENTION_ACTIONS}")
+
+    if db.get_bind().dialect.name != "postgresql":
+        logger.info("Partition maintenance skipped: the log tables are only partitioned on Postgres")
+        return {}
+
+    rolled_up_until = db.scalar(select(RollupState.high_water_mark).where(RollupState.name == ROLLUP_NAME))
+    report = {}
+    for table in PARTITIONED_TABLES:
+        # Held until this table's commit, so concurrent runs (each API worker's
+        # schedule, the CLI) never create or expire the same partition twice
+        if not dry_run and not db.scalar(
+            text("SELECT pg_try_advisory_xact_lock(hashtext(:name))"),
+            {"name": f"maintain_partitions:{table}"}
+        ):
+            logger.info(f"Partitions of {table} skipped: being maintained by another process")
+            continue
+        existing = _existing_partitions(db, table)
+        create, expire = plan_partitions(existing, now, months_ahead, retention_months, rolled_up_until)
+        report[table] = {
+            "created": [partition_name(table, month) for month in create],
+            "expired": [existing[month] for month in expire]
+        }
+        if dry_run:
+            continue
+        try:
+            for month in create:
+                _create_partition(db, table, month)
+            for month in expire:
+                _expire_partition(db, table, existing[month], action)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        logger.info(f"Partitions of {table}: {json.dumps(report[table])}")
+    return report
+
+
+async def run_scheduled_partition_maintenance() -> None:
+    """Entry point for the in-process schedule (PARTITION_MAINTENANCE_INTERVAL_HOURS)"""
+    def run() -> None:
+        db = SessionLocal()
+        try:
+            maintain_partitions(db)
+        finally:
+            db.close()
+
+    await asyncio.to_thread(run)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Create and expire monthly partitions of the log tables")
+    parser.add_argument("--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD)
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=settings.ANALYTICS_RETENTION_MONTHS,
+        help="Whole months kept before the current one, 0 keeps everything"
+    )
+    parser.add_argument("--action", choices=RETENTION_ACTIONS, default=settings.ANALYTICS_RETENTION_ACTION)
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without making them")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    db = SessionLocal()
+    try:
+        report = maintain_partitions(
+            db,
+            months_ahead=args.months_ahead,
+            retention_months=args.retention_months,
+            action=args.action,
+            dry_run=args.dry_run
+        )
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# app/jobs/reconcile_storage.py
+"""
+Delete objects in storage that no document or blob references any more.
+
+Orphans are left behind when a request fails between the storage write and the
+database commit, or when a post-commit delete fails. The job pages through the
+bucket, looks each page of keys up in bulk, and deletes orphans in batches, so
+memory stays bounded by one page plus one delete batch however large the bucket.
+
+    python -m app.jobs.reconcile_storage --dry-run
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.blob import Blob
+from ..models.document import Document
+from ..services.storage import StorageBackend, get_storage_backend, storage_key
+from ..services.storage.url_cache import get_presigned_url_cache
+
+logger = logging.getLogger("docnest")
+
+# DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+
+
+class ReconcileStats:
+    """Progress counters of a reconciliation run"""
+
+    def __init__(self, dry_run: bool):
+        self.dry_run = dry_run
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.pages = 0
+        self.scanned = 0
+        self.referenced = 0
+        self.skipped_recent = 0
+        self.orphaned = 0
+        self.orphaned_bytes = 0
+        self.deleted = 0
+        self.failed = 0
+        self._started = time.perf_counter()
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self._started
+        return {
+            "dry_run": self.dry_run,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "pages": self.pages,
+            "scanned": self.scanned,
+            "referenced": self.referenced,
+            "skipped_recent": self.skipped_recent,
+            "orphaned": self.orphaned,
+            "orphaned_bytes": self.orphaned_bytes,
+            "deleted": self.deleted,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 2),
+            "keys_per_second": round(self.scanned / elapsed, 1) if elapsed else 0.0
+        }
+
+
+_last_run: Optional[ReconcileStats] = None
+
+
+def get_last_reconcile_stats() -> Optional[Dict[str, Any]]:
+    """Counters of the current or most recent run in this process"""
+    return _last_run.as_dict() if _last_run else None
+
+
+def _legacy_keys(db: Session) -> Set[str]:
+    """Keys of old rows that stored the full S3 URL instead of the key"""
+    rows = db.query(Document.file_path).filter(Document.file_path.like("http%")).yield_per(1000)
+    return {storage_key(file_path) for (file_path,) in rows}
+
+
+def _referenced_keys(db: Session, keys: List[str]) -> Set[str]:
+    referenced = {
+        file_path for (file_path,) in
+        db.query(Document.file_path).filter(Document.file_path.in_(keys))
+    }
+    referenced.update(
+        storage_key for (storage_key,) in
+        db.query(Blob.storage_key).filter(Blob.storage_key.in_(keys))
+    )
+    return referenced
+
+
+async def reconcile_orphans(
+    db: Session,
+    storage: Optional[StorageBackend] = None,
+    prefix: str = "documents/",
+    dry_run: bool = False,
+    grace_period: Optional[timedelta] = None,
+    page_size: int = 1000
+) -> ReconcileStats:
+    """
+    Find and delete unreferenced objects under a prefix
+
+    Args:
+        db: Database session
+        storage: Backend to reconcile, the configured one by default
+        prefix: Only keys under this prefix are considered
+        dry_run: Count orphans without deleting anything
+        grace_period: Objects modified more recently are left alone
+        page_size: Keys listed and looked up per round trip
+
+    Returns:
+        ReconcileStats: Counters for the run
+    """
+    global _last_run
+    storage = storage or get_storage_backend()
+    if grace_period is None:
+        grace_period = timedelta(hours=settings.ORPHAN_RECONCILE_GRACE_HOURS)
+    cutoff = datetime.now(timezone.utc) - grace_period
+
+    stats = ReconcileStats(dry_run)
+    _last_run = stats
+    # Session queries are blocking: they run on a worker thread, one at a time,
+    # so the scheduled run does not stall requests on the event loop
+    legacy = await asyncio.to_thread(_legacy_keys, db)
+    pending: List[str] = []
+
+    async def flush() -> None:
+        if not dry_run and pending:
+            failed = await storage.delete_many(pending)
+            stats.failed += len(failed)
+            stats.deleted += len(pending) - len(failed)
+            for key in pending:
+                get_presigned_url_cache().invalidate(key)
+        pending.clear()
+
+    async for page in storage.list_objects(prefix, page_size=page_size):
+        stats.pages += 1
+        stats.scanned += len(page)
+        referenced = await asyncio.to_thread(_referenced_keys, db, [obj.key for obj in page]) if page else set()
+
+        for obj in page:
+            if obj.key in referenced or obj.key in legacy:
+                stats.referenced += 1
+            elif obj.last_modified and obj.last_modified > cutoff:
+                stats.skipped_recent += 1
+            else:
+                stats.orphaned += 1
+                stats.orphaned_bytes += obj.size
+                pending.append(obj.key)
+                if len(pending) >= DELETE_BATCH_SIZE:
+                    await flush()
+
+        logger.info(
+            f"Reconcile {prefix}: page {stats.pages}, scanned {stats.scanned}, "
+            f"orphaned {stats.orphaned}, deleted {stats.deleted}"
+        )
+
+    await flush()
+    stats.finished_at = datetime.utcnow()
+    logger.info(f"Reconcile {prefix} finished: {json.dumps(stats.as_dict())}")
+    return stats
+
+
+async def run_scheduled_reconcile() -> None:
+    """Entry point for the in-process schedule (ORPHAN_RECONCILE_INTERVAL_HOURS)"""
+    db = SessionLocal()
+    try:
+        await reconcile_orphans(db, dry_run=settings.ORPHAN_RECONCILE_DRY_RUN)
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Delete storage objects no document references")
+    parser.add_argument("--prefix", default="documents/", help="Key prefix to reconcile")
+    parser.add_argument("--dry-run", action="store_true", help="Report orphans without deleting them")
+    parser.add_argument(
+        "--grace-hours",
+        type=float,
+        default=settings.ORPHAN_RECONCILE_GRACE_HOURS,
+        help="Ignore objects modified within this many hours"
+    )
+    parser.add_argument("--page-size", type=int, default=1000, help="Keys listed per request (max 1000)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    db = SessionLocal()
+    try:
+        stats = asyncio.run(reconcile_orphans(
+            db,
+            prefix=args.prefix,
+            dry_run=args.dry_run,
+            grace_period=timedelta(hours=args.grace_hours),
+            page_size=args.page_size
+        ))
+    finally:
+        db.close()
+    print(json.dumps(stats.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
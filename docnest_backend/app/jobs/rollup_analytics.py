@@ -0,0 +1,62 @@
+# app/jobs/rollup_analytics.py
+"""
+Fold raw analytics into the hourly and daily rollup tables.
+
+Runs in-process every ANALYTICS_ROLLUP_INTERVAL_MINUTES; the CLI is for the
+first backfill and for catching up after downtime, one batch of hours at a time.
+
+    python -m app.jobs.rollup_analytics --max-hours 2000
+"""
+import argparse
+import asyncio
+import logging
+from typing import List, Optional
+
+from ..core.config import settings
+from ..db.session import AsyncSessionLocal
+from ..services.analytics_rollups import AnalyticsRollupService
+
+logger = logging.getLogger("docnest")
+
+
+async def rollup_analytics(max_hours: Optional[int] = None) -> int:
+    """Roll up complete hours since the high-water mark; returns hours rolled up"""
+    async with AsyncSessionLocal() as db:
+        service = AnalyticsRollupService(db)
+        rolled = await service.roll_up(max_hours=max_hours)
+        if rolled:
+            logger.info(f"Rolled up {rolled} hours of analytics, now up to {await service.high_water_mark()}")
+        return rolled
+
+
+async def run_scheduled_rollup() -> None:
+    """Entry point for the in-process schedule (ANALYTICS_ROLLUP_INTERVAL_MINUTES)"""
+    await rollup_analytics()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Roll up analytics events, activity logs and request metrics")
+    parser.add_argument(
+        "--max-hours",
+        type=int,
+        default=settings.ANALYTICS_ROLLUP_MAX_HOURS,
+        help="Hours rolled up per batch"
+    )
+    parser.add_argument("--once", action="store_true", help="Stop after one batch instead of catching up")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    async def run() -> int:
+        total = 0
+        while True:
+            rolled = await rollup_analytics(args.max_hours)
+            total += rolled
+            if args.once or rolled < args.max_hours:
+                return total
+
+    print(f"Rolled up {asyncio.run(run())} hours")
+
+
+if __name__ == "__main__":
+    main()
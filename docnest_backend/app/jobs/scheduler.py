@@ -0,0 +1,63 @@
+# app/jobs/scheduler.py
+import asyncio
+import logging
+from typing import Awaitable, Callable, List
+
+from ..db.locks import try_advisory_lock
+
+logger = logging.getLogger("docnest")
+
+_tasks: List[asyncio.Task] = []
+
+
+async def _run_exclusively(name: str, job: Callable[[], Awaitable]) -> None:
+    async with try_advisory_lock(f"job:{name}") as acquired:
+        if acquired:
+            await job()
+        else:
+            logger.info(f"Scheduled job {name} skipped: running in another process")
+
+
+async def _run_periodically(
+    name: str,
+    interval_seconds: float,
+    job: Callable[[], Awaitable],
+    exclusive: bool
+) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            if exclusive:
+                await _run_exclusively(name, job)
+            else:
+                await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # A failed run must not stop the schedule
+            logger.exception(f"Scheduled job {name} failed")
+
+
+def schedule_periodic(
+    name: str,
+    interval_seconds: float,
+    job: Callable[[], Awaitable],
+    exclusive: bool = False
+) -> None:
+    """
+    Run `job` every `interval_seconds` on the running event loop, first run after one interval
+
+    Every API worker process schedules the same jobs. An `exclusive` job runs
+    in at most one of them at a time (a Postgres advisory lock on its name);
+    the others skip that run.
+    """
+    logger.info(f"Scheduling job {name} every {interval_seconds:.0f}s")
+    _tasks.append(asyncio.create_task(_run_periodically(name, interval_seconds, job, exclusive), name=name))
+
+
+async def cancel_scheduled() -> None:
+    """Stop all scheduled jobs, waiting for a run in progress to be cancelled"""
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
@@ -2,6 +2,19 @@ from .user import User
 from .document import Document
 from .activity_log import ActivityLog
 from .analytics_event import AnalyticsEvent
+from .blob import Blob
+from .category import Category
+from .usage import UserUsage
+from .text_extraction import TextExtraction
+from .request_metric import RequestMetric
+from .analytics_rollup import (
+    DailyActiveUser,
+    EventCountDaily,
+    EventCountHourly,
+    RequestMetricDaily,
+    RollupState
+)
 
 # This ensures all models are loaded before relationships are established
-__all__ = ['User', 'Document', 'ActivityLog', 'AnalyticsEvent']
\ No newline at end of file
+__all__ = ['User', 'Document', 'ActivityLog', 'AnalyticsEvent', 'Blob', 'Category', 'UserUsage', 'TextExtraction', 'RequestMetric',
+           'EventCountHourly', 'EventCountDaily', 'RequestMetricDaily', 'DailyActiveUser', 'RollupState']
\ No newline at end of file
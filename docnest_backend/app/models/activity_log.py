@@ -1,5 +1,5 @@
 # app/models/activity_log.py
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from uuid import uuid4
@@ -7,6 +7,11 @@ from ..db.base import Base
 
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        # /analytics/logs: date range and/or action, newest first
+        Index("ix_activity_logs_created_at", "created_at"),
+        Index("ix_activity_logs_action_created", "action", "created_at"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -16,7 +21,8 @@ class ActivityLog(Base):
     details = Column(JSON)  # Additional context about the action
     ip_address = Column(String)
     user_agent = Column(String)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Partition key (monthly ranges, see app/jobs/maintain_partitions.py), so part of the primary key
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
 
     # Relationships
     user = relationship("User", back_populates="activity_logs")
\ No newline at end of file
@@ -1,5 +1,5 @@
 # app/models/analytics_event.py
-from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey, Integer, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from uuid import uuid4
@@ -7,6 +7,11 @@ from ..db.base import Base
 
 class AnalyticsEvent(Base):
     __tablename__ = "analytics_events"
+    __table_args__ = (
+        # /analytics/events and the rollup job: date range and/or event type
+        Index("ix_analytics_events_created_at", "created_at"),
+        Index("ix_analytics_events_type_created", "event_type", "created_at"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid4()))
     user_id = Column(String, ForeignKey("users.id"))
@@ -15,7 +20,8 @@ class AnalyticsEvent(Base):
     properties = Column(JSON)  # Event-specific data
     session_id = Column(String)
     device_info = Column(JSON)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Partition key (monthly ranges, see app/jobs/maintain_partitions.py), so part of the primary key
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
     
     # Optional metrics
     duration = Column(Integer)  # Duration in milliseconds if applicable
@@ -0,0 +1,51 @@
+# app/models/analytics_rollup.py
+from sqlalchemy import Column, String, DateTime, Integer, Float
+from datetime import datetime
+from ..db.base import Base
+
+# Maintained by app/jobs/rollup_analytics.py up to RollupState.high_water_mark.
+# Hourly request metrics need no rollup table: request_metrics already is one.
+
+class EventCountHourly(Base):
+    __tablename__ = "event_counts_hourly"
+
+    bucket_start = Column(DateTime, primary_key=True)
+    event_type = Column(String, primary_key=True)
+    event_category = Column(String, primary_key=True)  # "" for events without one
+    count = Column(Integer, nullable=False, default=0)
+
+class EventCountDaily(Base):
+    __tablename__ = "event_counts_daily"
+
+    bucket_start = Column(DateTime, primary_key=True)
+    event_type = Column(String, primary_key=True)
+    event_category = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class RequestMetricDaily(Base):
+    """request_metrics summed per day"""
+    __tablename__ = "request_metrics_daily"
+
+    bucket_start = Column(DateTime, primary_key=True)
+    method = Column(String(10), primary_key=True)
+    route = Column(String, primary_key=True)
+    status_class = Column(String(3), primary_key=True)
+    request_count = Column(Integer, nullable=False, default=0)
+    sampled_count = Column(Integer, nullable=False, default=0)
+    duration_ms_sum = Column(Float, nullable=False, default=0)
+    duration_ms_max = Column(Float, nullable=False, default=0)
+
+class DailyActiveUser(Base):
+    """One row per user with activity on a day; counted per day by the summary"""
+    __tablename__ = "daily_active_users"
+
+    day = Column(DateTime, primary_key=True)
+    user_id = Column(String, primary_key=True)
+
+class RollupState(Base):
+    """Everything created before high_water_mark (an hour boundary) is in the rollups"""
+    __tablename__ = "rollup_state"
+
+    name = Column(String, primary_key=True)
+    high_water_mark = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,15 @@
+# app/models/blob.py
+from sqlalchemy import Column, String, DateTime, Integer
+from datetime import datetime
+from ..db.base import Base
+
+class Blob(Base):
+    """A stored object shared by every document whose content has this SHA-256"""
+    __tablename__ = "blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    storage_key = Column(String, nullable=False, unique=True)
+    size = Column(Integer, nullable=False)
+    content_type = Column(String, nullable=True)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
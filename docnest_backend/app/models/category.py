@@ -0,0 +1,21 @@
+# app/models/category.py
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, BigInteger, UniqueConstraint
+from datetime import datetime
+from uuid import uuid4
+from ..db.base import Base
+
+class Category(Base):
+    """A user's document category with running totals of the documents in it"""
+    __tablename__ = "categories"
+    __table_args__ = (
+        # Also the index behind GET /categories and the count upserts
+        UniqueConstraint("owner_id", "name", name="uq_categories_owner_name"),
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid4()))
+    owner_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String, nullable=False)
+    # Maintained in the same transaction as every document insert, move and delete
+    document_count = Column(Integer, nullable=False, default=0)
+    total_bytes = Column(BigInteger, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,25 +1,71 @@
 # app/models/document.py
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, Boolean, Index, DDL, event, text
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 from uuid import uuid4
 from ..db.base import Base
 
+# Keys handed out for direct uploads (DocumentService.create_upload_url); unlike
+# blob keys, each belongs to exactly one document
+DIRECT_UPLOAD_KEY = text("file_path LIKE 'documents/%/uploads/%'")
+
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        # Document list: owner_id (+ category), newest first; id is the keyset
+        # tiebreak, so the index yields pages in (created_at, id) order
+        Index("ix_documents_owner_created", "owner_id", "created_at", "id"),
+        Index("ix_documents_owner_category_created", "owner_id", "category", "created_at", "id"),
+        # Two finalize_upload calls for the same key cannot both create a document
+        Index(
+            "ux_documents_direct_upload_key", "file_path", unique=True,
+            postgresql_where=DIRECT_UPLOAD_KEY, sqlite_where=DIRECT_UPLOAD_KEY
+        ),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid4()))
     name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
-    file_path = Column(String, nullable=True)
+    file_path = Column(String, nullable=True, index=True)
     file_size = Column(Integer, nullable=True)
     file_type = Column(String, nullable=True)
     category = Column(String, nullable=False)
     version = Column(Integer, default=1)
     is_shared = Column(Boolean, default=False)
     owner_id = Column(String, ForeignKey("users.id"), nullable=False)
+    # Content-addressed blob holding the file; NULL for files stored before deduplication
+    blob_sha256 = Column(String(64), ForeignKey("blobs.sha256"), nullable=True, index=True)
+    # Text extracted from the file in the background (app/services/extraction_pipeline.py),
+    # only for the search index; deferred so document queries never load it
+    content_text = deferred(Column(Text, nullable=True))
     created_at = Column(DateTime, default=datetime.utcnow)
     modified_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    owner = relationship("User", back_populates="documents")
\ No newline at end of file
+    owner = relationship("User", back_populates="documents")
+
+
+# Full-text search. On Postgres, documents.search_vector is a generated
+# tsvector column with a GIN index (migrations add_document_search and
+# add_text_extraction); it is left out of the model so the ORM never
+# selects it. SQLite (tests and the local stand-in) gets an FTS5 index
+# kept current by triggers instead.
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5("
+    "name, description, content_text, content='documents', content_rowid='rowid')",
+    "CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents BEGIN "
+    "INSERT INTO documents_fts(rowid, name, description, content_text) "
+    "VALUES (new.rowid, new.name, new.description, new.content_text); END",
+    "CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents BEGIN "
+    "INSERT INTO documents_fts(documents_fts, rowid, name, description, content_text) "
+    "VALUES ('delete', old.rowid, old.name, old.description, old.content_text); END",
+    "CREATE TRIGGER IF NOT EXISTS documents_fts_update AFTER UPDATE OF name, description, content_text "
+    "ON documents BEGIN "
+    "INSERT INTO documents_fts(documents_fts, rowid, name, description, content_text) "
+    "VALUES ('delete', old.rowid, old.name, old.description, old.content_text); "
+    "INSERT INTO documents_fts(rowid, name, description, content_text) "
+    "VALUES (new.rowid, new.name, new.description, new.content_text); END",
+]
+
+for statement in SQLITE_FTS_DDL:
+    event.listen(Document.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
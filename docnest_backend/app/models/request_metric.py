@@ -0,0 +1,21 @@
+# app/models/request_metric.py
+from sqlalchemy import Column, String, DateTime, Integer, Float
+from ..db.base import Base
+
+class RequestMetric(Base):
+    """
+    Request counts and latency per hour, route template, method and status class,
+    flushed from the in-memory aggregate of app/core/analytics_middleware.py
+    """
+    __tablename__ = "request_metrics"
+
+    bucket_start = Column(DateTime, primary_key=True)  # UTC hour
+    method = Column(String(10), primary_key=True)
+    route = Column(String, primary_key=True)  # e.g. "/api/v1/documents/{document_id}"
+    status_class = Column(String(3), primary_key=True)  # "2xx", "4xx", ...
+    # Estimated from the sampled requests (each counts 1 / sample rate)
+    request_count = Column(Integer, nullable=False, default=0)
+    # Durations are summed over sampled requests only: avg = sum / sampled_count
+    sampled_count = Column(Integer, nullable=False, default=0)
+    duration_ms_sum = Column(Float, nullable=False, default=0)
+    duration_ms_max = Column(Float, nullable=False, default=0)
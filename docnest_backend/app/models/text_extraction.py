@@ -0,0 +1,29 @@
+# app/models/text_extraction.py
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Text, Index
+from datetime import datetime
+from ..db.base import Base
+
+# TextExtraction.status values
+EXTRACTION_PENDING = "pending"
+EXTRACTION_PROCESSING = "processing"
+EXTRACTION_DONE = "done"
+EXTRACTION_FAILED = "failed"
+EXTRACTION_UNSUPPORTED = "unsupported"
+
+class TextExtraction(Base):
+    """Progress of extracting a document's file into documents.content_text"""
+    __tablename__ = "text_extractions"
+    __table_args__ = (
+        # Sweep for due work: status = 'pending' AND next_attempt_at <= now
+        Index("ix_text_extractions_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    document_id = Column(String, ForeignKey("documents.id", ondelete="CASCADE"), primary_key=True)
+    # File the text comes from; a replaced file restarts extraction under its new key
+    source_key = Column(String, nullable=True)
+    status = Column(String, nullable=False, default=EXTRACTION_PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    extracted_chars = Column(Integer, nullable=True)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,14 @@
+# app/models/usage.py
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, BigInteger
+from datetime import datetime
+from ..db.base import Base
+
+class UserUsage(Base):
+    """Running storage totals of one user; the per-category split lives on Category"""
+    __tablename__ = "user_usage"
+
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    # Sum of documents.file_size, counted per document even when blobs are shared
+    total_bytes = Column(BigInteger, nullable=False, default=0)
+    document_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
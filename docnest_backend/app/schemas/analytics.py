@@ -1,5 +1,5 @@
 # app/schemas/analytics.py
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
@@ -31,11 +31,16 @@ class AnalyticsEventResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# Built once at import; list routes serialize through them (see app/utils/responses.py)
+ActivityLogListAdapter = TypeAdapter(List[ActivityLogResponse])
+AnalyticsEventListAdapter = TypeAdapter(List[AnalyticsEventResponse])
+
 class DailyUserCount(BaseModel):
     date: datetime
     count: int
 
 class AnalyticsSummary(BaseModel):
     event_counts: Dict[str, int]
+    event_category_counts: Dict[str, int] = {}
     avg_request_duration_ms: Optional[int]
     daily_active_users: List[DailyUserCount]
\ No newline at end of file
@@ -0,0 +1,8 @@
+# app/schemas/category.py
+from pydantic import BaseModel
+
+class CategoryResponse(BaseModel):
+    name: str
+    document_count: int
+    total_bytes: int
+    is_default: bool
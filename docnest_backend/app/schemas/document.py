@@ -1,6 +1,6 @@
 # app/schemas/document.py
-from pydantic import BaseModel, constr
-from typing import Optional
+from pydantic import BaseModel, TypeAdapter, constr
+from typing import Optional, Dict, List
 from datetime import datetime
 
 class DocumentBase(BaseModel):
@@ -31,4 +31,44 @@ class DocumentInDB(DocumentBase):
         from_attributes = True
 
 class DocumentResponse(DocumentInDB):
-    pass
\ No newline at end of file
+    pass
+
+# Built once at import; list routes serialize through it (see app/utils/responses.py)
+DocumentListAdapter = TypeAdapter(List[DocumentResponse])
+
+class DocumentSearchResult(BaseModel):
+    document: DocumentResponse
+    rank: float
+    # Matches wrapped in <mark></mark>; snippet is from the description or file text
+    name_highlight: str
+    snippet: Optional[str] = None
+
+class TextExtractionStatus(BaseModel):
+    # pending, processing, done, failed or unsupported
+    status: str
+    attempts: int
+    last_error: Optional[str] = None
+    extracted_chars: Optional[int] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+# Columns of the slim document list (GET /documents/?view=slim)
+SLIM_LIST_FIELDS = ("id", "name", "category", "file_type", "file_size", "modified_at")
+
+class UploadUrlRequest(BaseModel):
+    filename: constr(min_length=1, max_length=255)
+    content_type: str
+    size: Optional[int] = None
+
+class UploadUrlResponse(BaseModel):
+    key: str
+    url: str
+    fields: Dict[str, str]
+    method: str
+    max_size: int
+    expires_in: int
+
+class UploadFinalize(DocumentBase):
+    key: str
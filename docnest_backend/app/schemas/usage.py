@@ -0,0 +1,10 @@
+# app/schemas/usage.py
+from pydantic import BaseModel
+from typing import List, Optional
+from .category import CategoryResponse
+
+class UsageResponse(BaseModel):
+    total_bytes: int
+    document_count: int
+    quota_bytes: Optional[int]
+    categories: List[CategoryResponse]
@@ -1,16 +1,16 @@
 # app/services/activity_logger.py
 from typing import Optional, Dict, Any
 from fastapi import Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.activity_log import ActivityLog
 from ..models.user import User
 
 # services/activity_logger.py
 class ActivityLogger:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def log_activity(
+    def log_activity(
         self,
         user: User,
         action: str,
@@ -19,32 +19,28 @@ class ActivityLogger:
         details: Optional[Dict[str, Any]] = None,
         request: Optional[Request] = None
     ) -> ActivityLog:
-        try:
-            ip_address = None
-            user_agent = None
-            
-            if request:
-                ip_address = request.client.host
-                user_agent = request.headers.get("user-agent")
+        """
+        Add an activity log entry to the caller's transaction
 
-            log_entry = ActivityLog(
-                user_id=user.id,  # Make sure this gets set
-                action=action,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                details=details or {},
-                ip_address=ip_address,
-                user_agent=user_agent
-            )
-            
-            self.db.add(log_entry)
-            self.db.commit()
-            self.db.refresh(log_entry)
-            
-            return log_entry
-            
-        except Exception as e:
-            self.db.rollback()
-            print(f"Error logging activity: {e}")
-            # You might want to handle this error differently
-            raise
+        Nothing is committed here: the entry is written by the same commit as
+        the change it records, or not at all.
+        """
+        ip_address = None
+        user_agent = None
+
+        if request:
+            ip_address = request.client.host if request.client else None
+            user_agent = request.headers.get("user-agent")
+
+        log_entry = ActivityLog(
+            user_id=user.id,  # Make sure this gets set
+            action=action,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            details=details or {},
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+
+        self.db.add(log_entry)
+        return log_entry
@@ -0,0 +1,311 @@
+# app/services/analytics_rollups.py
+"""
+Hourly and daily rollups of analytics_events, activity_logs and request_metrics.
+
+roll_up() folds every complete hour since the high-water mark into the rollup
+tables and moves the mark, in one transaction, so each hour is counted exactly
+once. Hours are only rolled up ANALYTICS_ROLLUP_LAG_SECONDS after they end,
+leaving time for buffered events and request metrics to be flushed.
+
+summary() answers /analytics/summary from the daily rollups for whole days,
+the hourly ones for the partial days at either end, and the raw tables only
+for the time since the high-water mark.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import distinct, exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..db.upsert import dialect_day, dialect_insert
+from ..models.activity_log import ActivityLog
+from ..models.analytics_event import AnalyticsEvent
+from ..models.analytics_rollup import (
+    DailyActiveUser,
+    EventCountDaily,
+    EventCountHourly,
+    RequestMetricDaily,
+    RollupState
+)
+from ..models.request_metric import RequestMetric
+
+ROLLUP_NAME = "analytics"
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+
+def floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def floor_day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def ceil_day(value: datetime) -> datetime:
+    day = floor_day(value)
+    return day if day == value else day + DAY
+
+
+def _event_category():
+    # Part of the rollup keys, so events without a category count under ""
+    return func.coalesce(AnalyticsEvent.event_category, "")
+
+
+class AnalyticsRollupService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def high_water_mark(self) -> Optional[datetime]:
+        return await self.db.scalar(select(RollupState.high_water_mark).where(RollupState.name == ROLLUP_NAME))
+
+    async def _first_hour(self) -> Optional[datetime]:
+        """Start of the oldest hour with data, where a first run begins"""
+        starts = [
+            await self.db.scalar(select(func.min(AnalyticsEvent.created_at))),
+            await self.db.scalar(select(func.min(ActivityLog.created_at))),
+            await self.db.scalar(select(func.min(RequestMetric.bucket_start)))
+        ]
+        starts = [start for start in starts if start is not None]
+        return floor_hour(min(starts)) if starts else None
+
+    async def _roll_up_hour(self, hour: datetime) -> None:
+        end = hour + HOUR
+        category_key = _event_category()
+        counts = (await self.db.execute(
+            select(AnalyticsEvent.event_type, category_key, func.count()).where(
+                AnalyticsEvent.created_at >= hour,
+                AnalyticsEvent.created_at < end
+            ).group_by(AnalyticsEvent.event_type, category_key)
+        )).all()
+        if counts:
+            table = EventCountHourly.__table__
+            stmt = dialect_insert(self.db, table)
+            await self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[table.c.bucket_start, table.c.event_type, table.c.event_category],
+                    set_={"count": stmt.excluded["count"]}
+                ),
+                [
+                    {"bucket_start": hour, "event_type": event_type, "event_category": category, "count": count}
+                    for event_type, category, count in counts
+                ]
+            )
+
+        user_ids = (await self.db.execute(
+            select(distinct(ActivityLog.user_id)).where(
+                ActivityLog.created_at >= hour,
+                ActivityLog.created_at < end
+            )
+        )).scalars().all()
+        if user_ids:
+            await self.db.execute(
+                dialect_insert(self.db, DailyActiveUser.__table__).on_conflict_do_nothing(),
+                [{"day": floor_day(hour), "user_id": user_id} for user_id in user_ids]
+            )
+
+    async def _roll_up_day(self, day: datetime) -> None:
+        """Recompute a day's rows from its hourly ones, so rerunning a day is harmless"""
+        end = day + DAY
+        counts = (await self.db.execute(
+            select(
+                EventCountHourly.event_type,
+                EventCountHourly.event_category,
+                func.sum(EventCountHourly.count)
+            ).where(
+                EventCountHourly.bucket_start >= day,
+                EventCountHourly.bucket_start < end
+            ).group_by(EventCountHourly.event_type, EventCountHourly.event_category)
+        )).all()
+        if counts:
+            table = EventCountDaily.__table__
+            stmt = dialect_insert(self.db, table)
+            await self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[table.c.bucket_start, table.c.event_type, table.c.event_category],
+                    set_={"count": stmt.excluded["count"]}
+                ),
+                [
+                    {"bucket_start": day, "event_type": event_type, "event_category": category, "count": count}
+                    for event_type, category, count in counts
+                ]
+            )
+
+        requests = (await self.db.execute(
+            select(
+                RequestMetric.method,
+                RequestMetric.route,
+                RequestMetric.status_class,
+                func.sum(RequestMetric.request_count),
+                func.sum(RequestMetric.sampled_count),
+                func.sum(RequestMetric.duration_ms_sum),
+                func.max(RequestMetric.duration_ms_max)
+            ).where(
+                RequestMetric.bucket_start >= day,
+                RequestMetric.bucket_start < end
+            ).group_by(RequestMetric.method, RequestMetric.route, RequestMetric.status_class)
+        )).all()
+        if requests:
+            table = RequestMetricDaily.__table__
+            stmt = dialect_insert(self.db, table)
+            await self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[table.c.bucket_start, table.c.method, table.c.route, table.c.status_class],
+                    set_={
+                        column: stmt.excluded[column]
+                        for column in ("request_count", "sampled_count", "duration_ms_sum", "duration_ms_max")
+                    }
+                ),
+                [
+                    {
+                        "bucket_start": day,
+                        "method": method,
+                        "route": route,
+                        "status_class": status_class,
+                        "request_count": request_count,
+                        "sampled_count": sampled_count,
+                        "duration_ms_sum": duration_ms_sum,
+                        "duration_ms_max": duration_ms_max
+                    }
+                    for method, route, status_class, request_count, sampled_count, duration_ms_sum, duration_ms_max
+                    in requests
+                ]
+            )
+
+    async def roll_up(self, now: Optional[datetime] = None, max_hours: Optional[int] = None) -> int:
+        """
+        Fold complete hours since the high-water mark into the rollups
+
+        Args:
+            now: Current time (UTC), for tests
+            max_hours: Hours processed per call, bounding the first backfill
+
+        Returns:
+            int: Number of hours rolled up
+        """
+        now = now or datetime.utcnow()
+        max_hours = settings.ANALYTICS_ROLLUP_MAX_HOURS if max_hours is None else max_hours
+        # Only hours that ended at least the lag ago are final
+        until = floor_hour(now - timedelta(seconds=settings.ANALYTICS_ROLLUP_LAG_SECONDS))
+
+        hour = await self.high_water_mark() or await self._first_hour() or until
+        rolled = 0
+        days = set()
+        while hour < until and rolled < max_hours:
+            await self._roll_up_hour(hour)
+            days.add(floor_day(hour))
+            hour += HOUR
+            rolled += 1
+        for day in sorted(days):
+            await self._roll_up_day(day)
+
+        table = RollupState.__table__
+        stmt = dialect_insert(self.db, table)
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.name],
+                set_={"high_water_mark": stmt.excluded.high_water_mark, "updated_at": stmt.excluded.updated_at}
+            ),
+            {"name": ROLLUP_NAME, "high_water_mark": hour, "updated_at": datetime.utcnow()}
+        )
+        await self.db.commit()
+        return rolled
+
+    async def _event_counts(self, model, start: datetime, end: datetime) -> List[Tuple[str, str, int]]:
+        if start >= end:
+            return []
+        return (await self.db.execute(
+            select(model.event_type, model.event_category, func.sum(model.count)).where(
+                model.bucket_start >= start,
+                model.bucket_start < end
+            ).group_by(model.event_type, model.event_category)
+        )).all()
+
+    async def _request_totals(self, model, start: datetime, end: Optional[datetime] = None) -> Tuple[float, int]:
+        if end is not None and start >= end:
+            return 0.0, 0
+        query = select(func.sum(model.duration_ms_sum), func.sum(model.sampled_count)).where(
+            model.bucket_start >= start
+        )
+        if end is not None:
+            query = query.where(model.bucket_start < end)
+        total, sampled = (await self.db.execute(query)).one()
+        return total or 0.0, sampled or 0
+
+    async def summary(self, days: int, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Event counts, average request duration and daily active users over the last `days` days
+
+        The window starts on the hour. Rollups cover [start, rolled_until); only
+        the time after the high-water mark, normally the last hour or so, is
+        read from analytics_events and activity_logs.
+        """
+        now = now or datetime.utcnow()
+        start = floor_hour(now - timedelta(days=days))
+        high_water_mark = await self.high_water_mark()
+        rolled_until = min(max(high_water_mark or start, start), now)
+        # Whole days inside the rolled-up span come from the daily tables
+        first_day, last_day = ceil_day(start), floor_day(rolled_until)
+        if first_day >= last_day:
+            first_day = last_day = rolled_until
+
+        event_counts: Dict[str, int] = defaultdict(int)
+        category_counts: Dict[str, int] = defaultdict(int)
+        rows = (
+            await self._event_counts(EventCountDaily, first_day, last_day)
+            + await self._event_counts(EventCountHourly, start, first_day)
+            + await self._event_counts(EventCountHourly, last_day, rolled_until)
+        )
+        category_key = _event_category()
+        rows += (await self.db.execute(
+            select(AnalyticsEvent.event_type, category_key, func.count()).where(
+                AnalyticsEvent.created_at >= rolled_until
+            ).group_by(AnalyticsEvent.event_type, category_key)
+        )).all()
+        for event_type, category, count in rows:
+            event_counts[event_type] += count
+            if category:
+                category_counts[category] += count
+
+        # request_metrics is itself hourly and current to the last flush
+        total, sampled = 0.0, 0
+        for part_total, part_sampled in (
+            await self._request_totals(RequestMetricDaily, first_day, last_day),
+            await self._request_totals(RequestMetric, start, first_day),
+            await self._request_totals(RequestMetric, last_day)
+        ):
+            total += part_total
+            sampled += part_sampled
+
+        # Active users are counted over whole calendar days, the first one included
+        users_since = min(max(high_water_mark or floor_day(start), floor_day(start)), now)
+        active = dict((await self.db.execute(
+            select(DailyActiveUser.day, func.count()).where(
+                DailyActiveUser.day >= floor_day(start)
+            ).group_by(DailyActiveUser.day)
+        )).all())
+        # Users active since the mark and not yet counted for their day, in one
+        # grouped query; without a mark this spans the whole window
+        activity_day = dialect_day(self.db, ActivityLog.created_at)
+        recent = (await self.db.execute(
+            select(activity_day, func.count(distinct(ActivityLog.user_id))).where(
+                ActivityLog.created_at >= users_since,
+                ActivityLog.created_at < now,
+                ~exists().where(
+                    DailyActiveUser.day == activity_day,
+                    DailyActiveUser.user_id == ActivityLog.user_id
+                )
+            ).group_by(activity_day)
+        )).all()
+        for day, count in recent:
+            active[day] = active.get(day, 0) + count
+
+        return {
+            "event_counts": dict(event_counts),
+            "event_category_counts": dict(category_counts),
+            "avg_request_duration_ms": round(total / sampled) if sampled else None,
+            "daily_active_users": [{"date": day, "count": count} for day, count in sorted(active.items())]
+        }
+
@@ -1,16 +1,53 @@
 # app/services/analytics_service.py
 from typing import Optional, Dict, Any
 from fastapi import Request
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..models.analytics_event import AnalyticsEvent
 from ..models.user import User
+from .analytics_writer import get_analytics_writer
+from datetime import datetime
+from uuid import uuid4
 import json
 
 class AnalyticsService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def track_event(
+    @staticmethod
+    def _event_row(
+        event_type: str,
+        user: Optional[User],
+        event_category: Optional[str],
+        properties: Optional[Dict[str, Any]],
+        session_id: Optional[str],
+        request: Optional[Request],
+        duration: Optional[int]
+    ) -> Dict[str, Any]:
+        device_info = {}
+
+        if request:
+            device_info = {
+                "ip": request.client.host if request.client else None,
+                "user_agent": request.headers.get("user-agent"),
+                "referer": request.headers.get("referer"),
+                "language": request.headers.get("accept-language")
+            }
+
+        return {
+            "id": str(uuid4()),
+            # Identity survives a rollback; reading user.id would need a reload
+            "user_id": inspect(user).identity[0] if user else None,
+            "event_type": event_type,
+            "event_category": event_category,
+            "properties": properties or {},
+            "session_id": session_id,
+            "device_info": device_info,
+            "duration": duration,
+            "created_at": datetime.utcnow()
+        }
+
+    async def track_event(
         self,
         event_type: str,
         user: Optional[User] = None,
@@ -22,7 +59,11 @@ class AnalyticsService:
     ) -> AnalyticsEvent:
         """
         Track an analytics event
-        
+
+        The event is handed to the buffered writer (app/services/analytics_writer.py)
+        and inserted in a later batch; nothing touches this session. Outside the
+        API process, where the writer is not running, it is committed directly.
+
         Args:
             event_type: Type of event being tracked
             user: User associated with the event
@@ -32,28 +73,33 @@ class AnalyticsService:
             request: FastAPI request object for device info
             duration: Duration of the event in milliseconds
         """
-        device_info = {}
-        
-        if request:
-            device_info = {
-                "ip": request.client.host,
-                "user_agent": request.headers.get("user-agent"),
-                "referer": request.headers.get("referer"),
-                "language": request.headers.get("accept-language")
-            }
+        row = self._event_row(event_type, user, event_category, properties, session_id, request, duration)
+        event = AnalyticsEvent(**row)
+
+        if not get_analytics_writer().submit(row):
+            self.db.add(event)
+            await self.db.commit()
+
+        return event
 
+    def record_event(
+        self,
+        event_type: str,
+        user: Optional[User] = None,
+        event_category: Optional[str] = None,
+        properties: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+        request: Optional[Request] = None,
+        duration: Optional[int] = None
+    ) -> AnalyticsEvent:
+        """
+        Add an analytics event to the caller's transaction, without committing
+
+        For events describing a change the caller is about to commit: the event
+        is stored if and only if the change is. Arguments as for track_event.
+        """
         event = AnalyticsEvent(
-            user_id=user.id if user else None,
-            event_type=event_type,
-            event_category=event_category,
-            properties=properties or {},
-            session_id=session_id,
-            device_info=device_info,
-            duration=duration
+            **self._event_row(event_type, user, event_category, properties, session_id, request, duration)
         )
-        
         self.db.add(event)
-        self.db.commit()
-        self.db.refresh(event)
-        
-        return event
\ No newline at end of file
+        return event
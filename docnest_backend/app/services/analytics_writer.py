@@ -0,0 +1,172 @@
+# app/services/analytics_writer.py
+"""
+Buffered writer for analytics events.
+
+Requests only append a row to an in-memory buffer; a background task
+bulk-inserts the buffer in batches of ANALYTICS_BATCH_SIZE, as soon as a
+batch is full or every ANALYTICS_FLUSH_SECONDS, using its own session. Event
+writes therefore cost requests no database round trip, and a failed insert
+can never roll back the request's own transaction.
+
+When the buffer holds ANALYTICS_BUFFER_SIZE rows, new events are dropped
+and counted rather than slowing requests down. Whatever is buffered is
+written when the writer stops (application shutdown).
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models.analytics_event import AnalyticsEvent
+
+logger = logging.getLogger("docnest")
+
+
+class AnalyticsWriter:
+    """Bounded buffer of analytics_events rows with a batching background flusher"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        max_buffer: int,
+        batch_size: int,
+        flush_interval: float
+    ):
+        self.session_factory = session_factory
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Dict[str, Any]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+        self._accepted = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._batches = 0
+        self._peak_buffered = 0
+        self._total_flush = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        """Start the flusher on the running event loop"""
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._task = asyncio.create_task(self._flush_periodically(), name="analytics-writer")
+
+    async def stop(self) -> None:
+        """Stop the flusher and write out everything still buffered"""
+        if self._task is None:
+            return
+        # Not cancelled: a flush in progress finishes its insert
+        self._stopping = True
+        self._wakeup.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.flush()
+
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """
+        Buffer one analytics_events row without waiting
+
+        Returns:
+            bool: False if the writer is not running; the caller writes the
+            event itself. A full buffer drops the event and still returns True.
+        """
+        if not self.running:
+            return False
+        if len(self._buffer) >= self.max_buffer:
+            self._dropped += 1
+            return True
+
+        self._buffer.append(row)
+        self._accepted += 1
+        self._peak_buffered = max(self._peak_buffered, len(self._buffer))
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def _flush_periodically(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Analytics flush failed")
+
+    async def flush(self) -> int:
+        """Insert everything buffered so far, one batch per transaction; returns rows written"""
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                batch = self._buffer[:self.batch_size]
+                del self._buffer[:self.batch_size]
+                started = time.perf_counter()
+                try:
+                    async with self.session_factory() as db:
+                        await db.execute(insert(AnalyticsEvent.__table__), batch)
+                        await db.commit()
+                except Exception:
+                    # Analytics are best effort: a batch that cannot be written is
+                    # counted and dropped rather than retried forever
+                    self._failed += len(batch)
+                    logger.exception(f"Dropped {len(batch)} analytics events after a failed insert")
+                    continue
+                except BaseException:
+                    # Cancelled mid-insert: the batch goes back for the next flush
+                    self._buffer[:0] = batch
+                    raise
+                finally:
+                    self._total_flush += time.perf_counter() - started
+                self._batches += 1
+                self._written += len(batch)
+                written += len(batch)
+        return written
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "max_buffer": self.max_buffer,
+            "batch_size": self.batch_size,
+            "buffered": len(self._buffer),
+            "peak_buffered": self._peak_buffered,
+            "accepted": self._accepted,
+            "written": self._written,
+            "dropped": self._dropped,
+            "failed": self._failed,
+            "batches": self._batches,
+            "avg_batch_ms": round(self._total_flush / self._batches * 1000, 2) if self._batches else 0.0
+        }
+
+
+_writer: Optional[AnalyticsWriter] = None
+
+
+def get_analytics_writer() -> AnalyticsWriter:
+    """Return the process-wide writer; submit returns False until it is started"""
+    global _writer
+    if _writer is None:
+        from ..db.session import AsyncSessionLocal
+        _writer = AnalyticsWriter(
+            AsyncSessionLocal,
+            max_buffer=settings.ANALYTICS_BUFFER_SIZE,
+            batch_size=settings.ANALYTICS_BATCH_SIZE,
+            flush_interval=settings.ANALYTICS_FLUSH_SECONDS
+        )
+    return _writer
@@ -0,0 +1,118 @@
+# app/services/blob_store.py
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import UploadFile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db.upsert import dialect_insert
+from ..models.blob import Blob
+from .storage import StorageBackend, get_storage_backend, hash_upload, new_object_key
+
+
+class BlobStore:
+    """
+    Content-addressed, reference-counted file storage.
+
+    Every upload is hashed before it is stored; if a blob with the same SHA-256
+    already exists the document just takes another reference and nothing is
+    written to the object store. Objects are deleted only when the last
+    reference goes away.
+
+    Keys look like documents/blobs/ab/<sha256>/<uuid>.pdf. The random suffix
+    gives each blob row its own object, so deleting a blob whose count hit zero
+    can never remove an object that a concurrent upload of the same content
+    has just written for its new row.
+    """
+
+    def __init__(self, db: AsyncSession, storage: Optional[StorageBackend] = None):
+        self.db = db
+        self.storage = storage or get_storage_backend()
+
+    @staticmethod
+    def blob_key(sha256: str, filename: str) -> str:
+        return new_object_key(f"documents/blobs/{sha256[:2]}/{sha256}", filename)
+
+    async def acquire(self, file: UploadFile) -> Tuple[Blob, Optional[str]]:
+        """
+        Take a reference to the blob holding this upload, storing it if new.
+
+        Changes are flushed but not committed; the caller commits them together
+        with the document row.
+
+        Returns:
+            Tuple[Blob, Optional[str]]: (blob, key written by this call). The key
+            is None when the content was deduplicated; otherwise the caller
+            should delete it if its transaction fails.
+        """
+        digest = await hash_upload(file)
+
+        # Row lock: a concurrent release of the same blob either finishes first
+        # (and we store a fresh copy) or waits for our reference
+        blob = (await self.db.execute(
+            select(Blob)
+            .where(Blob.sha256 == digest.sha256)
+            .with_for_update()
+        )).scalars().first()
+        if blob:
+            blob.ref_count += 1
+            await self.db.flush()
+            return blob, None
+
+        key = self.blob_key(digest.sha256, file.filename)
+        stored = await self.storage.upload(file, key)
+
+        blobs = Blob.__table__
+        stmt = dialect_insert(self.db, blobs).values(
+            sha256=stored.sha256,
+            storage_key=key,
+            size=stored.size,
+            content_type=stored.content_type,
+            ref_count=1,
+            created_at=datetime.utcnow()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[blobs.c.sha256],
+            set_={'ref_count': blobs.c.ref_count + 1}
+        ).returning(blobs.c.storage_key)
+        winner_key = (await self.db.execute(stmt)).scalar_one()
+
+        blob = (await self.db.execute(
+            select(Blob)
+            .where(Blob.sha256 == stored.sha256)
+            .execution_options(populate_existing=True)
+        )).scalars().one()
+
+        if winner_key != key:
+            # An identical upload inserted the row first; our copy is unreferenced
+            await self.storage.delete(key)
+            return blob, None
+
+        return blob, key
+
+    async def release(self, sha256: str) -> Optional[str]:
+        """
+        Drop one reference to a blob.
+
+        Returns:
+            Optional[str]: Storage key to delete after the caller commits, if
+            this was the last reference
+        """
+        blob = (await self.db.execute(
+            select(Blob)
+            .where(Blob.sha256 == sha256)
+            .with_for_update()
+        )).scalars().first()
+        if not blob:
+            return None
+
+        blob.ref_count -= 1
+        if blob.ref_count > 0:
+            await self.db.flush()
+            return None
+
+        key = blob.storage_key
+        await self.db.delete(blob)
+        await self.db.flush()
+        return key
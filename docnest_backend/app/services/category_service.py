@@ -0,0 +1,191 @@
+# app/services/category_service.py
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.exceptions import CategoryInUse, CategoryNotFound, CategoryValidationError
+from ..db.upsert import dialect_insert
+from ..models.category import Category
+from ..models.document import Document
+from ..models.user import User
+
+DEFAULT_CATEGORIES = ["government", "medical", "educational", "other"]
+
+
+def normalize_category(name: str) -> str:
+    return name.lower().strip()
+
+
+class CategoryService:
+    """
+    Per-user categories and their document counts and sizes.
+
+    The categories table is the source of truth. User.custom_categories is
+    kept as a mirror of the custom names for the profile payload and is only
+    written from here. Nothing in this class commits: counts change in the
+    caller's transaction, together with the documents they count.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _remember(self, user: Optional[User], name: str) -> None:
+        """Add a custom name to the user's profile mirror"""
+        custom = list(user.custom_categories or []) if user else []
+        if user and name not in DEFAULT_CATEGORIES and name not in custom:
+            user.custom_categories = custom + [name]
+
+    async def adjust_count(
+        self,
+        owner_id: str,
+        name: str,
+        delta: int,
+        bytes_delta: int = 0,
+        user: Optional[User] = None
+    ) -> None:
+        """
+        Add to a category's document count and size, creating the category if needed
+
+        Args:
+            owner_id: Owner of the category
+            name: Normalized category name
+            delta: +1 when a document enters the category, -1 when it leaves
+            bytes_delta: Change of the category's total file size
+            user: Owner loaded in this session, to record a new custom name
+        """
+        table = Category.__table__
+        stmt = dialect_insert(self.db, table).values(
+            id=str(uuid4()),
+            owner_id=owner_id,
+            name=name,
+            document_count=max(delta, 0),
+            total_bytes=max(bytes_delta, 0),
+            created_at=datetime.utcnow()
+        )
+        # One statement either way, so concurrent uploads cannot lose an increment
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.owner_id, table.c.name],
+            set_={
+                "document_count": table.c.document_count + delta,
+                "total_bytes": table.c.total_bytes + bytes_delta
+            }
+        ))
+        if delta > 0:
+            self._remember(user, name)
+
+    async def list_categories(self, owner_id: str) -> List[Dict]:
+        """Default categories first, then custom ones in creation order, with totals"""
+        rows = (await self.db.execute(
+            select(Category.name, Category.document_count, Category.total_bytes)
+            .where(Category.owner_id == owner_id)
+            .order_by(Category.created_at, Category.name)
+        )).all()
+        by_name = {row.name: row for row in rows}
+
+        categories = []
+        for name in DEFAULT_CATEGORIES:
+            row = by_name.get(name)
+            categories.append({
+                "name": name,
+                "document_count": row.document_count if row else 0,
+                "total_bytes": row.total_bytes if row else 0,
+                "is_default": True
+            })
+        categories.extend(
+            {
+                "name": row.name,
+                "document_count": row.document_count,
+                "total_bytes": row.total_bytes,
+                "is_default": False
+            }
+            for row in rows
+            if row.name not in DEFAULT_CATEGORIES
+        )
+        return categories
+
+    async def add_category(self, user: User, name: str) -> bool:
+        """Create an empty custom category; False if the user already has it"""
+        stmt = dialect_insert(self.db, Category.__table__).values(
+            id=str(uuid4()),
+            owner_id=user.id,
+            name=name,
+            document_count=0,
+            total_bytes=0,
+            created_at=datetime.utcnow()
+        ).on_conflict_do_nothing(index_elements=["owner_id", "name"]).returning(Category.id)
+
+        created = (await self.db.execute(stmt)).scalar() is not None
+        if created:
+            self._remember(user, name)
+        return created
+
+    async def set_custom_categories(self, user: User, names: List[str]) -> None:
+        """
+        Replace the user's custom categories with `names`
+
+        Raises:
+            CategoryInUse: If a dropped category still has documents
+        """
+        names = [name for name in dict.fromkeys(names) if name not in DEFAULT_CATEGORIES]
+        existing = dict((await self.db.execute(
+            select(Category.name, Category.document_count).where(
+                Category.owner_id == user.id,
+                Category.name.not_in(DEFAULT_CATEGORIES)
+            )
+        )).all())
+
+        dropped = [name for name in existing if name not in names]
+        if any(existing[name] for name in dropped):
+            raise CategoryInUse()
+        if dropped:
+            await self.db.execute(
+                delete(Category).where(Category.owner_id == user.id, Category.name.in_(dropped))
+            )
+
+        for name in names:
+            if name not in existing:
+                await self.add_category(user, name)
+        user.custom_categories = names
+
+    async def rename_category(self, user: User, old_name: str, new_name: str) -> int:
+        """
+        Rename a custom category and move its documents with two set-based UPDATEs
+
+        Returns:
+            int: Number of documents moved
+
+        Raises:
+            CategoryValidationError: For default categories or a taken new name
+            CategoryNotFound: If the user has no such category
+        """
+        if old_name in DEFAULT_CATEGORIES:
+            raise CategoryValidationError("Cannot rename default category")
+        if new_name in DEFAULT_CATEGORIES or await self.db.scalar(
+            select(Category.id).where(Category.owner_id == user.id, Category.name == new_name)
+        ):
+            raise CategoryValidationError("Category name already exists")
+
+        renamed = await self.db.execute(
+            update(Category)
+            .where(Category.owner_id == user.id, Category.name == old_name)
+            .values(name=new_name)
+            .execution_options(synchronize_session=False)
+        )
+        if not renamed.rowcount:
+            raise CategoryNotFound()
+
+        moved = await self.db.execute(
+            update(Document)
+            .where(Document.owner_id == user.id, Document.category == old_name)
+            .values(category=new_name)
+            .execution_options(synchronize_session=False)
+        )
+
+        user.custom_categories = [
+            new_name if name == old_name else name
+            for name in (user.custom_categories or [])
+        ]
+        return moved.rowcount
@@ -1,46 +1,52 @@
 # app/services/document_service.py
 import os
 import time
+import mimetypes
 import magic
-import boto3
-import uuid
-from botocore.exceptions import ClientError
-from fastapi import UploadFile, HTTPException, status, Request, Form
-from sqlalchemy.orm import Session
-from typing import List, Optional, Tuple
+from fastapi import UploadFile, HTTPException, status, Request
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 
 from ..models.document import Document
 from ..models.user import User
-from ..schemas.document import DocumentCreate, DocumentUpdate
+from ..schemas.document import DocumentCreate, DocumentUpdate, UploadUrlRequest, UploadFinalize
 from ..core.config import settings
 from ..services.activity_logger import ActivityLogger
 from ..services.analytics_service import AnalyticsService
+from ..services.storage import get_storage_backend, new_object_key, storage_key
+from ..services.storage.url_cache import get_presigned_url_cache
+from ..services.blob_store import BlobStore
+from ..services.category_service import CategoryService, normalize_category
+from ..services.usage_service import UsageService
+from ..services.extraction_pipeline import get_extraction_pipeline, queue_extraction
+from ..utils.pagination import paginate
 
 class DocumentService:
     ALLOWED_EXTENSIONS = {'.pdf', '.doc', '.docx', '.jpg', '.jpeg', '.png'}
+    # Content types of the allowed extensions, checked against the sniffed type of direct uploads
+    ALLOWED_CONTENT_TYPES = {mimetypes.guess_type(f"file{ext}")[0] for ext in ALLOWED_EXTENSIONS}
     
-    def __init__(self, db: Session, user: Optional[User] = None, request: Optional[Request] = None):
+    def __init__(self, db: AsyncSession, user: Optional[User] = None, request: Optional[Request] = None):
         # Initialize core services
         self.db = db
         self.user = user
         self.request = request
         
-        # Initialize S3 client
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
-        )
-        self.bucket_name = settings.AWS_BUCKET_NAME
+        # Configured object store (S3, local disk or memory) and deduplicating blob layer
+        self.storage = get_storage_backend()
+        self.blob_store = BlobStore(db, self.storage)
+        self.categories = CategoryService(db)
+        self.usage = UsageService(db)
         
         # Initialize logging and analytics
         self.activity_logger = ActivityLogger(db)
         self.analytics_service = AnalyticsService(db)
 
-    def _validate_file(self, file: UploadFile) -> None:
-        """Validate file size and type"""
+    def _validate_file(self, file: UploadFile) -> int:
+        """Validate file size and type, returning the size in bytes"""
         if not file.filename:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -75,106 +81,65 @@ class DocumentService:
                 detail=str(e)
             )
 
-    async def _upload_to_s3(
-        self,
-        file: UploadFile,
-        folder: str = "documents"
-    ) -> Tuple[str, int, str]:
-        """Upload file to S3 with comprehensive error handling and monitoring"""
-        upload_start = time.time()
-        try:
-            # Generate unique filename
-            ext = os.path.splitext(file.filename)[1].lower()
-            s3_key = f"{folder.strip('/')}/{uuid.uuid4()}{ext}"
-            
-            if settings.DEBUG_S3_OPERATIONS:
-                print(f"Generated S3 key for upload: {s3_key}")
-
-            content = await file.read()
-            file_size = len(content)
-            file_type = magic.from_buffer(content, mime=True)
+        return size
 
-            if settings.DEBUG_S3_OPERATIONS:
-                print(f"Uploading file: size={file_size}, type={file_type}")
-
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=content,
-                ContentType=file_type,
-                Metadata={
-                    'original_filename': file.filename,
-                    'upload_timestamp': datetime.utcnow().isoformat()
-                }
-            )
-
-
-
-            await file.seek(0)
-            return s3_key, file_size, file_type
-
-        except Exception as e:
-            
-            if settings.DEBUG_S3_OPERATIONS:
-                print(f"Error during S3 upload: {str(e)}")
-            raise
+    async def _account(
+        self,
+        owner_id: str,
+        category: str,
+        documents: int,
+        size: int,
+        user: Optional[User] = None
+    ) -> None:
+        """Apply a document entering (+1, +size) or leaving (-1, -size) to the category and user totals"""
+        await self.categories.adjust_count(owner_id, category, documents, bytes_delta=size, user=user)
+        await self.usage.adjust(owner_id, size, documents)
 
-    async def _delete_from_s3(self, file_path: str) -> None:
-        """Delete file from S3 with improved error handling and key parsing"""
-        if not file_path:
-            if settings.DEBUG_S3_OPERATIONS:
-                print("No file path provided for deletion")
+    def _record(
+        self,
+        action: str,
+        event_type: str,
+        document_id: str,
+        details: Dict[str, Any],
+        properties: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Add a mutation's activity log entry and analytics event to the transaction committing it"""
+        if not self.user:
             return
+        self.activity_logger.log_activity(
+            user=self.user,
+            action=action,
+            resource_type="document",
+            resource_id=document_id,
+            details=details,
+            request=self.request
+        )
+        self.analytics_service.record_event(
+            event_type=event_type,
+            user=self.user,
+            event_category="document",
+            properties={"document_id": document_id, **(properties or {})},
+            request=self.request
+        )
 
+    async def _release_file(self, blob_sha256: Optional[str], file_path: Optional[str]) -> Optional[str]:
+        """Drop a document's claim on its file, returning the key to delete after commit"""
+        if blob_sha256:
+            return await self.blob_store.release(blob_sha256)
+        # Files stored before deduplication belong to exactly one document
+        return file_path
+
+    async def _delete_from_storage(self, file_path: str) -> None:
+        """Delete file from the storage backend, missing objects are ignored"""
+        key = storage_key(file_path)
+        get_presigned_url_cache().invalidate(key)
         try:
-            if settings.DEBUG_S3_OPERATIONS:
-                print(f"Original file path: {file_path}")
-
-            # Clean up the key - remove any leading/trailing slashes and spaces
-            s3_key = file_path.strip('/')
-            
-            if settings.DEBUG_S3_OPERATIONS:
-                print(f"Attempting to delete object with key: {s3_key}")
-                # List objects to verify key exists
-                response = self.s3_client.list_objects_v2(
-                    Bucket=self.bucket_name,
-                    Prefix=s3_key
-                )
-                if 'Contents' in response:
-                    print(f"Object found in bucket with key: {s3_key}")
-                else:
-                    print(f"No object found in bucket with key: {s3_key}")
-
-            # Delete the object
-            response = self.s3_client.delete_object(
-                Bucket=self.bucket_name,
-                Key=s3_key
-            )
-            
-            if settings.DEBUG_S3_OPERATIONS:
-                print(f"Delete response: {response}")
-                print(f"Successfully deleted from S3: {s3_key}")
-
-        except ClientError as e:
-            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-            error_message = e.response.get('Error', {}).get('Message', str(e))
-            
-            if settings.DEBUG_S3_OPERATIONS:
-                print(f"S3 delete error: Code={error_code}, Message={error_message}")
-            
-            if error_code == 'NoSuchKey':
-                # Log but don't raise if object doesn't exist
-                if settings.DEBUG_S3_OPERATIONS:
-                    print(f"Object already deleted or doesn't exist: {s3_key}")
-                return
-            
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"S3 delete error: {error_message}"
-            )
+            await self.storage.delete(key)
+        except HTTPException:
+            raise
         except Exception as e:
             if settings.DEBUG_S3_OPERATIONS:
-                print(f"Unexpected error during S3 deletion: {str(e)}")
+                print(f"Unexpected error during storage deletion: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error deleting file: {str(e)}"
@@ -188,14 +153,16 @@ class DocumentService:
     ) -> Document:
         """Create a new document with comprehensive tracking and error handling"""
         operation_start = time.time()
+        uploaded_key = None
+        committed = False
         
         try:
-            # Validate and upload file
-            self._validate_file(file)
-            file_url, file_size, file_type = await self._upload_to_s3(
-                file,
-                folder=f"documents/{owner_id}"
-            )
+            # Validate and store file (skipped if identical content is already stored)
+            size = self._validate_file(file)
+            # Quota check before the upload is hashed or stored
+            await self.usage.check_quota(owner_id, size)
+            blob, uploaded_key = await self.blob_store.acquire(file)
+            file_url, file_size, file_type = blob.storage_key, blob.size, blob.content_type
             
             # Create document
             db_document = Document(
@@ -205,51 +172,50 @@ class DocumentService:
                 file_path=file_url,
                 file_size=file_size,
                 file_type=file_type,
+                blob_sha256=blob.sha256,
                 owner_id=owner_id
             )
             
             self.db.add(db_document)
-            self.db.commit()
-            self.db.refresh(db_document)
-
-            # Log activity with the correct user
-            if self.user:  # Make sure we have a user
-                await self.activity_logger.log_activity(
-                    user=self.user,  # Pass the actual User object
-                    action="document.create",
-                    resource_type="document",
-                    resource_id=db_document.id,
-                    details={
-                        "name": db_document.name,
-                        "category": db_document.category,
-                        "size": file_size,
-                        "file_type": file_type
-                    },
-                    request=self.request
-                )
+            await self._account(owner_id, db_document.category, 1, file_size, user=self.user)
+            # Assigns the id the log entries and extraction row refer to
+            await self.db.flush()
+            extract = await queue_extraction(self.db, db_document)
+            self._record(
+                "document.create",
+                "document_created",
+                db_document.id,
+                details={
+                    "name": db_document.name,
+                    "category": db_document.category,
+                    "size": file_size,
+                    "file_type": file_type,
+                    "sha256": blob.sha256,
+                    "deduplicated": uploaded_key is None
+                },
+                properties={"category": db_document.category}
+            )
+            # One commit for the document, counters, extraction row and logs;
+            # all defaults are client-side, so nothing needs a refresh
+            await self.db.commit()
+            committed = True
 
-                # Track analytics with the correct user
-                self.analytics_service.track_event(
-                    event_type="document_created",
-                    user=self.user,  # Pass the actual User object
-                    event_category="document",
-                    properties={
-                        "document_id": db_document.id,
-                        "category": db_document.category
-                    },
-                    request=self.request
-                )
+            # Text extraction runs in the background, after the response
+            if extract:
+                get_extraction_pipeline().enqueue(db_document.id)
 
             return db_document
 
         except Exception as e:
-            # Clean up uploaded file if exists
-            if 'file_url' in locals():
-                await self._delete_from_s3(file_url)
+            # Clean up the object this call stored, unless the document made it in
+            if not committed:
+                await self.db.rollback()
+                if uploaded_key:
+                    await self._delete_from_storage(uploaded_key)
 
             # Track failure
             if self.user:
-                self.analytics_service.track_event(
+                await self.analytics_service.track_event(
                     event_type="document_creation_failed",
                     user=self.user,
                     event_category="error",
@@ -264,19 +230,166 @@ class DocumentService:
             raise
 
 
-    def get_document(self, db: Session, document_id: str, owner_id: str) -> Document:
+    async def _get_owned_document(self, document_id: str, owner_id: str) -> Document:
+        """Load a document for modification, without recording a view"""
+        document = (await self.db.execute(
+            select(Document).where(
+                Document.id == document_id,
+                Document.owner_id == owner_id
+            )
+        )).scalars().first()
+
+        if not document:
+            raise HTTPException(status_code=404, detail="Document not found")
+        return document
+
+    @staticmethod
+    def _direct_upload_prefix(owner_id: str) -> str:
+        return f"documents/{owner_id}/uploads/"
+
+    async def create_upload_url(self, owner_id: str, upload_in: UploadUrlRequest) -> dict:
+        """Issue a presigned upload so the client sends the file straight to storage"""
+        ext = os.path.splitext(upload_in.filename)[1].lower()
+        if ext not in self.ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File type not allowed. Allowed types: {', '.join(self.ALLOWED_EXTENSIONS)}"
+            )
+
+        if upload_in.content_type != mimetypes.guess_type(upload_in.filename)[0]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Content type does not match the file extension"
+            )
+
+        if upload_in.size is not None and upload_in.size > settings.MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File too large. Maximum size is {settings.MAX_FILE_SIZE/1024/1024}MB"
+            )
+
+        if upload_in.size is not None:
+            await self.usage.check_quota(owner_id, upload_in.size)
+
+        key = new_object_key(self._direct_upload_prefix(owner_id), upload_in.filename)
+        upload = await self.storage.create_presigned_upload(
+            key,
+            content_type=upload_in.content_type,
+            max_size=settings.MAX_FILE_SIZE,
+            expires_in=settings.PRESIGNED_UPLOAD_EXPIRES
+        )
+
+        return {
+            "key": key,
+            "max_size": settings.MAX_FILE_SIZE,
+            "expires_in": settings.PRESIGNED_UPLOAD_EXPIRES,
+            **upload
+        }
+
+    async def finalize_upload(self, owner_id: str, finalize_in: UploadFinalize) -> Document:
+        """Verify a direct upload with HEAD and create its document row"""
+        key = finalize_in.key
+        if not key.startswith(self._direct_upload_prefix(owner_id)):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Upload does not belong to this user"
+            )
+
+        if await self.db.scalar(select(Document.id).where(Document.file_path == key)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Upload already finalized"
+            )
+
+        info = await self.storage.head(key)
+        if not info:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Upload not found, it may have expired"
+            )
+
+        if info.size > settings.MAX_FILE_SIZE:
+            await self._delete_from_storage(key)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File too large. Maximum size is {settings.MAX_FILE_SIZE/1024/1024}MB"
+            )
+
+        # Trust the bytes, not the declared type: sniff the object's header
+        head = await self.storage.open(key, byte_range=f"bytes=0-{settings.MIME_SNIFF_BYTES - 1}")
+        header = b"".join([chunk async for chunk in head.chunks])
+        file_type = magic.from_buffer(header, mime=True)
+        if file_type not in self.ALLOWED_CONTENT_TYPES:
+            await self._delete_from_storage(key)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File type not allowed. Allowed types: {', '.join(self.ALLOWED_EXTENSIONS)}"
+            )
+
+        try:
+            await self.usage.check_quota(owner_id, info.size)
+        except HTTPException:
+            await self._delete_from_storage(key)
+            raise
+
+        db_document = Document(
+            name=finalize_in.name,
+            description=finalize_in.description,
+            category=finalize_in.category,
+            file_path=key,
+            file_size=info.size,
+            file_type=file_type,
+            owner_id=owner_id
+        )
+        self.db.add(db_document)
+        try:
+            await self._account(owner_id, db_document.category, 1, info.size, user=self.user)
+            await self.db.flush()
+        except IntegrityError:
+            # A concurrent finalize of the same key inserted first: the unique
+            # index on direct-upload keys rejects this row. The object is that
+            # document's file now, so it is kept.
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Upload already finalized"
+            )
+        extract = await queue_extraction(self.db, db_document)
+        self._record(
+            "document.create",
+            "document_created",
+            db_document.id,
+            details={
+                "name": db_document.name,
+                "category": db_document.category,
+                "size": info.size,
+                "file_type": file_type,
+                "direct_upload": True
+            },
+            properties={"category": db_document.category}
+        )
+        await self.db.commit()
+
+        if extract:
+            get_extraction_pipeline().enqueue(db_document.id)
+
+        return db_document
+
+    async def get_document(self, db: AsyncSession, document_id: str, owner_id: str) -> Document:
         """Get a specific document"""
-        document = db.query(Document).filter(
-            Document.id == document_id,
-            Document.owner_id == owner_id
-        ).first()
+        document = (await db.execute(
+            select(Document).where(
+                Document.id == document_id,
+                Document.owner_id == owner_id
+            )
+        )).scalars().first()
         
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
         # Single analytics entry for document view
         if self.user and self.request:
-            self.analytics_service.track_event(
+            await self.analytics_service.track_event(
                 event_type="document_viewed",
                 user=self.user,
                 event_category="document",
@@ -285,19 +398,41 @@ class DocumentService:
             )
         return document
 
-    def get_user_documents(
+    async def get_user_documents(
         self,
-        db: Session,
+        db: AsyncSession,
         owner_id: str,
-        category: Optional[str] = Form(None)
-    ) -> List[Document]:
-        """Get all documents for a user, optionally filtered by category"""
-        query = db.query(Document).filter(Document.owner_id == owner_id)
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        Get one page of a user's documents, newest first
+
+        Args:
+            db: Database session
+            owner_id: Owner of the documents
+            category: Only documents in this category
+            cursor: Cursor returned with the previous page
+            limit: Page size
+            fields: Select only these columns (plus the cursor's id and
+                created_at) as plain Rows instead of loading Documents
+
+        Returns:
+            Tuple[List[Any], Optional[str]]: The documents and the next page's cursor
+        """
+        if fields:
+            columns = dict.fromkeys(["id", "created_at", *fields])
+            query = select(*(getattr(Document, name) for name in columns))
+        else:
+            query = select(Document)
+        query = query.where(Document.owner_id == owner_id)
         
         if category:
-            query = query.filter(Document.category == category)
+            query = query.where(Document.category == category)
             
-        return query.order_by(Document.created_at.desc()).all()
+        return await paginate(db, query, Document, cursor, limit)
 
     async def update_document(
         self,
@@ -307,26 +442,32 @@ class DocumentService:
         file: Optional[UploadFile] = None
     ) -> Document:
         """Update document with improved error handling and tracking"""
-        operation_start = time.time()
-        document = self.get_document(document_id, owner_id)
-        old_file_url = None
+        document = await self._get_owned_document(document_id, owner_id)
+        uploaded_key = None
+        committed = False
         update_details = {}
+        old_category, old_size = document.category, document.file_size or 0
 
         try:
+            stale_key = None
             if file:
-                self._validate_file(file)
-                old_file_url = document.file_path
-                file_url, file_size, file_type = await self._upload_to_s3(
-                    file,
-                    folder=f"documents/{owner_id}"
-                )
+                size = self._validate_file(file)
+                await self.usage.check_quota(owner_id, size - old_size)
+                old_blob_sha256, old_file_url = document.blob_sha256, document.file_path
+                blob, uploaded_key = await self.blob_store.acquire(file)
                 
-                document.file_path = file_url
-                document.file_size = file_size
-                document.file_type = file_type
+                document.file_path = blob.storage_key
+                document.file_size = blob.size
+                document.file_type = blob.content_type
+                document.blob_sha256 = blob.sha256
+                # Searchable again once the new file's text is extracted
+                document.content_text = None
                 document.version += 1
                 update_details["file_updated"] = True
 
+            if document_in.get("category") is not None:
+                document_in["category"] = normalize_category(document_in["category"])
+
             # Update other fields
             for field, value in document_in.items():
                 if value is not None and hasattr(document, field):
@@ -335,35 +476,44 @@ class DocumentService:
                     update_details[f"old_{field}"] = old_value
                     update_details[f"new_{field}"] = value
 
-            self.db.commit()
-            self.db.refresh(document)
+            # Move the document's count and size if its category or file changed
+            new_size = document.file_size or 0
+            if (document.category, new_size) != (old_category, old_size):
+                await self._account(owner_id, old_category, -1, -old_size)
+                await self._account(owner_id, document.category, 1, new_size, user=self.user)
 
+            extract = False
+            if file:
+                # Release the old file only once the document points elsewhere
+                await self.db.flush()
+                stale_key = await self._release_file(old_blob_sha256, old_file_url)
+                extract = await queue_extraction(self.db, document)
 
-            # Delete old file if it was replaced
-            if old_file_url:
-                await self._delete_from_s3(old_file_url)
+            self._record("document.update", "document_updated", document_id, details=update_details)
+            await self.db.commit()
+            committed = True
 
-            # Single analytics entry for update
-            if self.user and self.request:
-                self.analytics_service.track_event(
-                    event_type="document_updated",
-                    user=self.user,
-                    event_category="document",
-                    properties={"document_id": document_id},
-                    request=self.request
-                )
+            if extract:
+                get_extraction_pipeline().enqueue(document.id)
+
+            if file and old_file_url:
+                # Links to the replaced file must not be handed out again
+                get_presigned_url_cache().invalidate(storage_key(old_file_url))
 
-            if old_file_url:
-                await self._delete_from_s3(old_file_url)
+            # Delete old file if nothing references it any more
+            if stale_key:
+                await self._delete_from_storage(stale_key)
 
             return document
 
         except Exception as e:
-            if file and 'file_url' in locals():
-                await self._delete_from_s3(file_url)
+            if not committed:
+                await self.db.rollback()
+                if uploaded_key:
+                    await self._delete_from_storage(uploaded_key)
             
             if self.user:
-                self.analytics_service.track_event(
+                await self.analytics_service.track_event(
                     event_type="document_update_failed",
                     user=self.user,
                     event_category="error",
@@ -378,51 +528,53 @@ class DocumentService:
 
     async def delete_document(
         self,
-        db: Session,
+        db: AsyncSession,
         document_id: str,
         owner_id: str
     ) -> None:
         """Delete a document with improved error handling"""
+        document = await self._get_owned_document(document_id, owner_id)
+
         try:
-            document = self.get_document(db, document_id, owner_id)
-            
             if settings.DEBUG_S3_OPERATIONS:
                 print(f"Starting delete for document ID: {document_id}")
                 print(f"Document file path: {document.file_path}")
 
-            # Store file path before deleting from database
-            file_path = document.file_path
+            # Store file info before deleting from database
+            blob_sha256, file_path = document.blob_sha256, document.file_path
 
             if settings.DEBUG_S3_OPERATIONS:
                 print("Deleting document from database...")
 
-            # Delete from database first
-            db.delete(document)
-            db.commit()
-
-            # Single analytics entry for deletion
-            if self.user and self.request:
-                self.analytics_service.track_event(
-                    event_type="document_deleted",
-                    user=self.user,
-                    event_category="document",
-                    properties={"document_id": document_id},
-                    request=self.request
-                )
+            # Delete from database first; the file goes only with its last reference
+            await db.delete(document)
+            await self._account(owner_id, document.category, -1, -(document.file_size or 0))
+            await db.flush()
+            file_path = await self._release_file(blob_sha256, file_path)
+            self._record(
+                "document.delete",
+                "document_deleted",
+                document_id,
+                details={"name": document.name, "category": document.category}
+            )
+            await db.commit()
 
             if settings.DEBUG_S3_OPERATIONS:
                 print("Successfully deleted from database")
 
-            # Then try to delete from S3
+            # Then try to delete from storage
             if file_path:
                 if settings.DEBUG_S3_OPERATIONS:
-                    print(f"Now deleting from S3: {file_path}")
-                await self._delete_from_s3(file_path)
+                    print(f"Now deleting from storage: {file_path}")
+                await self._delete_from_storage(file_path)
 
+        except HTTPException:
+            await db.rollback()
+            raise
         except Exception as e:
             if settings.DEBUG_S3_OPERATIONS:
                 print(f"Error during document deletion: {str(e)}")
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Error deleting document: {str(e)}"
@@ -442,21 +594,11 @@ class DocumentService:
                     detail="No file URL provided"
                 )
 
-            # Extract key from URL
-            key = file_url.split(f"{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/")[1]
-            
-            # Generate presigned URL
-            url = self.s3_client.generate_presigned_url(
-                'get_object',
-                Params={
-                    'Bucket': self.bucket_name,
-                    'Key': key
-                },
-                ExpiresIn=expires_in
-            )
+            # Reuse a recently signed URL when it still has enough validity left
+            url = await get_presigned_url_cache().get_url(self.storage, storage_key(file_url), expires_in=expires_in)
 
             if self.user:
-                self.analytics_service.track_event(
+                await self.analytics_service.track_event(
                     event_type="download_url_generated",
                     user=self.user,
                     event_category="document",
@@ -471,7 +613,7 @@ class DocumentService:
             
         except Exception as e:
             if self.user:
-                self.analytics_service.track_event(
+                await self.analytics_service.track_event(
                     event_type="download_url_generation_failed",
                     user=self.user,
                     event_category="error",
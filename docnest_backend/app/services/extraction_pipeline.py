@@ -0,0 +1,317 @@
+# app/services/extraction_pipeline.py
+"""
+Background pipeline filling documents.content_text for search.
+
+Uploads only record a pending row in text_extractions (in their own
+transaction) and hand the document id to the in-process queue after commit,
+so upload latency does not depend on extraction. Workers stream the object
+from storage and parse it in a process pool, keeping PDF parsing off the
+event loop and outside the GIL. Failed attempts are retried with backoff; a
+periodic sweep picks up rows the queue never saw (full queue, restarts,
+other API processes).
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..db.upsert import dialect_insert
+from ..models.document import Document
+from ..models.text_extraction import (
+    EXTRACTION_DONE,
+    EXTRACTION_FAILED,
+    EXTRACTION_PENDING,
+    EXTRACTION_PROCESSING,
+    EXTRACTION_UNSUPPORTED,
+    TextExtraction
+)
+from .storage import StorageBackend, get_storage_backend
+from .storage.compression import GZIP, gunzip_chunks
+from .text_extraction import ExtractionError, extract_text, is_extractable
+
+logger = logging.getLogger("docnest")
+
+# Rows left 'processing' this long belong to a worker that died
+STALE_PROCESSING = timedelta(minutes=15)
+SWEEP_BATCH_SIZE = 500
+
+
+async def queue_extraction(db: AsyncSession, document: Document) -> bool:
+    """
+    Mark a (new or replaced) file for extraction in the caller's transaction
+
+    The document must be flushed. Call ExtractionPipeline.enqueue after the
+    commit; until then the row is only visible to this transaction.
+
+    Returns:
+        bool: False if the file type has no text to extract
+    """
+    now = datetime.utcnow()
+    status = EXTRACTION_PENDING if is_extractable(document.file_type) else EXTRACTION_UNSUPPORTED
+    values = {
+        "source_key": document.file_path,
+        "status": status,
+        "attempts": 0,
+        "last_error": None,
+        "extracted_chars": None,
+        "next_attempt_at": now,
+        "updated_at": now
+    }
+    table = TextExtraction.__table__
+    await db.execute(
+        dialect_insert(db, table)
+        .values(document_id=document.id, **values)
+        .on_conflict_do_update(index_elements=[table.c.document_id], set_=values)
+    )
+    return status == EXTRACTION_PENDING
+
+
+class ExtractionPipeline:
+    """
+    Bounded queue of document ids drained by `max_workers` extraction tasks.
+
+    Each task reads one file from storage and runs the parser on the process
+    pool, so at most `max_workers` files are held in memory at a time.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        max_workers: int,
+        storage: Optional[StorageBackend] = None,
+        executor: Optional[Executor] = None
+    ):
+        self.session_factory = session_factory
+        self.max_workers = max_workers
+        self._storage = storage
+        self._executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._done = 0
+        self._retried = 0
+        self._failed = 0
+        self._dropped = 0
+
+    @property
+    def storage(self) -> StorageBackend:
+        return self._storage or get_storage_backend()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start the workers and the sweep on the running event loop"""
+        if self._executor is None:
+            # spawn, not fork: the API process runs threads (storage pool, DB pool)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        self._queue = asyncio.Queue(maxsize=settings.EXTRACTION_QUEUE_SIZE)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"extraction-{i}")
+            for i in range(self.max_workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._sweep_periodically(), name="extraction-sweep"))
+
+    async def stop(self) -> None:
+        """Cancel the workers; unfinished rows stay pending for the next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._queued.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def enqueue(self, document_id: str) -> None:
+        """Hand a committed pending row to the workers without waiting"""
+        if not self.running or document_id in self._queued:
+            return
+        try:
+            self._queue.put_nowait(document_id)
+            self._queued.add(document_id)
+        except asyncio.QueueFull:
+            # Still pending in the database, the sweep will find it
+            self._dropped += 1
+
+    async def _worker(self) -> None:
+        while True:
+            document_id = await self._queue.get()
+            self._queued.discard(document_id)
+            try:
+                await self.process(document_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"Text extraction of document {document_id} failed")
+            finally:
+                self._queue.task_done()
+
+    async def _sweep_periodically(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Text extraction sweep failed")
+            await asyncio.sleep(settings.EXTRACTION_SWEEP_SECONDS)
+
+    async def sweep(self) -> int:
+        """Enqueue pending rows that are due and rows abandoned mid-extraction"""
+        now = datetime.utcnow()
+        async with self.session_factory() as db:
+            due = (await db.execute(
+                select(TextExtraction.document_id)
+                .where(
+                    ((TextExtraction.status == EXTRACTION_PENDING) & (TextExtraction.next_attempt_at <= now)) |
+                    ((TextExtraction.status == EXTRACTION_PROCESSING) & (TextExtraction.updated_at < now - STALE_PROCESSING))
+                )
+                .order_by(TextExtraction.next_attempt_at)
+                .limit(SWEEP_BATCH_SIZE)
+            )).scalars().all()
+        for document_id in due:
+            self.enqueue(document_id)
+        return len(due)
+
+    async def _read(self, key: str) -> bytes:
+        """Whole (decoded) object, refusing anything larger than an upload may be"""
+        stream = await self.storage.open(key)
+        chunks = stream.chunks
+        if stream.content_encoding == GZIP:
+            chunks = gunzip_chunks(chunks)
+
+        data, size = [], 0
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > settings.MAX_FILE_SIZE:
+                raise ExtractionError("File is larger than MAX_FILE_SIZE")
+            data.append(chunk)
+        return b"".join(data)
+
+    async def process(self, document_id: str) -> Optional[str]:
+        """
+        Extract one document's text and record the outcome
+
+        Writes are conditional on the source key, so a file replaced while it
+        was being read never receives the old file's text.
+
+        Returns:
+            Optional[str]: New status, None if there was nothing to do
+        """
+        async with self.session_factory() as db:
+            row = (await db.execute(
+                select(TextExtraction, Document.file_type)
+                .join(Document, Document.id == TextExtraction.document_id)
+                .where(TextExtraction.document_id == document_id)
+            )).first()
+            if not row or row[0].status not in (EXTRACTION_PENDING, EXTRACTION_PROCESSING):
+                return None
+            extraction, file_type = row
+            key, attempts = extraction.source_key, extraction.attempts + 1
+
+            current = (
+                (TextExtraction.document_id == document_id) &
+                (TextExtraction.source_key == key)
+            )
+            # Claimed only if no other worker or process has taken it since it was
+            # read: still pending (or abandoned) with the same attempt count
+            now = datetime.utcnow()
+            claimed = await db.execute(
+                update(TextExtraction).where(
+                    current,
+                    TextExtraction.attempts == extraction.attempts,
+                    (TextExtraction.status == EXTRACTION_PENDING) | (
+                        (TextExtraction.status == EXTRACTION_PROCESSING) &
+                        (TextExtraction.updated_at < now - STALE_PROCESSING)
+                    )
+                )
+                .values(status=EXTRACTION_PROCESSING, attempts=attempts, updated_at=now)
+            )
+            await db.commit()
+            if claimed.rowcount != 1:
+                return None
+
+            error: Optional[str] = None
+            try:
+                data = await self._read(key)
+                loop = asyncio.get_running_loop()
+                text = await loop.run_in_executor(
+                    self._executor, extract_text, data, file_type, settings.EXTRACTION_MAX_CHARS
+                )
+            except ExtractionError as e:
+                # The file itself is the problem, retrying cannot help
+                status, error = EXTRACTION_FAILED, str(e)
+                next_attempt_at = None
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                if attempts >= settings.EXTRACTION_MAX_ATTEMPTS:
+                    status, next_attempt_at = EXTRACTION_FAILED, None
+                else:
+                    status = EXTRACTION_PENDING
+                    next_attempt_at = datetime.utcnow() + timedelta(
+                        seconds=settings.EXTRACTION_RETRY_SECONDS * 2 ** (attempts - 1)
+                    )
+            else:
+                status, next_attempt_at = EXTRACTION_DONE, None
+                await db.execute(
+                    update(Document)
+                    .where(Document.id == document_id, Document.file_path == key)
+                    # Keep modified_at: extraction is not a user edit
+                    .values(content_text=text, modified_at=Document.modified_at)
+                    .execution_options(synchronize_session=False)
+                )
+
+            values: Dict[str, Any] = {
+                "status": status,
+                "last_error": error,
+                "updated_at": datetime.utcnow()
+            }
+            if status == EXTRACTION_DONE:
+                values["extracted_chars"] = len(text)
+            if next_attempt_at:
+                values["next_attempt_at"] = next_attempt_at
+            await db.execute(update(TextExtraction).where(current).values(**values))
+            await db.commit()
+
+        if status == EXTRACTION_DONE:
+            self._done += 1
+        elif status == EXTRACTION_FAILED:
+            self._failed += 1
+            logger.warning(f"Text extraction of document {document_id} gave up: {error}")
+        else:
+            self._retried += 1
+        return status
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "max_workers": self.max_workers,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "done": self._done,
+            "retried": self._retried,
+            "failed": self._failed,
+            "dropped": self._dropped
+        }
+
+
+_pipeline: Optional[ExtractionPipeline] = None
+
+
+def get_extraction_pipeline() -> ExtractionPipeline:
+    """Return the process-wide pipeline; enqueue is a no-op until it is started"""
+    global _pipeline
+    if _pipeline is None:
+        from ..db.session import AsyncSessionLocal
+        _pipeline = ExtractionPipeline(AsyncSessionLocal, max_workers=settings.EXTRACTION_WORKERS)
+    return _pipeline
@@ -3,7 +3,8 @@ from google.auth.transport import requests
 from fastapi import HTTPException, status
 from datetime import datetime
 from typing import Dict, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.models.user import User
 
@@ -33,16 +34,18 @@ class GoogleAuthService:
             )
 
     @staticmethod
-    async def get_or_create_user(db: Session, user_data: Dict) -> User:
+    async def get_or_create_user(db: AsyncSession, user_data: Dict) -> User:
         try:
             google_user_id = user_data['sub']
             email = user_data['email']
 
             # Check if user exists
-            user = db.query(User).filter(
-                (User.google_user_id == google_user_id) |
-                (User.email == email)
-            ).first()
+            user = (await db.execute(
+                select(User).where(
+                    (User.google_user_id == google_user_id) |
+                    (User.email == email)
+                )
+            )).scalars().first()
 
             if user:
                 # Update existing user's last login
@@ -50,7 +53,7 @@ class GoogleAuthService:
                 if not user.google_user_id:
                     user.google_user_id = google_user_id
                     user.is_google_user = True
-                db.commit()
+                await db.commit()
                 return user
 
             # Create new user
@@ -66,8 +69,8 @@ class GoogleAuthService:
             )
 
             db.add(new_user)
-            db.commit()
-            db.refresh(new_user)
+            await db.commit()
+            await db.refresh(new_user)
             return new_user
         except Exception as e:
             raise HTTPException(
@@ -0,0 +1,159 @@
+# app/services/search_service.py
+import re
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import Float, String, func, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.document import Document
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# Longer queries are cut; every term must match (as a prefix)
+MAX_SEARCH_TERMS = 8
+
+# Postgres text search configuration used by documents.search_vector; "simple"
+# lowercases without stemming, which suits names like "Aadhaar card 2023"
+TS_CONFIG = "simple"
+TS_HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, "
+    "MaxWords=24, MinWords=8, HighlightAll=false"
+)
+
+
+def search_terms(q: str) -> List[str]:
+    """Words of a search box query; punctuation and query syntax are dropped"""
+    return re.findall(r"[^\W_]+", q.lower())[:MAX_SEARCH_TERMS]
+
+
+class SearchService:
+    """
+    Ranked full-text search over a user's document names, descriptions and
+    extracted file text.
+
+    Postgres matches the generated search_vector column through its GIN
+    index and ranks with ts_rank_cd (names weigh more than descriptions,
+    descriptions more than file text).
+    SQLite uses the documents_fts FTS5 index and bm25. Both treat every term
+    as a prefix, so results follow the user's typing.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search(
+        self,
+        owner_id: str,
+        q: str,
+        limit: int,
+        category: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Best matches for a query, best first
+
+        Args:
+            owner_id: Only this user's documents are searched
+            q: Search box text
+            limit: Maximum number of results
+            category: Only documents in this category
+
+        Returns:
+            List[Dict[str, Any]]: Each has "document", "rank" (higher is
+            better), "name_highlight" and "snippet" (excerpt of the
+            description or file text, None when neither has a match)
+        """
+        terms = search_terms(q)
+        if not terms:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search query must contain at least one letter or digit"
+            )
+
+        if self.db.get_bind().dialect.name == "sqlite":
+            return await self._search_sqlite(owner_id, terms, limit, category)
+        return await self._search_postgres(owner_id, terms, limit, category)
+
+    async def _search_postgres(
+        self,
+        owner_id: str,
+        terms: List[str],
+        limit: int,
+        category: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        tsquery = func.to_tsquery(TS_CONFIG, " & ".join(f"{term}:*" for term in terms))
+        vector = literal_column("documents.search_vector")
+        rank = func.ts_rank_cd(vector, tsquery)
+
+        # Rank and cut first, so ts_headline only runs on the returned rows
+        matches = select(Document.id, rank.label("rank")).where(
+            Document.owner_id == owner_id,
+            vector.op("@@")(tsquery)
+        )
+        if category:
+            matches = matches.where(Document.category == category)
+        matches = matches.order_by(rank.desc(), Document.created_at.desc()).limit(limit).subquery()
+
+        rows = (await self.db.execute(
+            select(
+                Document,
+                matches.c.rank,
+                func.ts_headline(TS_CONFIG, Document.name, tsquery, TS_HEADLINE_OPTIONS).label("name_highlight"),
+                func.ts_headline(
+                    TS_CONFIG,
+                    func.concat_ws(" ", Document.description, Document.content_text),
+                    tsquery,
+                    TS_HEADLINE_OPTIONS
+                ).label("snippet")
+            )
+            .join(matches, matches.c.id == Document.id)
+            .order_by(matches.c.rank.desc(), Document.created_at.desc())
+        )).all()
+
+        return [self._result(row) for row in rows]
+
+    async def _search_sqlite(
+        self,
+        owner_id: str,
+        terms: List[str],
+        limit: int,
+        category: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        # bm25 is lower for better matches; weigh name 4x description, 8x file text
+        fts = text(
+            "SELECT documents.id AS id, -bm25(documents_fts, 4.0, 1.0, 0.5) AS score, "
+            f"highlight(documents_fts, 0, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}') AS name_highlight, "
+            f"snippet(documents_fts, 1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 24) AS snippet, "
+            f"snippet(documents_fts, 2, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 24) AS content_snippet "
+            "FROM documents_fts JOIN documents ON documents.rowid = documents_fts.rowid "
+            "WHERE documents_fts MATCH :match AND documents.owner_id = :owner_id "
+            "AND (:category IS NULL OR documents.category = :category) "
+            "ORDER BY score DESC, documents.created_at DESC LIMIT :limit"
+        ).columns(
+            id=String, score=Float, name_highlight=String, snippet=String, content_snippet=String
+        ).subquery()
+
+        rows = (await self.db.execute(
+            select(Document, fts.c.score, fts.c.name_highlight, fts.c.snippet, fts.c.content_snippet)
+            .join(fts, fts.c.id == Document.id)
+            .order_by(fts.c.score.desc(), Document.created_at.desc()),
+            {
+                "match": " ".join(f'"{term}"*' for term in terms),
+                "owner_id": owner_id,
+                "category": category,
+                "limit": limit
+            }
+        )).all()
+
+        return [self._result(row) for row in rows]
+
+    @staticmethod
+    def _result(row) -> Dict[str, Any]:
+        # One snippet per searched text column on SQLite; the first with a match wins
+        document, rank, name_highlight, *snippets = row
+        return {
+            "document": document,
+            "rank": float(rank),
+            "name_highlight": name_highlight,
+            "snippet": next((s for s in snippets if s and HIGHLIGHT_START in s), None)
+        }
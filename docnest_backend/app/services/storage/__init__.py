@@ -0,0 +1,52 @@
+# app/services/storage/__init__.py
+import threading
+from typing import Optional
+
+from ...core.config import settings
+from .base import ObjectStream, StorageBackend, StoredObject, UploadDigest, hash_upload, new_object_key, storage_key
+
+_backend: Optional[StorageBackend] = None
+_lock = threading.Lock()
+
+
+def _create_backend(name: str) -> StorageBackend:
+    if name == "s3":
+        from .s3 import S3StorageBackend
+        return S3StorageBackend()
+    if name == "local":
+        from .local import LocalStorageBackend
+        return LocalStorageBackend()
+    if name == "memory":
+        from .memory import MemoryStorageBackend
+        return MemoryStorageBackend()
+    raise ValueError(f"Unknown STORAGE_BACKEND: {name}")
+
+
+def get_storage_backend() -> StorageBackend:
+    """Return the process-wide storage backend selected by settings.STORAGE_BACKEND"""
+    global _backend
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                _backend = _create_backend(settings.STORAGE_BACKEND)
+    return _backend
+
+
+def set_storage_backend(backend: Optional[StorageBackend]) -> None:
+    """Swap the active backend (tests and benchmarks); None re-reads settings"""
+    global _backend
+    with _lock:
+        _backend = backend
+
+
+__all__ = [
+    'ObjectStream',
+    'StorageBackend',
+    'StoredObject',
+    'UploadDigest',
+    'get_storage_backend',
+    'hash_upload',
+    'new_object_key',
+    'set_storage_backend',
+    'storage_key'
+]
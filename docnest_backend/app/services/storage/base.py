@@ -0,0 +1,263 @@
+# app/services/storage/base.py
+import hashlib
+import os
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+import magic
+from fastapi import HTTPException, UploadFile, status
+from jose import JWTError, jwt
+
+from ...core.config import settings
+from ...core.storage_executor import get_storage_executor
+
+
+class UploadDigest:
+    """Running size, SHA-256 and MIME type of an upload, fed one chunk at a time"""
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or settings.MAX_FILE_SIZE
+        self.size = 0
+        self.content_type: Optional[str] = None
+        self._sha256 = hashlib.sha256()
+
+    def update(self, chunk: bytes) -> None:
+        if self.content_type is None:
+            # libmagic only needs the file header, never hand it the whole upload
+            self.content_type = magic.from_buffer(
+                chunk[:settings.MIME_SNIFF_BYTES], mime=True
+            )
+
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File too large. Maximum size is {self.max_size/1024/1024}MB"
+            )
+        self._sha256.update(chunk)
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+
+async def hash_upload(file: UploadFile) -> UploadDigest:
+    """
+    Size, type and SHA-256 of an upload, computed before any byte is stored.
+
+    Reads the already-spooled UploadFile in chunks on the storage executor, so
+    memory stays bounded and the event loop is not blocked by hashing.
+    """
+    def _hash(f) -> UploadDigest:
+        digest = UploadDigest()
+        f.seek(0)
+        while chunk := f.read(settings.UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+        f.seek(0)
+        return digest
+
+    return await get_storage_executor().run(_hash, file.file)
+
+
+def new_object_key(folder: str, filename: str) -> str:
+    """Unique key under `folder` that keeps the upload's file extension"""
+    ext = os.path.splitext(filename)[1].lower()
+    return f"{folder.strip('/')}/{uuid.uuid4()}{ext}"
+
+
+def storage_key(file_path: str) -> str:
+    """Object key of a document's file_path; older rows stored the full S3 URL rather than the key"""
+    return file_path.split(".amazonaws.com/")[-1]
+
+
+class StoredObject:
+    """Result of writing an upload to a storage backend"""
+
+    def __init__(
+        self,
+        key: str,
+        size: int,
+        content_type: str,
+        sha256: str,
+        content_encoding: Optional[str] = None
+    ):
+        self.key = key
+        self.size = size
+        self.content_type = content_type
+        self.sha256 = sha256
+        self.content_encoding = content_encoding
+
+
+class ObjectInfo:
+    """Metadata of a stored object, as returned by a HEAD request or a listing"""
+
+    def __init__(
+        self,
+        key: str,
+        size: int,
+        content_type: Optional[str],
+        etag: Optional[str] = None,
+        last_modified: Optional[datetime] = None
+    ):
+        self.key = key
+        self.size = size
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class ObjectStream:
+    """
+    An open object ready to be relayed to a client.
+
+    `chunks` yields the (possibly ranged) body. Backends that keep objects on
+    local disk also set `path` so full downloads can be handed to the server as
+    a file response instead of being copied through Python. Objects stored
+    compressed carry `content_encoding` and their encoded length; ranges always
+    refer to the decoded bytes and are never encoded.
+    """
+
+    def __init__(
+        self,
+        chunks: AsyncIterator[bytes],
+        content_type: str,
+        content_length: int,
+        content_range: Optional[str] = None,
+        etag: Optional[str] = None,
+        path: Optional[str] = None,
+        content_encoding: Optional[str] = None
+    ):
+        self.chunks = chunks
+        self.content_type = content_type
+        self.content_length = content_length
+        self.content_range = content_range
+        self.etag = etag
+        self.path = path
+        self.content_encoding = content_encoding
+
+    @property
+    def is_partial(self) -> bool:
+        return self.content_range is not None
+
+
+class StorageBackend(ABC):
+    """Interface every object store (S3, local disk, memory) implements"""
+
+    name: str
+
+    @abstractmethod
+    async def upload(
+        self,
+        file: UploadFile,
+        key: str,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> StoredObject:
+        """Stream an upload into the store under `key`"""
+
+    @abstractmethod
+    async def open(
+        self,
+        key: str,
+        byte_range: Optional[str] = None,
+        if_range: Optional[str] = None
+    ) -> ObjectStream:
+        """Open an object for streaming, optionally a single byte range"""
+
+    @abstractmethod
+    async def delete(self, key: Optional[str]) -> None:
+        """Delete an object; missing objects are not an error"""
+
+    @abstractmethod
+    async def head(self, key: str) -> Optional[ObjectInfo]:
+        """Size and type of an object, or None if it does not exist"""
+
+    @abstractmethod
+    def list_objects(self, prefix: str, page_size: int = 1000) -> AsyncIterator[List[ObjectInfo]]:
+        """Yield the objects under `prefix` one page at a time"""
+
+    async def delete_many(self, keys: Iterable[str]) -> List[str]:
+        """Delete several objects, returning the keys that could not be deleted"""
+        failed = []
+        for key in keys:
+            try:
+                await self.delete(key)
+            except HTTPException:
+                failed.append(key)
+        return failed
+
+    @abstractmethod
+    async def generate_presigned_url(self, key: str, expires_in: int = 3600) -> str:
+        """Return a time-limited URL the client can GET the object from"""
+
+    @abstractmethod
+    async def create_presigned_upload(
+        self,
+        key: str,
+        content_type: str,
+        max_size: int,
+        expires_in: int = 900
+    ) -> Dict:
+        """
+        Return {"url", "fields", "method"} letting the client upload straight to
+        the store, restricted to `content_type` and at most `max_size` bytes
+        """
+
+
+def create_object_token(key: str, expires_in: int, scope: str = "storage:get", **claims) -> str:
+    """Signed, expiring token standing in for a presigned URL on non-S3 backends"""
+    return jwt.encode(
+        {
+            "key": key,
+            "scope": scope,
+            "exp": datetime.utcnow() + timedelta(seconds=expires_in),
+            **claims
+        },
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM
+    )
+
+
+def verify_object_token(token: str, scope: str = "storage:get") -> Dict:
+    try:
+        payload = jwt.decode(
+            token,
+            settings.JWT_SECRET_KEY,
+            algorithms=[settings.JWT_ALGORITHM]
+        )
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired link"
+        )
+    if payload.get("scope") != scope:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired link"
+        )
+    return payload
+
+
+def object_token_url(token: str, route: str = "objects") -> str:
+    return f"{settings.PUBLIC_BASE_URL}{settings.API_V1_STR}/storage/{route}/{token}"
+
+
+def token_upload_form(key: str, content_type: str, max_size: int, expires_in: int) -> Dict:
+    """
+    Presigned-POST look-alike served by the API itself (local and memory backends).
+
+    The client posts `fields` plus the file exactly as it would to S3.
+    """
+    token = create_object_token(
+        key,
+        expires_in,
+        scope="storage:put",
+        content_type=content_type,
+        max_size=max_size
+    )
+    return {
+        "url": object_token_url(token, route="uploads"),
+        "fields": {"Content-Type": content_type},
+        "method": "POST"
+    }
@@ -0,0 +1,116 @@
+# app/services/storage/compression.py
+import struct
+import zlib
+from typing import AsyncIterator, Optional
+
+from ...core.config import settings
+
+GZIP = "gzip"
+
+# Formats that are already compressed; gzip would only cost CPU
+INCOMPRESSIBLE_TYPES = {
+    "image/jpeg",
+    "image/png",
+    "application/zip",
+    "application/gzip",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+# Read by byte range (the PDF viewer fetches page by page, players seek). A range
+# of a gzip object can only be served by decoding it from byte 0, so these are
+# stored raw whatever their ratio
+RANGE_SERVED_TYPES = {"application/pdf"}
+RANGE_SERVED_PREFIXES = ("audio/", "video/")
+
+
+def should_compress(content_type: Optional[str], sample: bytes) -> bool:
+    """
+    Decide whether an upload is worth storing gzip-encoded.
+
+    Types served by range are never compressed. Otherwise the first
+    STORAGE_COMPRESSION_SAMPLE_BYTES are compressed as a probe; the upload is
+    compressed only if the probe shrinks to at most
+    STORAGE_COMPRESSION_MAX_RATIO of its size.
+    """
+    if content_type in INCOMPRESSIBLE_TYPES or content_type in RANGE_SERVED_TYPES:
+        return False
+    if content_type and content_type.startswith(RANGE_SERVED_PREFIXES):
+        return False
+    sample = sample[:settings.STORAGE_COMPRESSION_SAMPLE_BYTES]
+    if not sample:
+        return False
+    probe = zlib.compress(sample, settings.STORAGE_COMPRESSION_LEVEL)
+    return len(probe) <= len(sample) * settings.STORAGE_COMPRESSION_MAX_RATIO
+
+
+class GzipEncoder:
+    """Incremental gzip stream: feed chunks with compress(), finish with flush()"""
+
+    def __init__(self, level: Optional[int] = None):
+        self._compressor = zlib.compressobj(
+            level or settings.STORAGE_COMPRESSION_LEVEL,
+            zlib.DEFLATED,
+            16 + zlib.MAX_WBITS  # gzip container
+        )
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+def gzip_decoded_size(trailer: bytes) -> int:
+    """Uncompressed size from the ISIZE field in the last 4 bytes of a gzip stream"""
+    return struct.unpack("<I", trailer[-4:])[0]
+
+
+async def gunzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Decompress a gzip stream chunk by chunk"""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        async for chunk in chunks:
+            data = decompressor.decompress(chunk)
+            if data:
+                yield data
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+    finally:
+        await chunks.aclose()
+
+
+async def slice_chunks(chunks: AsyncIterator[bytes], first: int, last: int) -> AsyncIterator[bytes]:
+    """Yield only bytes first..last (inclusive) of a chunk stream"""
+    offset = 0
+    try:
+        async for chunk in chunks:
+            start, end = offset, offset + len(chunk)
+            offset = end
+            if end <= first:
+                continue
+            yield chunk[max(first - start, 0):last + 1 - start]
+            if end > last:
+                break
+    finally:
+        # Stop the source early so its connection is released
+        await chunks.aclose()
+
+
+def accepts_encoding(accept_encoding: Optional[str], encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows `encoding` (q=0 means refused)"""
+    if not accept_encoding:
+        return False
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() not in (encoding, "*"):
+            continue
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                return float(params[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
@@ -0,0 +1,179 @@
+# app/services/storage/local.py
+import mimetypes
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+from fastapi import HTTPException, UploadFile, status
+
+from ...core.config import settings
+from ...core.storage_executor import get_storage_executor
+from ...utils.http_range import resolve_range
+from .base import (
+    ObjectInfo,
+    ObjectStream,
+    StorageBackend,
+    StoredObject,
+    UploadDigest,
+    create_object_token,
+    object_token_url,
+    token_upload_form
+)
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Objects stored as plain files under settings.UPLOAD_DIR.
+
+    Full downloads expose the file path so the API can answer with a
+    FileResponse and let the server send the file itself; only ranged reads
+    are copied through Python.
+    """
+
+    name = "local"
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.abspath(root or settings.UPLOAD_DIR)
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key.strip('/')))
+        if not path.startswith(self.root + os.sep):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid storage key"
+            )
+        return path
+
+    async def upload(
+        self,
+        file: UploadFile,
+        key: str,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> StoredObject:
+        """Stream an upload to disk, writing to a temp file and renaming into place"""
+        executor = get_storage_executor()
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+        digest = UploadDigest()
+
+        await executor.run(os.makedirs, os.path.dirname(path), exist_ok=True)
+        out = await executor.run(open, tmp_path, "wb")
+        try:
+            await file.seek(0)
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+                await executor.run(out.write, chunk)
+            await executor.run(out.close)
+            await executor.run(os.replace, tmp_path, path)
+        except Exception:
+            out.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        await file.seek(0)
+        return StoredObject(key, digest.size, digest.content_type, digest.sha256)
+
+    async def _read_range(self, path: str, first: int, last: int) -> AsyncIterator[bytes]:
+        executor = get_storage_executor()
+        f = await executor.run(open, path, "rb")
+        try:
+            await executor.run(f.seek, first)
+            remaining = last - first + 1
+            while remaining > 0:
+                chunk = await executor.run(f.read, min(settings.DOWNLOAD_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            f.close()
+
+    async def open(
+        self,
+        key: str,
+        byte_range: Optional[str] = None,
+        if_range: Optional[str] = None
+    ) -> ObjectStream:
+        path = self._path(key)
+        try:
+            stat = await get_storage_executor().run(os.stat, path)
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="File not found in storage"
+            )
+
+        size = stat.st_size
+        etag = f'"{int(stat.st_mtime_ns):x}-{size:x}"'
+        content_type = mimetypes.guess_type(key)[0] or 'application/octet-stream'
+
+        if byte_range and (not if_range or if_range == etag):
+            first, last = resolve_range(byte_range, size)
+            return ObjectStream(
+                self._read_range(path, first, last),
+                content_type=content_type,
+                content_length=last - first + 1,
+                content_range=f"bytes {first}-{last}/{size}",
+                etag=etag
+            )
+
+        return ObjectStream(
+            self._read_range(path, 0, size - 1),
+            content_type=content_type,
+            content_length=size,
+            etag=etag,
+            path=path
+        )
+
+    async def delete(self, key: Optional[str]) -> None:
+        if not key:
+            return
+        try:
+            await get_storage_executor().run(os.remove, self._path(key))
+        except FileNotFoundError:
+            return
+
+    async def head(self, key: str) -> Optional[ObjectInfo]:
+        try:
+            stat = await get_storage_executor().run(os.stat, self._path(key))
+        except FileNotFoundError:
+            return None
+        return ObjectInfo(key, stat.st_size, mimetypes.guess_type(key)[0])
+
+    def _walk(self, prefix: str, page_size: int) -> Iterator[List[ObjectInfo]]:
+        page = []
+        for dirpath, _, filenames in os.walk(self._path(prefix) if prefix.strip('/') else self.root):
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                stat = os.stat(path)
+                key = os.path.relpath(path, self.root).replace(os.sep, '/')
+                page.append(ObjectInfo(
+                    key,
+                    stat.st_size,
+                    mimetypes.guess_type(key)[0],
+                    last_modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+                ))
+                if len(page) >= page_size:
+                    yield page
+                    page = []
+        if page:
+            yield page
+
+    async def list_objects(self, prefix: str, page_size: int = 1000) -> AsyncIterator[List[ObjectInfo]]:
+        # os.walk blocks on the filesystem, so each page is produced on the storage pool
+        async for page in get_storage_executor().iterate(self._walk(prefix, page_size)):
+            yield page
+
+    async def generate_presigned_url(self, key: str, expires_in: int = 3600) -> str:
+        return object_token_url(create_object_token(key, expires_in))
+
+    async def create_presigned_upload(
+        self,
+        key: str,
+        content_type: str,
+        max_size: int,
+        expires_in: int = 900
+    ) -> Dict:
+        return token_upload_form(key, content_type, max_size, expires_in)
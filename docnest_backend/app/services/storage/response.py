@@ -0,0 +1,57 @@
+# app/services/storage/response.py
+from typing import Optional
+
+from fastapi import status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from .base import ObjectStream
+from .compression import GZIP, accepts_encoding, gunzip_chunks
+
+
+def object_response(
+    stream: ObjectStream,
+    filename: Optional[str] = None,
+    accept_encoding: Optional[str] = None
+) -> Response:
+    """
+    Build the HTTP response for an opened object.
+
+    Whole files on local disk go out as a FileResponse so the server sends them
+    directly; everything else is relayed chunk by chunk, with 206 and
+    Content-Range for ranged reads. Objects stored gzip-encoded are passed
+    through as-is when the client accepts gzip and decompressed on the fly
+    otherwise.
+    """
+    if stream.path:
+        return FileResponse(
+            stream.path,
+            media_type=stream.content_type,
+            filename=filename,
+            headers={'Accept-Ranges': 'bytes'}
+        )
+
+    chunks = stream.chunks
+    headers = {'Accept-Ranges': 'bytes'}
+    if stream.content_encoding == GZIP:
+        headers['Vary'] = 'Accept-Encoding'
+        if accepts_encoding(accept_encoding, GZIP):
+            headers['Content-Encoding'] = GZIP
+            headers['Content-Length'] = str(stream.content_length)
+        else:
+            # Decoded length is unknown up front, send it chunked
+            chunks = gunzip_chunks(chunks)
+    else:
+        headers['Content-Length'] = str(stream.content_length)
+    if filename:
+        headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    if stream.etag:
+        headers['ETag'] = stream.etag
+    if stream.is_partial:
+        headers['Content-Range'] = stream.content_range
+
+    return StreamingResponse(
+        chunks,
+        status_code=status.HTTP_206_PARTIAL_CONTENT if stream.is_partial else status.HTTP_200_OK,
+        media_type=stream.content_type,
+        headers=headers
+    )
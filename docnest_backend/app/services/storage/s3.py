@@ -0,0 +1,597 @@
+# app/services/storage/s3.py
+import mimetypes
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+from fastapi import HTTPException, UploadFile, status
+
+from ...core.config import settings
+from ...core.storage_client import get_s3_client
+from ...core.storage_executor import get_storage_executor
+from ...utils.http_range import resolve_range
+from .base import ObjectInfo, ObjectStream, StorageBackend, StoredObject, UploadDigest
+from .compression import GZIP, GzipEncoder, gunzip_chunks, gzip_decoded_size, should_compress, slice_chunks
+
+# S3 rejects multipart parts (other than the last one) smaller than 5MB
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+# Upper bound on keys per ListObjectsV2 page and per DeleteObjects request
+S3_MAX_KEYS_PER_REQUEST = 1000
+
+
+async def _rechunk(chunks: AsyncIterator[bytes], size: int) -> AsyncIterator[bytes]:
+    """Regroup a byte stream into blocks of at least `size` bytes (the last may be shorter)"""
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+async def stream_upload_to_s3(
+    s3_client,
+    bucket_name: str,
+    file: UploadFile,
+    s3_key: str,
+    metadata: Optional[Dict[str, str]] = None,
+    chunk_size: Optional[int] = None,
+    compress: bool = False
+) -> Tuple[int, str, str, Optional[str]]:
+    """
+    Stream an UploadFile to S3 without holding it in memory
+
+    Files that fit in a single chunk are sent with one put_object call, anything
+    larger goes through a multipart upload, so at most two chunks are buffered
+    per request regardless of the file size. S3 calls run on the storage
+    executor so the event loop is never blocked by the network.
+
+    With `compress`, uploads whose first chunk compresses well are stored
+    gzip-encoded with Content-Encoding set on the object.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket_name: Target bucket
+        file: UploadFile object
+        s3_key: Key to store the object under
+        metadata: Optional S3 user metadata
+        chunk_size: Part size in bytes
+        compress: Allow gzip-encoding compressible uploads
+
+    Returns:
+        Tuple[int, str, str, Optional[str]]: (file_size, file_type, sha256, content_encoding)
+    """
+    chunk_size = max(chunk_size or settings.UPLOAD_CHUNK_SIZE, S3_MIN_PART_SIZE)
+    digest = UploadDigest()
+    executor = get_storage_executor()
+
+    await file.seek(0)
+    first_chunk = await file.read(chunk_size)
+    digest.update(first_chunk)
+
+    encoder = None
+    object_params = {'ContentType': digest.content_type, 'Metadata': metadata or {}}
+    if compress and should_compress(digest.content_type, first_chunk):
+        encoder = GzipEncoder()
+        object_params['ContentEncoding'] = GZIP
+
+    async def stored_chunks() -> AsyncIterator[bytes]:
+        # Raw chunks feed the digest; what is yielded is what S3 stores
+        chunk = first_chunk
+        while chunk:
+            yield await executor.run(encoder.compress, chunk) if encoder else chunk
+            chunk = await file.read(chunk_size)
+            digest.update(chunk)
+        if encoder:
+            yield encoder.flush()
+
+    blocks = _rechunk(stored_chunks(), chunk_size)
+    block = await anext(blocks, b"")
+    next_block = await anext(blocks, None)
+
+    if next_block is None:
+        # Small file: a single request is cheaper than a multipart round trip
+        await executor.run(
+            s3_client.put_object,
+            Bucket=bucket_name,
+            Key=s3_key,
+            Body=block,
+            **object_params
+        )
+        await file.seek(0)
+        return digest.size, digest.content_type, digest.sha256, object_params.get('ContentEncoding')
+
+    upload = await executor.run(
+        s3_client.create_multipart_upload,
+        Bucket=bucket_name,
+        Key=s3_key,
+        **object_params
+    )
+    upload_id = upload['UploadId']
+    parts = []
+
+    try:
+        while block:
+            part = await executor.run(
+                s3_client.upload_part,
+                Bucket=bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                PartNumber=len(parts) + 1,
+                Body=block
+            )
+            parts.append({'ETag': part['ETag'], 'PartNumber': len(parts) + 1})
+
+            block, next_block = next_block, None
+            if block:
+                next_block = await anext(blocks, None)
+
+        await executor.run(
+            s3_client.complete_multipart_upload,
+            Bucket=bucket_name,
+            Key=s3_key,
+            UploadId=upload_id,
+            MultipartUpload={'Parts': parts}
+        )
+    except Exception:
+        # Don't leave orphaned parts behind, S3 bills for them until aborted
+        await executor.run(
+            s3_client.abort_multipart_upload,
+            Bucket=bucket_name,
+            Key=s3_key,
+            UploadId=upload_id
+        )
+        raise
+
+    await file.seek(0)
+    return digest.size, digest.content_type, digest.sha256, object_params.get('ContentEncoding')
+
+
+async def _iter_body(body, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+    """Yield a StreamingBody in fixed-size chunks, closing the connection when done"""
+    executor = get_storage_executor()
+    try:
+        chunks = body.iter_chunks(chunk_size or settings.DOWNLOAD_CHUNK_SIZE)
+        async for chunk in executor.iterate(chunks):
+            yield chunk
+    finally:
+        body.close()
+
+
+def _client_error(e: ClientError) -> Tuple[str, str]:
+    error = e.response.get('Error', {})
+    return error.get('Code', 'Unknown'), error.get('Message', str(e))
+
+
+class S3StorageBackend(StorageBackend):
+    name = "s3"
+
+    def __init__(self):
+        """Initialize S3 backend with the shared client and configured bucket"""
+        self.s3_client = get_s3_client()
+        self.bucket_name = settings.AWS_BUCKET_NAME
+
+    async def upload(
+        self,
+        file: UploadFile,
+        key: str,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> StoredObject:
+        """
+        Upload a file to S3 bucket, streaming it in parts
+        
+        Args:
+            file: UploadFile object
+            key: S3 key to store the file under
+            metadata: Optional S3 user metadata
+            
+        Returns:
+            StoredObject: key, size, type and SHA-256 of the stored file
+        """
+        try:
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"Uploading file to S3: {key}")
+
+            file_size, file_type, sha256, content_encoding = await stream_upload_to_s3(
+                self.s3_client,
+                self.bucket_name,
+                file,
+                key,
+                metadata=metadata,
+                compress=settings.STORAGE_COMPRESSION
+            )
+
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"File uploaded successfully: size={file_size}, type={file_type}, encoding={content_encoding}")
+
+            return StoredObject(key, file_size, file_type, sha256, content_encoding)
+
+        except HTTPException:
+            raise
+        except ClientError as e:
+            error_code, error_message = _client_error(e)
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"S3 upload error: Code={error_code}, Message={error_message}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error uploading file to S3: {error_message}"
+            )
+        except Exception as e:
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"Unexpected error during upload: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error uploading file: {str(e)}"
+            )
+
+    async def open(
+        self,
+        key: str,
+        byte_range: Optional[str] = None,
+        if_range: Optional[str] = None
+    ) -> ObjectStream:
+        """
+        Open a streaming download of a file from S3 bucket
+        
+        Args:
+            key: S3 key of the file
+            byte_range: Optional S3 Range value, e.g. "bytes=0-1023"
+            if_range: Optional ETag; the range is only honoured if it still matches
+            
+        Returns:
+            ObjectStream: Chunk iterator plus the headers needed to relay it
+        """
+        try:
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"Downloading file from S3: {key} range={byte_range}")
+
+            params = {
+                'Bucket': self.bucket_name,
+                'Key': key.strip('/')
+            }
+            if byte_range:
+                params['Range'] = byte_range
+                if if_range:
+                    params['IfMatch'] = if_range
+
+            executor = get_storage_executor()
+            try:
+                response = await executor.run(self.s3_client.get_object, **params)
+            except ClientError as e:
+                error_code, _ = _client_error(e)
+                if error_code == 'InvalidRange':
+                    # The range may only be out of bounds for the compressed bytes
+                    info = await executor.run(self.s3_client.head_object, Bucket=self.bucket_name, Key=params['Key'])
+                    if info.get('ContentEncoding') == GZIP:
+                        return await self._open_gzip_range(key, info, byte_range)
+                    raise
+                if error_code not in ('PreconditionFailed', '412') or not if_range:
+                    raise
+                # Object changed since the client's partial copy, send it whole
+                params.pop('Range')
+                params.pop('IfMatch')
+                response = await executor.run(self.s3_client.get_object, **params)
+
+            if response.get('ContentEncoding') == GZIP and response.get('ContentRange'):
+                # Ranges address the decoded file, not the stored gzip bytes
+                response['Body'].close()
+                return await self._open_gzip_range(key, response, byte_range)
+
+            content_type = response.get('ContentType', 
+                mimetypes.guess_type(key)[0] or 'application/octet-stream'
+            )
+
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"Streaming file: type={content_type}, size={response.get('ContentLength')}")
+
+            return ObjectStream(
+                _iter_body(response['Body']),
+                content_type=content_type,
+                content_length=response.get('ContentLength'),
+                content_range=response.get('ContentRange'),
+                etag=response.get('ETag'),
+                content_encoding=response.get('ContentEncoding')
+            )
+
+        except ClientError as e:
+            error_code, error_message = _client_error(e)
+            
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"S3 download error: Code={error_code}, Message={error_message}")
+
+            if error_code == 'NoSuchKey':
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="File not found in storage"
+                )
+
+            if error_code == 'InvalidRange':
+                raise HTTPException(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    detail="Requested range not satisfiable",
+                    headers={'Content-Range': f"bytes */{e.response.get('Error', {}).get('ActualObjectSize', '*')}"}
+                )
+                
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error downloading file: {error_message}"
+            )
+
+    async def _open_gzip_range(self, key: str, response: Dict, byte_range: str) -> ObjectStream:
+        """
+        Serve a byte range of a gzip-encoded object by decoding it from the start
+        
+        Args:
+            key: S3 key of the file
+            response: get_object/head_object response identifying the object version
+            byte_range: Range over the decoded bytes
+            
+        Returns:
+            ObjectStream: The decoded slice, never encoded
+        """
+        executor = get_storage_executor()
+        params = {
+            'Bucket': self.bucket_name,
+            'Key': key.strip('/'),
+            'IfMatch': response['ETag']
+        }
+
+        # gzip records the decoded size in its last four bytes
+        trailer = await executor.run(self.s3_client.get_object, Range='bytes=-4', **params)
+        try:
+            size = gzip_decoded_size(await executor.run(trailer['Body'].read))
+        finally:
+            trailer['Body'].close()
+
+        first, last = resolve_range(byte_range, size)
+        full = await executor.run(self.s3_client.get_object, **params)
+        return ObjectStream(
+            slice_chunks(gunzip_chunks(_iter_body(full['Body'])), first, last),
+            content_type=response.get('ContentType', mimetypes.guess_type(key)[0] or 'application/octet-stream'),
+            content_length=last - first + 1,
+            content_range=f"bytes {first}-{last}/{size}",
+            etag=response['ETag']
+        )
+
+    async def delete(self, key: Optional[str]) -> None:
+        """
+        Delete a file from S3 bucket
+        
+        Args:
+            key: S3 key of the file to delete
+        """
+        if not key:
+            if settings.DEBUG_S3_OPERATIONS:
+                print("No file path provided for deletion")
+            return
+
+        s3_key = key.strip('/')
+        try:
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"Attempting to delete S3 object: {s3_key}")
+
+            await get_storage_executor().run(
+                self.s3_client.delete_object,
+                Bucket=self.bucket_name,
+                Key=s3_key
+            )
+
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"Successfully deleted file: {s3_key}")
+
+        except ClientError as e:
+            error_code, error_message = _client_error(e)
+            
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"S3 delete error: Code={error_code}, Message={error_message}")
+            
+            if error_code == 'NoSuchKey':
+                if settings.DEBUG_S3_OPERATIONS:
+                    print(f"Object already deleted or doesn't exist: {s3_key}")
+                return
+                
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error deleting file from S3: {error_message}"
+            )
+
+    async def list_objects(self, prefix: str, page_size: int = 1000) -> AsyncIterator[List[ObjectInfo]]:
+        """
+        Page through the bucket under a prefix with ListObjectsV2
+        
+        Args:
+            prefix: Key prefix to list
+            page_size: Keys per page, at most 1000
+            
+        Yields:
+            List[ObjectInfo]: One page of objects, in key order
+        """
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=prefix.lstrip('/'),
+            PaginationConfig={'PageSize': min(page_size, S3_MAX_KEYS_PER_REQUEST)}
+        )
+        try:
+            async for page in get_storage_executor().iterate(iter(pages)):
+                yield [
+                    ObjectInfo(
+                        obj['Key'],
+                        size=obj['Size'],
+                        content_type=None,
+                        etag=obj.get('ETag'),
+                        last_modified=obj.get('LastModified')
+                    )
+                    for obj in page.get('Contents', [])
+                ]
+        except ClientError as e:
+            _, error_message = _client_error(e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error listing objects: {error_message}"
+            )
+
+    async def delete_many(self, keys: Iterable[str]) -> List[str]:
+        """
+        Delete objects with batched DeleteObjects calls of up to 1000 keys
+        
+        Args:
+            keys: S3 keys to delete
+            
+        Returns:
+            List[str]: Keys S3 reported as not deleted
+        """
+        keys = [key.strip('/') for key in keys if key]
+        failed = []
+        for offset in range(0, len(keys), S3_MAX_KEYS_PER_REQUEST):
+            batch = keys[offset:offset + S3_MAX_KEYS_PER_REQUEST]
+            try:
+                response = await get_storage_executor().run(
+                    self.s3_client.delete_objects,
+                    Bucket=self.bucket_name,
+                    Delete={
+                        'Objects': [{'Key': key} for key in batch],
+                        'Quiet': True
+                    }
+                )
+            except ClientError as e:
+                _, error_message = _client_error(e)
+                if settings.DEBUG_S3_OPERATIONS:
+                    print(f"DeleteObjects failed for {len(batch)} keys: {error_message}")
+                failed.extend(batch)
+                continue
+
+            for error in response.get('Errors', []):
+                if error.get('Code') != 'NoSuchKey':
+                    failed.append(error['Key'])
+        return failed
+
+    async def generate_presigned_url(self, key: str, expires_in: int = 3600) -> str:
+        """
+        Generate a presigned URL for accessing a private S3 object
+        
+        Args:
+            key: S3 key of the file
+            expires_in: URL expiration time in seconds
+            
+        Returns:
+            str: Presigned URL
+        """
+        try:
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"Generating presigned URL for: {key}")
+
+            # Signing is local CPU work, no need for the storage executor
+            return self.s3_client.generate_presigned_url(
+                'get_object',
+                Params={
+                    'Bucket': self.bucket_name,
+                    'Key': key.strip('/')
+                },
+                ExpiresIn=expires_in
+            )
+
+        except ClientError as e:
+            _, error_message = _client_error(e)
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"Error generating presigned URL: {error_message}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error generating download URL: {error_message}"
+            )
+
+    async def head(self, key: str) -> Optional[ObjectInfo]:
+        """
+        Look up an object's size and type without downloading it
+        
+        Args:
+            key: S3 key of the file
+            
+        Returns:
+            Optional[ObjectInfo]: None if the object does not exist
+        """
+        try:
+            response = await get_storage_executor().run(
+                self.s3_client.head_object,
+                Bucket=self.bucket_name,
+                Key=key.strip('/')
+            )
+            return ObjectInfo(
+                key,
+                size=response['ContentLength'],
+                content_type=response.get('ContentType'),
+                etag=response.get('ETag')
+            )
+        except ClientError as e:
+            error_code, error_message = _client_error(e)
+            if error_code in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error reading file metadata: {error_message}"
+            )
+
+    async def create_presigned_upload(
+        self,
+        key: str,
+        content_type: str,
+        max_size: int,
+        expires_in: int = 900
+    ) -> Dict:
+        """
+        Generate a presigned POST so the client uploads straight to S3
+        
+        S3 itself rejects uploads with a different Content-Type or a size
+        outside 1..max_size bytes.
+        
+        Args:
+            key: S3 key the object must be stored under
+            content_type: Required Content-Type of the upload
+            max_size: Maximum object size in bytes
+            expires_in: Policy expiration time in seconds
+            
+        Returns:
+            Dict: {"url", "fields", "method"}
+        """
+        try:
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"Generating presigned upload for: {key}")
+
+            post = self.s3_client.generate_presigned_post(
+                Bucket=self.bucket_name,
+                Key=key,
+                Fields={'Content-Type': content_type},
+                Conditions=[
+                    {'Content-Type': content_type},
+                    ['content-length-range', 1, max_size]
+                ],
+                ExpiresIn=expires_in
+            )
+            return {"url": post['url'], "fields": post['fields'], "method": "POST"}
+
+        except ClientError as e:
+            _, error_message = _client_error(e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error generating upload URL: {error_message}"
+            )
+
+    async def verify_bucket_access(self) -> bool:
+        """Verify S3 bucket access permissions"""
+        try:
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"Verifying access to bucket: {self.bucket_name}")
+
+            await get_storage_executor().run(
+                self.s3_client.list_objects_v2,
+                Bucket=self.bucket_name,
+                MaxKeys=1
+            )
+
+            return True
+
+        except ClientError as e:
+            if settings.DEBUG_S3_OPERATIONS:
+                print(f"Error verifying bucket access: {str(e)}")
+            return False
@@ -0,0 +1,101 @@
+# app/services/storage/url_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ...core.config import settings
+from .base import StorageBackend
+
+
+class PresignedUrlCache:
+    """
+    Per-process LRU cache of presigned download URLs.
+
+    Entries are keyed by (object key, expires_in, time bucket). The bucket width
+    is `expires_in - min_remaining`, so a URL signed anywhere in a bucket still
+    has at least `min_remaining` seconds of validity when the bucket ends.
+    Repeated share/download calls for the same document therefore get the
+    exact same URL, which lets browsers and HTTP caches reuse it.
+    """
+
+    def __init__(self, max_size: int, min_remaining: int):
+        self.max_size = max_size
+        self.min_remaining = min_remaining
+        self._entries: "OrderedDict[Tuple[str, int, int], Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def _cache_key(self, key: str, expires_in: int, now: float) -> Optional[Tuple[str, int, int]]:
+        window = expires_in - self.min_remaining
+        if window <= 0 or self.max_size <= 0:
+            return None  # too short-lived to be worth sharing
+        return (key, expires_in, int(now // window))
+
+    async def get_url(self, storage: StorageBackend, key: str, expires_in: int = 3600) -> str:
+        """Return a cached presigned URL for `key`, signing a new one on a miss"""
+        now = time.time()
+        cache_key = self._cache_key(key, expires_in, now)
+
+        if cache_key is not None:
+            with self._lock:
+                entry = self._entries.get(cache_key)
+                if entry and entry[1] - now >= self.min_remaining:
+                    self._entries.move_to_end(cache_key)
+                    self._hits += 1
+                    return entry[0]
+                self._misses += 1
+
+        url = await storage.generate_presigned_url(key, expires_in=expires_in)
+
+        if cache_key is not None:
+            with self._lock:
+                self._entries[cache_key] = (url, now + expires_in)
+                self._entries.move_to_end(cache_key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+        return url
+
+    def invalidate(self, key: str) -> None:
+        """Drop every cached URL for an object key, e.g. after its file is replaced"""
+        with self._lock:
+            stale = [cache_key for cache_key in self._entries if cache_key[0] == key]
+            for cache_key in stale:
+                del self._entries[cache_key]
+            self._invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "max_size": self.max_size,
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0
+            }
+
+
+_url_cache: Optional[PresignedUrlCache] = None
+_lock = threading.Lock()
+
+
+def get_presigned_url_cache() -> PresignedUrlCache:
+    """Return the process-wide presigned URL cache, creating it on first use"""
+    global _url_cache
+    if _url_cache is None:
+        with _lock:
+            if _url_cache is None:
+                _url_cache = PresignedUrlCache(
+                    max_size=settings.PRESIGNED_URL_CACHE_SIZE,
+                    min_remaining=settings.PRESIGNED_URL_MIN_REMAINING_MINUTES * 60
+                )
+    return _url_cache
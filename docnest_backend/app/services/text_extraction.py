@@ -0,0 +1,94 @@
+# app/services/text_extraction.py
+"""
+Plain text of stored documents, for the search index.
+
+Everything here runs in the extraction process pool (see
+app/services/extraction_pipeline.py), so the module only imports the
+standard library at the top; pypdf is loaded by the worker that needs it.
+"""
+import io
+import zipfile
+from typing import Optional
+from xml.etree import ElementTree
+
+PDF_TYPE = "application/pdf"
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class ExtractionError(Exception):
+    """The file cannot be read as its type claims (corrupt, encrypted); retrying will not help"""
+
+
+def is_extractable(content_type: Optional[str]) -> bool:
+    """Whether text can be extracted from files of this MIME type"""
+    return content_type in (PDF_TYPE, DOCX_TYPE) or (content_type or "").startswith("text/")
+
+
+def _pdf_text(data: bytes, max_chars: int) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    if reader.is_encrypted and not reader.decrypt(""):
+        raise ExtractionError("PDF is password protected")
+
+    pages, length = [], 0
+    for page in reader.pages:
+        text = page.extract_text() or ""
+        pages.append(text)
+        length += len(text)
+        # Only the first max_chars are indexed, skip parsing the rest
+        if length >= max_chars:
+            break
+    return "\n".join(pages)
+
+
+def _docx_text(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+
+    paragraphs = []
+    for paragraph in root.iter(f"{_WORD_NS}p"):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f"{_WORD_NS}t" and node.text:
+                parts.append(node.text)
+            elif node.tag in (f"{_WORD_NS}tab", f"{_WORD_NS}br"):
+                parts.append(" ")
+        paragraphs.append("".join(parts))
+    return "\n".join(paragraphs)
+
+
+def extract_text(data: bytes, content_type: str, max_chars: int) -> str:
+    """
+    Text of a PDF, DOCX or plain-text file with whitespace collapsed
+
+    Args:
+        data: The whole (decoded) file
+        content_type: Sniffed MIME type of the file
+        max_chars: Length the result is cut to
+
+    Returns:
+        str: Extracted text, possibly empty (e.g. scanned PDFs)
+
+    Raises:
+        ExtractionError: If the type is unsupported or the file cannot be parsed
+    """
+    try:
+        if content_type == PDF_TYPE:
+            text = _pdf_text(data, max_chars)
+        elif content_type == DOCX_TYPE:
+            text = _docx_text(data)
+        elif (content_type or "").startswith("text/"):
+            text = data.decode("utf-8", errors="replace")
+        else:
+            raise ExtractionError(f"No text extractor for {content_type}")
+    except ExtractionError:
+        raise
+    except Exception as e:
+        # Parser errors do not always pickle; send back a plain message
+        raise ExtractionError(f"{type(e).__name__}: {e}")
+
+    # Postgres text cannot hold NUL characters
+    return " ".join(text.replace("\x00", " ").split())[:max_chars]
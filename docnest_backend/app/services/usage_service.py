@@ -0,0 +1,79 @@
+# app/services/usage_service.py
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.exceptions import StorageQuotaExceeded
+from ..db.upsert import dialect_insert
+from ..models.usage import UserUsage
+from .category_service import CategoryService
+
+
+class UsageService:
+    """
+    Per-user storage totals, kept in user_usage and updated in the caller's
+    transaction alongside the documents they count (nothing here commits).
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _totals(self, owner_id: str) -> Dict[str, int]:
+        row = (await self.db.execute(
+            select(UserUsage.total_bytes, UserUsage.document_count)
+            .where(UserUsage.user_id == owner_id)
+        )).first()
+        return {
+            "total_bytes": row.total_bytes if row else 0,
+            "document_count": row.document_count if row else 0
+        }
+
+    async def check_quota(self, owner_id: str, additional_bytes: int) -> None:
+        """
+        Refuse an upload that would take the user over STORAGE_QUOTA_BYTES
+
+        Called with the declared or measured size before any of the upload is
+        read. Concurrent uploads may each pass the check, so the quota can be
+        overshot by at most one in-flight upload per request.
+
+        Raises:
+            StorageQuotaExceeded: If the upload does not fit
+        """
+        quota = settings.STORAGE_QUOTA_BYTES
+        if not quota or additional_bytes <= 0:
+            return
+        if (await self._totals(owner_id))["total_bytes"] + additional_bytes > quota:
+            raise StorageQuotaExceeded(quota)
+
+    async def adjust(self, owner_id: str, bytes_delta: int, documents_delta: int) -> None:
+        """Add to the user's totals with a single upsert"""
+        if not bytes_delta and not documents_delta:
+            return
+        table = UserUsage.__table__
+        now = datetime.utcnow()
+        stmt = dialect_insert(self.db, table).values(
+            user_id=owner_id,
+            total_bytes=max(bytes_delta, 0),
+            document_count=max(documents_delta, 0),
+            updated_at=now
+        )
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={
+                "total_bytes": table.c.total_bytes + bytes_delta,
+                "document_count": table.c.document_count + documents_delta,
+                "updated_at": now
+            }
+        ))
+
+    async def get_usage(self, owner_id: str) -> Dict:
+        """Totals by primary key plus the per-category split, without scanning documents"""
+        quota = settings.STORAGE_QUOTA_BYTES
+        return {
+            **await self._totals(owner_id),
+            "quota_bytes": quota or None,
+            "categories": await CategoryService(self.db).list_categories(owner_id)
+        }
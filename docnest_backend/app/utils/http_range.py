@@ -0,0 +1,65 @@
+# app/utils/http_range.py
+import re
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range_header(range_header: Optional[str]) -> Optional[str]:
+    """
+    Validate a Range request header and normalise it for S3's ranged GET.
+
+    Only a single byte range is supported. Anything else (multiple ranges,
+    other units, malformed values) returns None, in which case the whole
+    object is sent with 200 as RFC 9110 allows.
+
+    Args:
+        range_header: Raw value of the Range header
+
+    Returns:
+        Optional[str]: e.g. "bytes=0-1023", "bytes=500-" or "bytes=-500"
+    """
+    if not range_header:
+        return None
+
+    match = _RANGE_RE.match(range_header.strip().replace(' ', ''))
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if start and end and int(end) < int(start):
+        return None
+    if not start and int(end) == 0:
+        return None
+
+    return f"bytes={start}-{end}"
+
+
+def resolve_range(byte_range: str, size: int) -> Tuple[int, int]:
+    """
+    Turn a normalised "bytes=..." value into inclusive offsets within `size`.
+
+    Raises:
+        HTTPException: 416 if the range does not overlap the object
+    """
+    start, end = byte_range[len('bytes='):].split('-')
+
+    if not start:
+        # Suffix range: the last N bytes
+        first, last = max(size - int(end), 0), size - 1
+    else:
+        first = int(start)
+        last = min(int(end), size - 1) if end else size - 1
+
+    if size == 0 or first >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={'Content-Range': f"bytes */{size}"}
+        )
+
+    return first, last
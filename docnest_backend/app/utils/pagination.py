@@ -0,0 +1,95 @@
+# app/utils/pagination.py
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+
+# Response header carrying the cursor of the next page; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_size(limit: Optional[int] = Query(None, ge=1)) -> int:
+    """?limit= dependency: PAGE_SIZE_DEFAULT when omitted, capped at PAGE_SIZE_MAX"""
+    return min(limit or settings.PAGE_SIZE_DEFAULT, settings.PAGE_SIZE_MAX)
+
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """Opaque cursor pointing just past the row with this (created_at, id)"""
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Position encoded by encode_cursor
+
+    Raises:
+        HTTPException: 400 if the cursor was not issued by encode_cursor
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_query(query: Select, model: Any, cursor: Optional[str]) -> Select:
+    """
+    Order a query newest first on (created_at, id) and start it after a cursor.
+
+    The position is compared as created_at <= c AND (created_at < c OR id < i)
+    rather than as a row value, so a plain index on (..., created_at) still
+    bounds the scan; id only breaks ties between equal timestamps.
+    """
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        query = query.where(
+            and_(
+                model.created_at <= created_at,
+                or_(model.created_at < created_at, model.id < id)
+            )
+        )
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    model: Any,
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of a query on a model
+
+    Args:
+        db: Database session
+        query: Filtered select of the model, or of some of its columns
+            including created_at and id, without ordering or limit
+        model: Mapped class with created_at and id columns
+        cursor: Cursor returned with the previous page, None for the first
+        limit: Page size
+
+    Returns:
+        Tuple[List[Any], Optional[str]]: The model instances (or Rows when
+        columns were selected) and the next page's cursor
+    """
+    # One extra row tells whether another page follows
+    result = await db.execute(keyset_query(query, model, cursor).limit(limit + 1))
+    selects_model = [column["type"] for column in query.column_descriptions] == [model]
+    rows = list(result.scalars().all() if selects_model else result.all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
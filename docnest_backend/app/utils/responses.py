@@ -0,0 +1,34 @@
+# app/utils/responses.py
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def list_response(
+    adapter: TypeAdapter,
+    items: Iterable[Any],
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serialize a list of ORM objects through a prebuilt TypeAdapter.
+
+    Returning the objects and letting FastAPI apply response_model validates
+    them, converts the models to a jsonable dict tree and then encodes that
+    tree again. Here pydantic-core reads the attributes and writes the JSON
+    bytes in one pass each. Routes keep response_model for the OpenAPI schema.
+
+    Args:
+        adapter: TypeAdapter of List[<response schema>] with from_attributes
+        items: ORM objects or Rows to validate
+        headers: Extra response headers
+
+    Returns:
+        Response: application/json body
+    """
+    validated = adapter.validate_python(items, from_attributes=True)
+    return Response(
+        content=adapter.dump_json(validated),
+        media_type="application/json",
+        headers=headers
+    )
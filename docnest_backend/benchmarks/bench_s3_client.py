@@ -0,0 +1,56 @@
+# benchmarks/bench_s3_client.py
+"""
+Per-request S3 client overhead: a fresh boto3.client() per request (the old
+DocumentService / S3Service behaviour) versus the shared client registry.
+
+No network access is needed, client construction is pure CPU.
+
+    python -m benchmarks.bench_s3_client [iterations]
+"""
+import sys
+import time
+
+import boto3
+
+from app.core.config import settings
+from app.core.storage_client import get_s3_client, reset_storage_clients
+
+
+def per_request_client():
+    return boto3.client(
+        's3',
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_REGION
+    )
+
+
+def shared_client():
+    return get_s3_client()
+
+
+def bench(fn, iterations: int) -> float:
+    """Return mean microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(iterations: int = 200) -> None:
+    reset_storage_clients()
+    # Warm imports / botocore data loaders so both sides are measured hot
+    per_request_client()
+    shared_client()
+
+    before = bench(per_request_client, iterations)
+    after = bench(shared_client, iterations)
+
+    print(f"iterations:              {iterations}")
+    print(f"boto3.client per request: {before:10.1f} us/request")
+    print(f"shared client registry:   {after:10.1f} us/request")
+    print(f"speedup:                  {before / after:10.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,104 @@
+# benchmarks/bench_serialization.py
+"""
+List response serialization: FastAPI's default path (validate each object
+against the response model, jsonable_encoder, stdlib json) versus the
+prebuilt TypeAdapters in app/schemas and app/utils/responses.py.
+
+No database is needed, the ORM objects are built in memory.
+
+    python -m benchmarks.bench_serialization [rows] [repeats]
+"""
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+
+from app.models.analytics_event import AnalyticsEvent
+from app.models.document import Document
+from app.schemas.analytics import AnalyticsEventListAdapter, AnalyticsEventResponse
+from app.schemas.document import DocumentListAdapter, DocumentResponse, SLIM_LIST_FIELDS
+from app.utils.responses import list_response
+
+
+def make_documents(rows: int) -> List[Document]:
+    now = datetime.utcnow()
+    return [
+        Document(
+            id=f"00000000-0000-0000-0000-{i:012}", name=f"Passport scan {i}",
+            description="Scanned copy of the passport, front and back pages. " * 3,
+            file_path=f"documents/blobs/ab/{i:064}/passport.pdf", file_size=245_760 + i,
+            file_type="application/pdf", category="government", version=1, is_shared=False,
+            owner_id="user-1", created_at=now - timedelta(minutes=i), modified_at=now
+        )
+        for i in range(rows)
+    ]
+
+
+def make_events(rows: int) -> List[AnalyticsEvent]:
+    now = datetime.utcnow()
+    return [
+        AnalyticsEvent(
+            id=f"00000000-0000-0000-0000-{i:012}", user_id="user-1", event_type="api_request",
+            event_category="performance", session_id=None,
+            properties={"path": "/api/v1/documents/", "method": "GET", "status_code": 200},
+            device_info={"user_agent": "Dart/3.2 (dart:io)", "ip": "10.0.0.1"},
+            duration=12 + i % 50, created_at=now - timedelta(seconds=i)
+        )
+        for i in range(rows)
+    ]
+
+
+def fastapi_default(schema: Any) -> Callable[[List[Any]], bytes]:
+    def serialize(items: List[Any]) -> bytes:
+        validated = [schema.model_validate(item) for item in items]
+        return json.dumps(jsonable_encoder(validated)).encode()
+    return serialize
+
+
+def type_adapter(adapter: Any) -> Callable[[List[Any]], bytes]:
+    def serialize(items: List[Any]) -> bytes:
+        return list_response(adapter, items).body
+    return serialize
+
+
+def slim_rows(items: List[Document]) -> bytes:
+    rows = [{name: getattr(item, name) for name in SLIM_LIST_FIELDS} for item in items]
+    return ORJSONResponse(rows).body
+
+
+def bench(fn: Callable[[List[Any]], bytes], items: List[Any], repeats: int) -> float:
+    """Return the best milliseconds per serialization of `items`"""
+    fn(items)  # warm up
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(items)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(rows: int = 10_000, repeats: int = 5) -> None:
+    documents = make_documents(rows)
+    events = make_events(rows)
+
+    results = [
+        ("documents, FastAPI default", bench(fastapi_default(DocumentResponse), documents, repeats)),
+        ("documents, TypeAdapter", bench(type_adapter(DocumentListAdapter), documents, repeats)),
+        ("documents, slim rows + orjson", bench(slim_rows, documents, repeats)),
+        ("events, FastAPI default", bench(fastapi_default(AnalyticsEventResponse), events, repeats)),
+        ("events, TypeAdapter", bench(type_adapter(AnalyticsEventListAdapter), events, repeats)),
+    ]
+
+    print(f"rows:                          {rows}")
+    for name, ms in results:
+        print(f"{name + ':':31}{ms:9.1f} ms")
+    print(f"documents speedup:             {results[0][1] / results[1][1]:9.1f}x")
+    print(f"events speedup:                {results[3][1] / results[4][1]:9.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
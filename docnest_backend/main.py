@@ -1,17 +1,27 @@
 from fastapi import FastAPI, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy.orm import Session
 import time
 import logging
 from app.api.v1.router import api_router
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.db.session import SessionLocal, async_engine
 from app.core.logger import setup_logging
-# from app.core.analytics_middleware import AnalyticsMiddleware
+from app.core.analytics_middleware import AnalyticsMiddleware, flush_request_metrics
 # In main.py, add:
 from app.api.v1.auth_router import auth_router
 from app.api.v1.analytics_router import analytics_router
+from app.api.v1.metrics_router import metrics_router
+from app.api.v1.storage_router import storage_router
+from app.core.storage_executor import shutdown_storage_executor
+from app.services.extraction_pipeline import get_extraction_pipeline
+from app.services.analytics_writer import get_analytics_writer
+from app.jobs.reconcile_storage import run_scheduled_reconcile
+from app.jobs.rollup_analytics import run_scheduled_rollup
+from app.jobs.maintain_partitions import run_scheduled_partition_maintenance
+from app.jobs.scheduler import cancel_scheduled, schedule_periodic
 
 
 
@@ -21,7 +31,10 @@ logger = setup_logging()
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="DocNest API Documentation"
+    description="DocNest API Documentation",
+    # orjson encodes the jsonable output of every route; list routes go
+    # further and dump straight from TypeAdapters (app/utils/responses.py)
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -31,6 +44,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Request tracking middleware
@@ -76,8 +90,64 @@ app.include_router(
     prefix=f"{settings.API_V1_STR}/analytics",
     tags=["Analytics and logging"])
 
+app.include_router(
+    storage_router,
+    prefix=f"{settings.API_V1_STR}/storage",
+    tags=["storage"]
+)
+
+app.include_router(
+    metrics_router,
+    prefix=f"{settings.API_V1_STR}/metrics",
+    tags=["metrics"]
+)
+
+if settings.REQUEST_ANALYTICS_ENABLED:
+    app.add_middleware(AnalyticsMiddleware)
+
+@app.on_event("startup")
+async def start_jobs():
+    get_analytics_writer().start()
+    if settings.REQUEST_ANALYTICS_ENABLED:
+        schedule_periodic(
+            "flush_request_metrics",
+            settings.REQUEST_ANALYTICS_FLUSH_SECONDS,
+            flush_request_metrics
+        )
+    if settings.ANALYTICS_ROLLUP_INTERVAL_MINUTES > 0:
+        schedule_periodic(
+            "rollup_analytics",
+            settings.ANALYTICS_ROLLUP_INTERVAL_MINUTES * 60,
+            run_scheduled_rollup,
+            exclusive=True
+        )
+    if settings.PARTITION_MAINTENANCE_INTERVAL_HOURS > 0:
+        schedule_periodic(
+            "maintain_partitions",
+            settings.PARTITION_MAINTENANCE_INTERVAL_HOURS * 3600,
+            run_scheduled_partition_maintenance,
+            exclusive=True
+        )
+    if settings.ORPHAN_RECONCILE_INTERVAL_HOURS > 0:
+        schedule_periodic(
+            "reconcile_storage",
+            settings.ORPHAN_RECONCILE_INTERVAL_HOURS * 3600,
+            run_scheduled_reconcile,
+            exclusive=True
+        )
+    if settings.EXTRACTION_WORKERS > 0:
+        get_extraction_pipeline().start()
 
-# app.add_middleware(AnalyticsMiddleware)
+@app.on_event("shutdown")
+async def shutdown_storage():
+    await cancel_scheduled()
+    await get_extraction_pipeline().stop()
+    # Drain buffered analytics before the engine goes away
+    await get_analytics_writer().stop()
+    if settings.REQUEST_ANALYTICS_ENABLED:
+        await flush_request_metrics()
+    shutdown_storage_executor()
+    await async_engine.dispose()
 
 # Health check endpoint
 @app.get("/health")
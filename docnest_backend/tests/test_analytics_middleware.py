@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.analytics_middleware import AnalyticsMiddleware, RequestStats, UNMATCHED_ROUTE, parse_sample_rates
+from app.models.request_metric import RequestMetric
+
+
+def _client(stats: RequestStats, **options) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        if item_id == "missing":
+            raise HTTPException(status_code=404, detail="Not found")
+        return {"id": item_id}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    app.add_middleware(AnalyticsMiddleware, stats=stats, **options)
+    return TestClient(app)
+
+
+def _by_route(stats: RequestStats):
+    return {
+        (method, route, status_class): (weight, sampled)
+        for (_, method, route, status_class), (weight, sampled, _, _) in stats.drain().items()
+    }
+
+
+def test_requests_are_grouped_by_route_template_and_status_class():
+    stats = RequestStats()
+    client = _client(stats, sample_rate=1.0, route_sample_rates={"/health": 0.0})
+    for item_id in ("a", "b", "c", "missing"):
+        client.get(f"/items/{item_id}")
+    client.get("/health")
+    client.get("/nowhere")
+
+    assert _by_route(stats) == {
+        ("GET", "/items/{item_id}", "2xx"): (3, 3),
+        ("GET", "/items/{item_id}", "4xx"): (1, 1),
+        ("GET", UNMATCHED_ROUTE, "4xx"): (1, 1),
+    }
+
+
+def test_sampled_requests_count_for_the_ones_skipped():
+    stats = RequestStats()
+    draws = iter([0.1, 0.9, 0.9, 0.9, 0.2, 0.9, 0.9, 0.9])
+    client = _client(stats, sample_rate=0.25, route_sample_rates={}, rng=lambda: next(draws))
+    for _ in range(8):
+        client.get("/items/a")
+
+    assert _by_route(stats) == {("GET", "/items/{item_id}", "2xx"): (8.0, 2)}
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates(" /health=0, /items/{item_id}=0.5,/x=7 ,") == {
+        "/health": 0.0, "/items/{item_id}": 0.5, "/x": 1.0
+    }
+
+
+def test_flush_adds_to_existing_hourly_rows():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(RequestMetric.__table__.create)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                stats = RequestStats()
+                stats.record("GET", "/items/{item_id}", 200, 10.0)
+                stats.record("GET", "/items/{item_id}", 200, 30.0)
+                assert await stats.flush(db) == 1
+
+                stats.record("GET", "/items/{item_id}", 204, 50.0, weight=4)
+                stats.record("POST", "/items", 500, 5.0)
+                assert await stats.flush(db) == 2
+                assert await stats.flush(db) == 0
+
+                rows = (await db.execute(select(RequestMetric).order_by(RequestMetric.method))).scalars().all()
+                got = rows[0]
+                assert (got.request_count, got.sampled_count, got.duration_ms_sum, got.duration_ms_max) == (
+                    6, 3, 90.0, 50.0
+                )
+                assert got.bucket_start == datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+                assert (rows[1].method, rows[1].status_class) == ("POST", "5xx")
+        finally:
+            await engine.dispose()
+    asyncio.run(run())
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.activity_log import ActivityLog
+from app.models.analytics_event import AnalyticsEvent
+from app.models.analytics_rollup import (
+    DailyActiveUser,
+    EventCountDaily,
+    EventCountHourly,
+    RequestMetricDaily,
+    RollupState
+)
+from app.models.request_metric import RequestMetric
+from app.services.analytics_rollups import AnalyticsRollupService
+
+NOW = datetime(2026, 10, 17, 12, 30)
+
+
+def _with_db(test):
+    """Run a test body against in-memory SQLite holding the raw and rollup tables"""
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            for model in (
+                ActivityLog, AnalyticsEvent, RequestMetric,
+                EventCountHourly, EventCountDaily, RequestMetricDaily, DailyActiveUser, RollupState
+            ):
+                await conn.run_sync(model.__table__.create)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                await test(db)
+        finally:
+            await engine.dispose()
+    asyncio.run(run())
+
+
+async def _seed(db, *, since: datetime):
+    """Events, logins and request metrics every 5 hours from `since` to NOW"""
+    at = since
+    while at < NOW:
+        db.add(AnalyticsEvent(event_type="document_viewed", event_category="document", created_at=at))
+        db.add(AnalyticsEvent(event_type="login", created_at=at))
+        for user_id in ("user-1", f"user-{at.hour}"):
+            db.add(ActivityLog(user_id=user_id, action="auth.login", resource_type="user", created_at=at))
+        db.add(RequestMetric(
+            bucket_start=at.replace(minute=0), method="GET", route="/documents", status_class="2xx",
+            request_count=4, sampled_count=2, duration_ms_sum=10.0 * at.hour, duration_ms_max=10.0
+        ))
+        at += timedelta(hours=5, minutes=7)
+    await db.commit()
+
+
+def test_summary_from_rollups_matches_raw_tables():
+    async def test(db):
+        await _seed(db, since=NOW - timedelta(days=9))
+        service = AnalyticsRollupService(db)
+        raw = await service.summary(7, now=NOW)
+
+        assert await service.roll_up(now=NOW) > 0
+        assert await service.high_water_mark() == datetime(2026, 10, 17, 12)
+        assert await service.roll_up(now=NOW) == 0
+        assert await service.summary(7, now=NOW) == raw
+
+        # Activity after the high-water mark is read from the raw tables
+        db.add(AnalyticsEvent(event_type="login", created_at=NOW - timedelta(minutes=5)))
+        db.add(ActivityLog(user_id="user-1", action="auth.login", resource_type="user", created_at=NOW))
+        db.add(ActivityLog(user_id="user-new", action="auth.login", resource_type="user", created_at=NOW))
+        await db.commit()
+        summary = await service.summary(7, now=NOW + timedelta(minutes=1))
+        assert summary["event_counts"]["login"] == raw["event_counts"]["login"] + 1
+        assert summary["event_category_counts"] == raw["event_category_counts"]
+        assert summary["daily_active_users"][-1]["count"] == raw["daily_active_users"][-1]["count"] + 1
+
+    _with_db(test)
+
+
+def test_roll_up_resumes_from_high_water_mark_in_batches():
+    async def test(db):
+        await _seed(db, since=NOW - timedelta(days=3))
+        service = AnalyticsRollupService(db)
+
+        assert await service.roll_up(now=NOW, max_hours=24) == 24
+        first = await service.high_water_mark()
+        while await service.roll_up(now=NOW, max_hours=24):
+            pass
+        assert first < await service.high_water_mark() == datetime(2026, 10, 17, 12)
+
+        hourly = (await db.execute(
+            select(EventCountHourly.event_type, EventCountHourly.event_category, EventCountHourly.count)
+            .where(EventCountHourly.bucket_start == (NOW - timedelta(days=3)).replace(minute=0))
+        )).all()
+        assert sorted(hourly) == [("document_viewed", "document", 1), ("login", "", 1)]
+        # Days split across batches are recomputed whole
+        daily = await db.scalar(
+            select(RequestMetricDaily.request_count).where(RequestMetricDaily.bucket_start == datetime(2026, 10, 15))
+        )
+        assert daily == 4 * await db.scalar(
+            select(EventCountDaily.count).where(
+                EventCountDaily.bucket_start == datetime(2026, 10, 15), EventCountDaily.event_type == "login"
+            )
+        )
+
+    _with_db(test)
+
+
+def test_summary_without_rollups_runs_a_fixed_number_of_queries():
+    async def test(db):
+        await _seed(db, since=NOW - timedelta(days=30))
+        statements = []
+        event.listen(db.bind.sync_engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+        summary = await AnalyticsRollupService(db).summary(365, now=NOW)
+
+        # Not one query per day of the window
+        assert len(statements) < 15
+        assert len(summary["daily_active_users"]) == 31
+        assert all(day["count"] >= 2 for day in summary["daily_active_users"])
+
+    _with_db(test)
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import tempfile
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.analytics_event import AnalyticsEvent
+from app.services.analytics_writer import AnalyticsWriter
+
+
+def _with_writer(test, **options):
+    """Run a test body with a writer over a fresh SQLite database"""
+    async def run(directory):
+        # A file, not :memory:, so the flusher and the test use separate connections
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'analytics.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(AnalyticsEvent.__table__.create)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        writer = AnalyticsWriter(
+            options.get("wrap_sessions", lambda factory: factory)(sessions),
+            max_buffer=options.get("max_buffer", 100),
+            batch_size=options.get("batch_size", 10),
+            flush_interval=options.get("flush_interval", 60)
+        )
+        try:
+            await test(writer, sessions)
+        finally:
+            await writer.stop()
+            await engine.dispose()
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(directory))
+
+
+def _row(event_type="document_viewed"):
+    return {
+        "id": str(uuid4()),
+        "user_id": None,
+        "event_type": event_type,
+        "event_category": "document",
+        "properties": {},
+        "session_id": None,
+        "device_info": {},
+        "duration": None,
+        "created_at": datetime.utcnow()
+    }
+
+
+async def _stored(sessions) -> int:
+    async with sessions() as db:
+        return await db.scalar(select(func.count()).select_from(AnalyticsEvent))
+
+
+def test_not_running_writer_refuses_events():
+    async def test(writer, sessions):
+        assert not writer.submit(_row())
+        assert writer.stats()["accepted"] == 0
+
+    _with_writer(test)
+
+
+def test_full_batch_is_flushed_without_waiting_for_the_interval():
+    async def test(writer, sessions):
+        writer.start()
+        for _ in range(25):
+            assert writer.submit(_row())
+
+        # The flush interval is a minute; a full batch wakes the flusher, which
+        # then writes everything buffered
+        for _ in range(500):
+            if await _stored(sessions) == 25:
+                break
+            await asyncio.sleep(0.01)
+        assert await _stored(sessions) == 25
+        stats = writer.stats()
+        assert (stats["buffered"], stats["written"], stats["batches"]) == (0, 25, 3)
+
+    _with_writer(test)
+
+
+def test_events_beyond_the_buffer_are_dropped_and_counted():
+    async def test(writer, sessions):
+        writer.start()
+        for _ in range(8):
+            writer.submit(_row())
+
+        stats = writer.stats()
+        assert (stats["accepted"], stats["dropped"], stats["buffered"]) == (5, 3, 5)
+
+        await writer.stop()
+        assert await _stored(sessions) == 5
+
+    _with_writer(test, max_buffer=5, batch_size=100)
+
+
+def test_failed_batch_is_dropped_without_blocking_later_ones():
+    async def test(writer, sessions):
+        writer.start()
+        row = _row()
+        writer.submit(row)
+        writer.submit(dict(row))  # Same primary key: the whole batch fails
+        assert await writer.flush() == 0
+
+        writer.submit(_row())
+        assert await writer.flush() == 1
+        assert writer.stats()["failed"] == 2
+        assert await _stored(sessions) == 1
+
+    _with_writer(test)
+
+
+def test_stop_waits_for_a_flush_in_progress():
+    gate = asyncio.Event()
+    entered = asyncio.Event()
+
+    def wrap_sessions(sessions):
+        class Blocked:
+            async def __aenter__(self):
+                entered.set()
+                await gate.wait()
+                self.db = sessions()
+                return await self.db.__aenter__()
+
+            async def __aexit__(self, *exc):
+                return await self.db.__aexit__(*exc)
+
+        return Blocked
+
+    async def test(writer, sessions):
+        writer.start()
+        for _ in range(3):
+            writer.submit(_row())
+        await asyncio.wait_for(entered.wait(), timeout=5)
+
+        stopping = asyncio.create_task(writer.stop())
+        await asyncio.sleep(0.05)
+        assert not stopping.done()
+        gate.set()
+        await stopping
+        assert await _stored(sessions) == 3
+        assert writer.stats()["failed"] == 0
+
+    _with_writer(test, batch_size=10, flush_interval=0.01, wrap_sessions=wrap_sessions)
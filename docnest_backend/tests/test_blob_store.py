@@ -0,0 +1,78 @@
+import asyncio
+import io
+
+from fastapi import UploadFile
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.blob import Blob
+from app.services.blob_store import BlobStore
+from app.services.storage.memory import MemoryStorageBackend
+
+
+def _with_db(test):
+    """Run an async test body against a fresh in-memory SQLite session"""
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Blob.__table__.create)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                await test(db)
+        finally:
+            await engine.dispose()
+    asyncio.run(run())
+
+
+def _upload(content: bytes, filename: str = "id-card.pdf") -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+def test_identical_uploads_share_one_object():
+    async def test(db):
+        storage = MemoryStorageBackend()
+        store = BlobStore(db, storage)
+
+        first, first_key = await store.acquire(_upload(b"%PDF-1.4 same scan"))
+        second, second_key = await store.acquire(_upload(b"%PDF-1.4 same scan", "copy.pdf"))
+        await db.commit()
+
+        assert first_key == first.storage_key
+        assert second_key is None
+        assert second.sha256 == first.sha256
+        assert second.ref_count == 2
+        assert list(storage.objects) == [first.storage_key]
+        assert first.storage_key.startswith(f"documents/blobs/{first.sha256[:2]}/{first.sha256}/")
+
+    _with_db(test)
+
+
+def test_object_is_released_with_last_reference():
+    async def test(db):
+        store = BlobStore(db, MemoryStorageBackend())
+        blob, _ = await store.acquire(_upload(b"%PDF-1.4 certificate"))
+        await store.acquire(_upload(b"%PDF-1.4 certificate"))
+        await db.commit()
+
+        assert await store.release(blob.sha256) is None
+        assert await store.release(blob.sha256) == blob.storage_key
+        await db.commit()
+
+        assert await db.scalar(select(func.count()).select_from(Blob)) == 0
+
+    _with_db(test)
+
+
+def test_different_content_gets_separate_blobs():
+    async def test(db):
+        storage = MemoryStorageBackend()
+        store = BlobStore(db, storage)
+
+        a, _ = await store.acquire(_upload(b"%PDF-1.4 first"))
+        b, _ = await store.acquire(_upload(b"%PDF-1.4 second"))
+        await db.commit()
+
+        assert a.sha256 != b.sha256
+        assert len(storage.objects) == 2
+
+    _with_db(test)
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.exceptions import CategoryInUse, CategoryNotFound, CategoryValidationError
+from app.models.blob import Blob
+from app.models.category import Category
+from app.models.document import Document
+from app.models.user import User
+from app.services.category_service import CategoryService
+
+
+def _with_db(test):
+    """Run an async test body against a fresh in-memory SQLite session"""
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            for model in (Blob, Document, Category):
+                await conn.run_sync(model.__table__.create)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                await test(db)
+        finally:
+            await engine.dispose()
+    asyncio.run(run())
+
+
+def _user() -> User:
+    # Never added to the session: users.custom_categories is a Postgres ARRAY
+    return User(id="user-1", email="user@example.com", custom_categories=[])
+
+
+async def _counts(db):
+    rows = await db.execute(select(Category.name, Category.document_count).order_by(Category.name))
+    return dict(rows.all())
+
+
+def test_counts_follow_adjustments():
+    async def test(db):
+        user = _user()
+        categories = CategoryService(db)
+
+        await categories.adjust_count(user.id, "medical", 1, user=user)
+        await categories.adjust_count(user.id, "medical", 1, user=user)
+        await categories.adjust_count(user.id, "receipts", 1, user=user)
+        await categories.adjust_count(user.id, "medical", -1)
+        await db.commit()
+
+        assert await _counts(db) == {"medical": 1, "receipts": 1}
+        assert user.custom_categories == ["receipts"]
+
+        listed = await categories.list_categories(user.id)
+        assert [c["name"] for c in listed] == ["government", "medical", "educational", "other", "receipts"]
+        assert listed[1] == {"name": "medical", "document_count": 1, "total_bytes": 0, "is_default": True}
+        assert listed[4] == {"name": "receipts", "document_count": 1, "total_bytes": 0, "is_default": False}
+
+    _with_db(test)
+
+
+def test_rename_moves_documents_in_bulk():
+    async def test(db):
+        user = _user()
+        categories = CategoryService(db)
+        db.add_all([
+            Document(name=f"bill-{i}", category="bills", owner_id=user.id) for i in range(3)
+        ] + [Document(name="other user's bill", category="bills", owner_id="user-2")])
+        await categories.adjust_count(user.id, "bills", 3, user=user)
+        await db.commit()
+
+        assert await categories.rename_category(user, "bills", "utilities") == 3
+        await db.commit()
+
+        moved = await db.execute(select(Document.owner_id, Document.category).order_by(Document.owner_id))
+        assert sorted(moved.all()) == [
+            ("user-1", "utilities"), ("user-1", "utilities"), ("user-1", "utilities"), ("user-2", "bills")
+        ]
+        assert await _counts(db) == {"utilities": 3}
+        assert user.custom_categories == ["utilities"]
+
+        with pytest.raises(CategoryNotFound):
+            await categories.rename_category(user, "bills", "invoices")
+        with pytest.raises(CategoryValidationError):
+            await categories.rename_category(user, "utilities", "medical")
+
+    _with_db(test)
+
+
+def test_custom_categories_with_documents_cannot_be_dropped():
+    async def test(db):
+        user = _user()
+        categories = CategoryService(db)
+        assert await categories.add_category(user, "travel")
+        assert not await categories.add_category(user, "travel")
+        await categories.adjust_count(user.id, "bills", 1, user=user)
+
+        with pytest.raises(CategoryInUse):
+            await categories.set_custom_categories(user, ["travel"])
+
+        await categories.set_custom_categories(user, ["bills", "visas"])
+        await db.commit()
+
+        assert await _counts(db) == {"bills": 1, "visas": 0}
+        assert user.custom_categories == ["bills", "visas"]
+
+    _with_db(test)
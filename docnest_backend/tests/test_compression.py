@@ -0,0 +1,91 @@
+import asyncio
+import gzip
+import io
+import os
+
+import pytest
+from fastapi import UploadFile
+
+from app.core.config import settings
+from app.services.storage.compression import accepts_encoding, should_compress
+from app.services.storage.memory import MemoryStorageBackend
+from app.services.storage.response import object_response
+
+TEXT_PDF = b"%PDF-1.4 " + b"BT /F1 12 Tf (statement line) Tj ET\n" * 2000
+TEXT = b"2026-10-17,statement line,100.00\n" * 2000
+
+
+@pytest.fixture
+def compression(monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_COMPRESSION", True)
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _body(response):
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+def test_accept_encoding_parsing():
+    assert accepts_encoding("gzip, deflate, br", "gzip")
+    assert accepts_encoding("br;q=1.0, gzip;q=0.5", "gzip")
+    assert accepts_encoding("*", "gzip")
+    assert not accepts_encoding("gzip;q=0", "gzip")
+    assert not accepts_encoding("identity", "gzip")
+    assert not accepts_encoding(None, "gzip")
+
+
+def test_should_compress_uses_sample_ratio():
+    assert should_compress("text/plain", TEXT)
+    assert not should_compress("text/plain", os.urandom(64 * 1024))
+    assert not should_compress("image/png", TEXT)
+
+
+def test_range_served_types_are_never_compressed():
+    assert not should_compress("application/pdf", TEXT_PDF)
+    assert not should_compress("video/mp4", TEXT)
+    assert not should_compress("audio/mpeg", TEXT)
+
+
+def test_stored_raw_unless_enabled():
+    backend = MemoryStorageBackend()
+    stored = _run(backend.upload(UploadFile(file=io.BytesIO(TEXT), filename="a.txt"), "documents/a.txt"))
+    assert stored.content_encoding is None
+    assert backend.objects["documents/a.txt"][0] == TEXT
+
+
+def test_gzip_passthrough_and_decoding(compression):
+    backend = MemoryStorageBackend()
+    stored = _run(backend.upload(UploadFile(file=io.BytesIO(TEXT), filename="a.txt"), "documents/a.txt"))
+    assert stored.content_encoding == "gzip"
+    assert stored.size == len(TEXT)
+
+    response = object_response(_run(backend.open("documents/a.txt")), accept_encoding="gzip, br")
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(_run(_body(response))) == TEXT
+
+    response = object_response(_run(backend.open("documents/a.txt")), accept_encoding="identity")
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert _run(_body(response)) == TEXT
+
+
+def test_ranges_address_decoded_bytes(compression):
+    backend = MemoryStorageBackend()
+    _run(backend.upload(UploadFile(file=io.BytesIO(TEXT), filename="a.txt"), "documents/a.txt"))
+
+    stream = _run(backend.open("documents/a.txt", byte_range="bytes=100-199"))
+    response = object_response(stream, accept_encoding="gzip")
+    assert response.status_code == 206
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-range"] == f"bytes 100-199/{len(TEXT)}"
+    assert _run(_body(response)) == TEXT[100:200]
+
+
+def test_pdf_stored_raw_with_compression_enabled(compression):
+    backend = MemoryStorageBackend()
+    stored = _run(backend.upload(UploadFile(file=io.BytesIO(TEXT_PDF), filename="a.pdf"), "documents/a.pdf"))
+    assert stored.content_encoding is None
+    assert backend.objects["documents/a.pdf"][0] == TEXT_PDF
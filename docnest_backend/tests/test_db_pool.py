@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool, engine_options
+
+
+def test_pool_stats_count_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05
+    )
+
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+        stats = engine.pool.stats()
+        assert stats["checked_out"] == 1
+        assert stats["pool_size"] == 1
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = engine.pool.stats()
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["max_checkout_ms"] >= 50
+    engine.dispose()
+
+
+def test_engine_options_follow_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", False)
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+
+    options = engine_options(async_engine=True)
+    assert options["pool_size"] == 3
+    assert options["pool_pre_ping"] is False
+    assert options["connect_args"]["statement_cache_size"] == 0
+    name_func = options["connect_args"]["prepared_statement_name_func"]
+    assert name_func() != name_func()
+
+    # psycopg2 never prepares statements, the sync engine needs no special casing
+    assert "connect_args" not in engine_options()
@@ -0,0 +1,169 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.models.activity_log import ActivityLog
+from app.models.analytics_event import AnalyticsEvent
+from app.models.blob import Blob
+from app.models.category import Category
+from app.models.document import Document
+from app.models.text_extraction import TextExtraction
+from app.models.usage import UserUsage
+from app.models.user import User
+from app.schemas.document import DocumentCreate, UploadFinalize
+from app.services.document import DocumentService
+from app.services.storage import set_storage_backend
+from app.services.storage.memory import MemoryStorageBackend
+from app.services.storage.url_cache import get_presigned_url_cache
+
+PDF = b"%PDF-1.4\n" + b"0" * 1000
+UPLOAD_KEY = "documents/user-1/uploads/lease.pdf"
+
+
+def _with_service(test):
+    """Run a test body with a DocumentService over in-memory SQLite and storage, counting commits"""
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            for model in (Blob, Document, Category, UserUsage, TextExtraction, ActivityLog, AnalyticsEvent):
+                await conn.run_sync(model.__table__.create)
+        set_storage_backend(MemoryStorageBackend())
+        # Detached rather than added: users.custom_categories is a Postgres ARRAY
+        user = User(id="user-1", email="user@example.com", custom_categories=[])
+        make_transient_to_detached(user)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                commits = []
+                event.listen(db.sync_session, "after_commit", lambda session: commits.append(1))
+                await test(DocumentService(db, user=user), db, commits)
+        finally:
+            set_storage_backend(None)
+            await engine.dispose()
+    asyncio.run(run())
+
+
+async def _actions(db):
+    logged = (await db.execute(select(ActivityLog.action).order_by(ActivityLog.created_at))).scalars().all()
+    tracked = (await db.execute(select(AnalyticsEvent.event_type).order_by(AnalyticsEvent.created_at))).scalars().all()
+    return list(logged), list(tracked)
+
+
+def test_each_mutation_commits_once_with_its_logs():
+    async def test(service, db, commits):
+        document = await service.create_document(
+            "user-1",
+            DocumentCreate(name="Lease", category="other"),
+            UploadFile(file=io.BytesIO(PDF), filename="lease.pdf")
+        )
+        assert len(commits) == 1
+        assert (document.version, document.is_shared) == (1, False)
+        assert await _actions(db) == (["document.create"], ["document_created"])
+
+        await service.update_document(document.id, "user-1", {"name": "Lease 2026", "category": "Medical"})
+        assert len(commits) == 2
+        log = (await db.execute(select(ActivityLog).where(ActivityLog.action == "document.update"))).scalar_one()
+        assert log.details == {
+            "old_name": "Lease", "new_name": "Lease 2026", "old_category": "other", "new_category": "medical"
+        }
+
+        await service.delete_document(db, document.id, "user-1")
+        assert len(commits) == 3
+        assert await _actions(db) == (
+            ["document.create", "document.update", "document.delete"],
+            ["document_created", "document_updated", "document_deleted"]
+        )
+
+    _with_service(test)
+
+
+def test_failed_mutation_leaves_no_log_behind():
+    async def test(service, db, commits):
+        document = await service.create_document(
+            "user-1",
+            DocumentCreate(name="Lease", category="other"),
+            UploadFile(file=io.BytesIO(PDF), filename="lease.pdf")
+        )
+
+        with pytest.raises(HTTPException):
+            await service.update_document(
+                document.id,
+                "user-1",
+                {"name": "Lease 2026"},
+                file=UploadFile(file=io.BytesIO(b"MZ"), filename="lease.exe")
+            )
+
+        # Only the failure event, written on its own after the rollback
+        assert await _actions(db) == (["document.create"], ["document_created", "document_update_failed"])
+        assert await db.scalar(select(Document.name)) == "Lease"
+
+    _with_service(test)
+
+
+def test_finalize_upload_rejects_disallowed_sniffed_type():
+    async def test(service, db, commits):
+        # Declared and named as a PDF, but the bytes are an executable
+        service.storage.objects[UPLOAD_KEY] = (b"MZ\x90\x00" + b"\x00" * 1000, "application/pdf")
+
+        with pytest.raises(HTTPException) as error:
+            await service.finalize_upload("user-1", UploadFinalize(name="Lease", category="other", key=UPLOAD_KEY))
+
+        assert error.value.status_code == 400
+        assert UPLOAD_KEY not in service.storage.objects
+        assert await db.scalar(select(Document.id)) is None
+
+    _with_service(test)
+
+
+def test_concurrent_finalize_of_one_key_creates_one_document():
+    async def test(service, db, commits):
+        service.storage.objects[UPLOAD_KEY] = (PDF, "application/pdf")
+        head = service.storage.head
+
+        async def head_after_other_finalize(key):
+            # The other request passed the "already finalized" check too and commits first
+            db.add(Document(name="Other", category="other", file_path=key, owner_id="user-1"))
+            await db.commit()
+            return await head(key)
+
+        service.storage.head = head_after_other_finalize
+        with pytest.raises(HTTPException) as error:
+            await service.finalize_upload("user-1", UploadFinalize(name="Lease", category="other", key=UPLOAD_KEY))
+
+        assert (error.value.status_code, error.value.detail) == (400, "Upload already finalized")
+        # The object is the other document's file
+        assert UPLOAD_KEY in service.storage.objects
+        assert (await db.execute(select(Document.name))).scalars().all() == ["Other"]
+
+    _with_service(test)
+
+
+def test_legacy_url_rows_share_cache_and_delete_key():
+    async def test(service, db, commits):
+        cache = get_presigned_url_cache()
+        cache.clear()
+        key = "documents/user-1/lease.pdf"
+        service.storage.objects[key] = (PDF, "application/pdf")
+        document = Document(
+            name="Lease",
+            category="other",
+            file_path=f"https://bucket.s3.amazonaws.com/{key}",
+            file_size=len(PDF),
+            owner_id="user-1"
+        )
+        db.add(document)
+        await db.commit()
+
+        await service.generate_download_url(document.file_path, document.id)
+        assert cache.stats()["size"] == 1
+
+        await service.delete_document(db, document.id, "user-1")
+        # The URL signed for the key is dropped along with the object itself
+        assert cache.stats()["size"] == 0
+        assert key not in service.storage.objects
+
+    _with_service(test)
@@ -0,0 +1,27 @@
+import pytest
+
+from app.utils.http_range import parse_range_header
+
+
+@pytest.mark.parametrize("header,expected", [
+    ("bytes=0-1023", "bytes=0-1023"),
+    ("bytes=500-", "bytes=500-"),
+    ("bytes=-500", "bytes=-500"),
+    ("bytes = 10 - 20", "bytes=10-20"),
+])
+def test_single_ranges_are_passed_through(header, expected):
+    assert parse_range_header(header) == expected
+
+
+@pytest.mark.parametrize("header", [
+    None,
+    "",
+    "bytes=-",
+    "bytes=-0",
+    "bytes=20-10",
+    "bytes=0-10,20-30",
+    "items=0-10",
+    "bytes=abc-",
+])
+def test_unsupported_ranges_fall_back_to_full_body(header):
+    assert parse_range_header(header) is None
@@ -0,0 +1,31 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.metrics_router import metrics_router
+from app.core.config import settings
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(metrics_router, prefix="/metrics")
+    return TestClient(app)
+
+
+def test_metrics_are_hidden_without_a_configured_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    response = _client().get("/metrics/extraction", headers={"X-Metrics-Token": ""})
+    assert response.status_code == 404
+
+
+def test_metrics_require_the_operator_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "operator-secret")
+    client = _client()
+
+    assert client.get("/metrics/extraction").status_code == 403
+    assert client.get("/metrics/extraction", headers={"X-Metrics-Token": "wrong"}).status_code == 403
+    # A user's bearer token is not enough
+    assert client.get("/metrics/extraction", headers={"Authorization": "Bearer user"}).status_code == 403
+
+    response = client.get("/metrics/extraction", headers={"X-Metrics-Token": "operator-secret"})
+    assert response.status_code == 200
+    assert "queue_depth" in response.json()
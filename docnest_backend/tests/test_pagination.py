@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.blob import Blob
+from app.models.document import Document
+from app.utils.pagination import decode_cursor, encode_cursor, paginate
+
+NOW = datetime(2026, 10, 17, 12, 0)
+
+
+def _with_db(test):
+    """Run an async test body against a fresh in-memory SQLite session"""
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Blob.__table__.create)
+            await conn.run_sync(Document.__table__.create)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                return await test(db)
+        finally:
+            await engine.dispose()
+    return asyncio.run(run())
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(NOW, "3f1c")
+
+    assert decode_cursor(cursor) == (NOW, "3f1c")
+    assert "=" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", encode_cursor(NOW, "x")[:-4]])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+def test_pages_cover_every_document_once():
+    async def test(db):
+        # Pairs of documents share a timestamp, so pages split ties on id
+        db.add_all([
+            Document(id=f"doc-{i:02}", name=f"doc-{i}", category="other",
+                     owner_id="user-1", created_at=NOW - timedelta(minutes=i // 2))
+            for i in range(11)
+        ])
+        db.add(Document(id="other", name="other", category="other", owner_id="user-2", created_at=NOW))
+        await db.commit()
+
+        query = select(Document).where(Document.owner_id == "user-1")
+        pages, cursor = [], None
+        while True:
+            rows, cursor = await paginate(db, query, Document, cursor, 3)
+            pages.append([row.id for row in rows])
+            if cursor is None:
+                return pages
+
+    pages = _with_db(test)
+
+    assert [len(page) for page in pages] == [3, 3, 3, 2]
+    assert [id for page in pages for id in page] == [
+        "doc-01", "doc-00", "doc-03", "doc-02", "doc-05", "doc-04",
+        "doc-07", "doc-06", "doc-09", "doc-08", "doc-10"
+    ]
+
+
+def test_column_pages_return_rows():
+    async def test(db):
+        db.add_all([
+            Document(id=f"doc-{i}", name=f"doc-{i}", description="long text " * 100,
+                     category="other", owner_id="user-1", created_at=NOW - timedelta(minutes=i))
+            for i in range(3)
+        ])
+        await db.commit()
+        db.expunge_all()
+
+        query = select(Document.id, Document.created_at, Document.name)
+        first, cursor = await paginate(db, query, Document, None, 2)
+        second, last = await paginate(db, query, Document, cursor, 2)
+
+        assert [row._asdict() for row in first] == [
+            {"id": "doc-0", "created_at": NOW, "name": "doc-0"},
+            {"id": "doc-1", "created_at": NOW - timedelta(minutes=1), "name": "doc-1"},
+        ]
+        assert [row.name for row in second] == ["doc-2"]
+        assert last is None
+        # Plain rows: nothing entered the identity map
+        assert len(db.identity_map) == 0
+
+    _with_db(test)
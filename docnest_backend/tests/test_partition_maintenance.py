@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.jobs.maintain_partitions import add_months, maintain_partitions, partition_name, plan_partitions
+
+NOW = datetime(2026, 10, 17, 12, 30)
+
+
+def _months(*pairs):
+    return [datetime(year, month, 1) for year, month in pairs]
+
+
+def test_add_months_crosses_years():
+    assert add_months(datetime(2026, 11, 1), 3) == datetime(2027, 2, 1)
+    assert add_months(datetime(2026, 1, 1), -13) == datetime(2024, 12, 1)
+    assert partition_name("activity_logs", datetime(2027, 2, 1)) == "activity_logs_p2027_02"
+
+
+def test_plan_creates_missing_future_months():
+    create, expire = plan_partitions(_months((2026, 10), (2026, 11)), NOW, 3, 0, None)
+    assert create == _months((2026, 12), (2027, 1))
+    assert expire == []
+
+
+def test_plan_expires_only_rolled_up_months_past_retention():
+    existing = _months((2025, 8), (2025, 9), (2025, 10), (2026, 10))
+    rolled_up_until = datetime(2025, 9, 15)
+
+    _, expire = plan_partitions(existing, NOW, 0, 12, rolled_up_until)
+    assert expire == _months((2025, 8))
+
+    _, expire = plan_partitions(existing, NOW, 0, 12, datetime(2026, 10, 17))
+    assert expire == _months((2025, 8), (2025, 9))
+
+    # Not rolled up yet, or retention disabled: nothing goes
+    assert plan_partitions(existing, NOW, 0, 12, None)[1] == []
+    assert plan_partitions(existing, NOW, 0, 0, datetime(2026, 10, 17))[1] == []
+
+
+def test_maintenance_is_a_no_op_without_postgres():
+    engine = create_engine("sqlite://")
+    with Session(engine) as db:
+        assert maintain_partitions(db, now=NOW) == {}
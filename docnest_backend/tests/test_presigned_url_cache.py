@@ -0,0 +1,67 @@
+import asyncio
+
+from app.services.storage.url_cache import PresignedUrlCache
+
+
+class CountingStorage:
+    def __init__(self):
+        self.signed = 0
+
+    async def generate_presigned_url(self, key, expires_in=3600):
+        self.signed += 1
+        return f"https://example.test/{key}?sig={self.signed}"
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_reuses_url_within_bucket():
+    cache = PresignedUrlCache(max_size=8, min_remaining=600)
+    storage = CountingStorage()
+
+    first = _run(cache.get_url(storage, "documents/a.pdf"))
+    second = _run(cache.get_url(storage, "documents/a.pdf"))
+
+    assert first == second
+    assert storage.signed == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_resigns_when_validity_runs_low(monkeypatch):
+    cache = PresignedUrlCache(max_size=8, min_remaining=600)
+    storage = CountingStorage()
+    clock = [3000.0 * 100]
+    monkeypatch.setattr("app.services.storage.url_cache.time.time", lambda: clock[0])
+
+    first = _run(cache.get_url(storage, "documents/a.pdf"))
+    clock[0] += 3600 - 600 + 1  # next bucket, old URL has < 10 minutes left
+    assert _run(cache.get_url(storage, "documents/a.pdf")) != first
+    assert storage.signed == 2
+
+
+def test_short_lived_urls_are_not_cached():
+    cache = PresignedUrlCache(max_size=8, min_remaining=600)
+    storage = CountingStorage()
+
+    _run(cache.get_url(storage, "documents/a.pdf", expires_in=300))
+    _run(cache.get_url(storage, "documents/a.pdf", expires_in=300))
+    assert storage.signed == 2
+
+
+def test_invalidate_and_lru_eviction():
+    cache = PresignedUrlCache(max_size=2, min_remaining=600)
+    storage = CountingStorage()
+
+    _run(cache.get_url(storage, "a"))
+    _run(cache.get_url(storage, "b"))
+    cache.invalidate("a")
+    assert cache.stats()["size"] == 1
+    assert cache.stats()["invalidations"] == 1
+
+    _run(cache.get_url(storage, "c"))
+    _run(cache.get_url(storage, "d"))
+    assert cache.stats()["size"] == 2
+    _run(cache.get_url(storage, "b"))  # evicted, signs again
+    assert storage.signed == 5
@@ -0,0 +1,229 @@
+"""
+EXPLAIN the hot queries on Postgres and fail on sequential scans.
+
+Set TEST_DATABASE_URL to a Postgres database (postgresql://...) to run these;
+the tables are created and seeded in a throwaway query_plans schema. Without
+it the module is skipped: SQLite plans say nothing about production ones.
+
+The statements mirror the document list and analytics routes (paged with
+keyset_query), the analytics rollup job and the rollup reads behind
+/analytics/summary (app/services/analytics_rollups.py); when one of them
+changes shape, update it here so its plan keeps being checked.
+"""
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, distinct, exists, func, select, text
+
+from app.db.base import Base
+from app.models.activity_log import ActivityLog
+from app.models.analytics_event import AnalyticsEvent
+from app.models.analytics_rollup import DailyActiveUser, EventCountDaily, EventCountHourly, RequestMetricDaily
+from app.models.blob import Blob
+from app.models.document import Document
+from app.models.request_metric import RequestMetric
+from app.models.user import User
+from app.utils.pagination import encode_cursor, keyset_query
+
+DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+if not DATABASE_URL.startswith("postgresql"):
+    pytest.skip("TEST_DATABASE_URL does not point at Postgres", allow_module_level=True)
+
+SCHEMA = "query_plans"
+ROWS = 5000
+USERS = 50
+DAYS = 60
+NOW = datetime(2026, 10, 17, 12, 0)
+SINCE = NOW - timedelta(days=1)
+EVENT_TYPES = ["document_view", "search", "error"]
+ROUTES = ["/api/v1/documents/", "/api/v1/documents/{document_id}"]
+CURSOR = encode_cursor(NOW - timedelta(hours=2), "100")
+
+# summary(7) with a high-water mark an hour back: whole days from the daily
+# rollups, partial days from the hourly ones, the last hour from the raw tables
+HIGH_WATER_MARK = NOW - timedelta(hours=1)
+START = NOW - timedelta(days=7)
+FIRST_DAY = START.replace(hour=0) + timedelta(days=1)
+LAST_DAY = NOW.replace(hour=0)
+HOUR = NOW - timedelta(hours=3)
+
+TABLES = [
+    User, Blob, Document, ActivityLog, AnalyticsEvent, RequestMetric,
+    EventCountHourly, EventCountDaily, RequestMetricDaily, DailyActiveUser
+]
+
+
+def _seed(conn):
+    conn.execute(User.__table__.insert(), [
+        dict(id=f"user-{i}", email=f"user-{i}@example.com") for i in range(USERS)
+    ])
+    conn.execute(Document.__table__.insert(), [
+        dict(id=str(i), name=f"doc-{i}", category=f"category-{i % 5}",
+             owner_id=f"user-{i % USERS}", created_at=NOW - timedelta(minutes=i))
+        for i in range(ROWS)
+    ])
+    conn.execute(ActivityLog.__table__.insert(), [
+        dict(id=str(i), user_id=f"user-{i % USERS}", action=f"document.action-{i % 8}",
+             resource_type="document", created_at=NOW - timedelta(minutes=i))
+        for i in range(ROWS)
+    ])
+    conn.execute(AnalyticsEvent.__table__.insert(), [
+        dict(id=str(i), user_id=f"user-{i % USERS}", event_type=EVENT_TYPES[i % 3],
+             event_category="document", created_at=NOW - timedelta(minutes=i))
+        for i in range(ROWS)
+    ])
+
+    hours = [NOW - timedelta(hours=i) for i in range(DAYS * 24)]
+    days = [LAST_DAY - timedelta(days=i) for i in range(DAYS)]
+    conn.execute(EventCountHourly.__table__.insert(), [
+        dict(bucket_start=hour, event_type=event_type, event_category="document", count=10)
+        for hour in hours for event_type in EVENT_TYPES
+    ])
+    conn.execute(EventCountDaily.__table__.insert(), [
+        dict(bucket_start=day, event_type=event_type, event_category="document", count=240)
+        for day in days for event_type in EVENT_TYPES
+    ])
+    conn.execute(RequestMetric.__table__.insert(), [
+        dict(bucket_start=hour, method="GET", route=route, status_class="2xx",
+             request_count=10, sampled_count=10, duration_ms_sum=100.0, duration_ms_max=20.0)
+        for hour in hours for route in ROUTES
+    ])
+    conn.execute(RequestMetricDaily.__table__.insert(), [
+        dict(bucket_start=day, method="GET", route=route, status_class="2xx",
+             request_count=240, sampled_count=240, duration_ms_sum=2400.0, duration_ms_max=20.0)
+        for day in days for route in ROUTES
+    ])
+    conn.execute(DailyActiveUser.__table__.insert(), [
+        dict(day=day, user_id=f"user-{i}") for day in days for i in range(USERS)
+    ])
+
+
+@pytest.fixture(scope="module")
+def engine():
+    admin = create_engine(DATABASE_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+
+    engine = create_engine(DATABASE_URL, connect_args={"options": f"-csearch_path={SCHEMA}"})
+    Base.metadata.create_all(engine, tables=[model.__table__ for model in TABLES])
+    with engine.begin() as conn:
+        _seed(conn)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+
+    yield engine
+    engine.dispose()
+    with admin.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    admin.dispose()
+
+
+def _page(query, model, cursor=None):
+    return keyset_query(query, model, cursor).limit(51)
+
+
+def _event_counts(model, start, end):
+    return select(model.event_type, model.event_category, func.sum(model.count)).where(
+        model.bucket_start >= start, model.bucket_start < end
+    ).group_by(model.event_type, model.event_category)
+
+
+def _request_totals(model, start, end=None):
+    query = select(func.sum(model.duration_ms_sum), func.sum(model.sampled_count)).where(model.bucket_start >= start)
+    return query.where(model.bucket_start < end) if end is not None else query
+
+
+_category = func.coalesce(AnalyticsEvent.event_category, "")
+_activity_day = func.date_trunc(text("'day'"), ActivityLog.created_at)
+
+PAGES = {
+    "documents_by_owner": _page(
+        select(Document).where(Document.owner_id == "user-1"), Document),
+    "documents_by_owner_next_page": _page(
+        select(Document).where(Document.owner_id == "user-1"), Document, CURSOR),
+    "documents_by_owner_and_category": _page(
+        select(Document).where(Document.owner_id == "user-1", Document.category == "category-1"), Document),
+    "documents_by_owner_and_category_next_page": _page(
+        select(Document).where(Document.owner_id == "user-1", Document.category == "category-1"),
+        Document, CURSOR),
+    "logs_latest": _page(select(ActivityLog), ActivityLog),
+    "logs_next_page": _page(select(ActivityLog), ActivityLog, CURSOR),
+    "logs_by_date": _page(select(ActivityLog).where(ActivityLog.created_at >= SINCE), ActivityLog),
+    "logs_by_action": _page(select(ActivityLog).where(ActivityLog.action == "document.action-1"), ActivityLog),
+    "events_latest": _page(select(AnalyticsEvent), AnalyticsEvent),
+    "events_by_type": _page(select(AnalyticsEvent).where(AnalyticsEvent.event_type == "search"), AnalyticsEvent),
+    "events_by_type_next_page": _page(
+        select(AnalyticsEvent).where(AnalyticsEvent.event_type == "search"), AnalyticsEvent, CURSOR),
+    "events_by_date": _page(select(AnalyticsEvent).where(AnalyticsEvent.created_at >= SINCE), AnalyticsEvent),
+}
+
+HOT_QUERIES = {
+    **PAGES,
+    # AnalyticsRollupService.roll_up, one hour and one day at a time
+    "rollup_hour_event_counts": select(AnalyticsEvent.event_type, _category, func.count()).where(
+        AnalyticsEvent.created_at >= HOUR, AnalyticsEvent.created_at < HOUR + timedelta(hours=1)
+    ).group_by(AnalyticsEvent.event_type, _category),
+    "rollup_hour_active_users": select(distinct(ActivityLog.user_id)).where(
+        ActivityLog.created_at >= HOUR, ActivityLog.created_at < HOUR + timedelta(hours=1)
+    ),
+    "rollup_day_event_counts": _event_counts(EventCountHourly, LAST_DAY - timedelta(days=1), LAST_DAY),
+    "rollup_day_request_metrics": select(
+        RequestMetric.method, RequestMetric.route, RequestMetric.status_class,
+        func.sum(RequestMetric.request_count), func.sum(RequestMetric.sampled_count),
+        func.sum(RequestMetric.duration_ms_sum), func.max(RequestMetric.duration_ms_max)
+    ).where(
+        RequestMetric.bucket_start >= LAST_DAY - timedelta(days=1), RequestMetric.bucket_start < LAST_DAY
+    ).group_by(RequestMetric.method, RequestMetric.route, RequestMetric.status_class),
+    # AnalyticsRollupService.summary
+    "summary_daily_event_counts": _event_counts(EventCountDaily, FIRST_DAY, LAST_DAY),
+    "summary_hourly_event_counts": _event_counts(EventCountHourly, START, FIRST_DAY),
+    "summary_recent_event_counts": select(AnalyticsEvent.event_type, _category, func.count()).where(
+        AnalyticsEvent.created_at >= HIGH_WATER_MARK
+    ).group_by(AnalyticsEvent.event_type, _category),
+    "summary_request_metrics_daily": _request_totals(RequestMetricDaily, FIRST_DAY, LAST_DAY),
+    "summary_request_metrics": _request_totals(RequestMetric, START, FIRST_DAY),
+    "summary_request_metrics_recent": _request_totals(RequestMetric, LAST_DAY),
+    "summary_daily_active_users": select(DailyActiveUser.day, func.count()).where(
+        DailyActiveUser.day >= START.replace(hour=0)
+    ).group_by(DailyActiveUser.day),
+    "summary_recent_active_users": select(_activity_day, func.count(distinct(ActivityLog.user_id))).where(
+        ActivityLog.created_at >= HIGH_WATER_MARK,
+        ActivityLog.created_at < NOW,
+        ~exists().where(DailyActiveUser.day == _activity_day, DailyActiveUser.user_id == ActivityLog.user_id)
+    ).group_by(_activity_day),
+}
+
+
+def _nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def _plan(engine, statement):
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        # The seeded tables are small enough that scanning them would often be
+        # cheapest; with seq scans priced out, one is only chosen when no
+        # index can serve the query at all
+        conn.execute(text("SET enable_seqscan = off"))
+        plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_an_index(engine, name):
+    plan = _plan(engine, HOT_QUERIES[name])
+    nodes = list(_nodes(plan))
+
+    scans = [node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"]
+    assert not scans, f"{name} scans {scans}: {json.dumps(plan, indent=2)}"
+    if name in PAGES:
+        # Sorting the whole match set instead of reading the index in order
+        # (an Incremental Sort of rows with equal created_at by id is fine)
+        assert not any(node["Node Type"] == "Sort" for node in nodes), f"{name}: {json.dumps(plan, indent=2)}"
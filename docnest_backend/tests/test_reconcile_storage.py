@@ -0,0 +1,95 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.jobs import reconcile_storage
+from app.jobs.reconcile_storage import reconcile_orphans
+from app.models.blob import Blob
+from app.models.document import Document
+from app.services.storage.memory import MemoryStorageBackend
+
+
+@pytest.fixture
+def db():
+    # One shared connection: the job queries from a worker thread
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Blob.__table__.create(engine)
+    Document.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def storage(db):
+    storage = MemoryStorageBackend()
+    for key in [
+        "documents/u1/kept.pdf",
+        "documents/u1/legacy.pdf",
+        "documents/blobs/ab/abc/shared.pdf",
+        "documents/u1/orphan-1.pdf",
+        "documents/u2/orphan-2.pdf",
+        "avatars/u1.png",
+    ]:
+        storage.objects[key] = (b"%PDF-1.4", "application/pdf")
+
+    db.add_all([
+        Blob(sha256="abc", storage_key="documents/blobs/ab/abc/shared.pdf", size=8, ref_count=1),
+        Document(name="kept", category="other", owner_id="u1", file_path="documents/u1/kept.pdf"),
+        Document(
+            name="legacy",
+            category="other",
+            owner_id="u1",
+            file_path="https://bucket.s3.us-east-1.amazonaws.com/documents/u1/legacy.pdf"
+        ),
+    ])
+    db.commit()
+    return storage
+
+
+def test_dry_run_reports_without_deleting(db, storage):
+    stats = asyncio.run(reconcile_orphans(db, storage, dry_run=True, page_size=2))
+
+    assert stats.scanned == 5
+    assert stats.pages == 3
+    assert stats.referenced == 3
+    assert stats.orphaned == 2
+    assert stats.deleted == 0
+    assert len(storage.objects) == 6
+    assert reconcile_storage.get_last_reconcile_stats()["orphaned"] == 2
+
+
+def test_deletes_only_unreferenced_keys_under_prefix(db, storage, monkeypatch):
+    monkeypatch.setattr(reconcile_storage, "DELETE_BATCH_SIZE", 1)
+    stats = asyncio.run(reconcile_orphans(db, storage, grace_period=timedelta(0)))
+
+    assert stats.deleted == 2
+    assert stats.failed == 0
+    assert sorted(storage.objects) == [
+        "avatars/u1.png",
+        "documents/blobs/ab/abc/shared.pdf",
+        "documents/u1/kept.pdf",
+        "documents/u1/legacy.pdf",
+    ]
+
+
+def test_recent_objects_are_left_alone(db, tmp_path):
+    from app.services.storage.local import LocalStorageBackend
+
+    storage = LocalStorageBackend(root=str(tmp_path))
+    (tmp_path / "documents" / "u1").mkdir(parents=True)
+    (tmp_path / "documents" / "u1" / "fresh.pdf").write_bytes(b"%PDF-1.4")
+
+    stats = asyncio.run(reconcile_orphans(db, storage, grace_period=timedelta(hours=1)))
+
+    assert stats.skipped_recent == 1
+    assert stats.deleted == 0
+    assert (tmp_path / "documents" / "u1" / "fresh.pdf").exists()
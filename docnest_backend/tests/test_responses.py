@@ -0,0 +1,27 @@
+import json
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.document import Document
+from app.schemas.document import DocumentListAdapter, DocumentResponse
+from app.utils.responses import list_response
+
+
+def test_list_response_matches_response_model_output():
+    documents = [
+        Document(
+            id=f"doc-{i}", name=f"Scan {i}", description=None if i else "Front page",
+            file_path="documents/u1/scan.pdf", file_size=1024, file_type="application/pdf",
+            category="medical", version=1, is_shared=False, owner_id="user-1",
+            created_at=datetime(2026, 10, 17, 12, 0, 0, 123456), modified_at=datetime(2026, 10, 17, 12, 30)
+        )
+        for i in range(2)
+    ]
+
+    response = list_response(DocumentListAdapter, documents, {"X-Next-Cursor": "abc"})
+
+    expected = jsonable_encoder([DocumentResponse.model_validate(document) for document in documents])
+    assert json.loads(response.body) == expected
+    assert response.media_type == "application/json"
+    assert response.headers["x-next-cursor"] == "abc"
@@ -0,0 +1,27 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.locks import try_advisory_lock
+from app.jobs import scheduler
+
+
+def test_exclusive_job_runs_without_postgres(monkeypatch):
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        monkeypatch.setattr(scheduler, "try_advisory_lock", lambda name: try_advisory_lock(name, engine))
+        runs = []
+
+        async def job():
+            runs.append(1)
+
+        scheduler.schedule_periodic("test_job", 0.01, job, exclusive=True)
+        for _ in range(100):
+            if len(runs) >= 2:
+                break
+            await asyncio.sleep(0.01)
+        await scheduler.cancel_scheduled()
+        await engine.dispose()
+        return len(runs)
+
+    assert asyncio.run(run()) >= 2
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.blob import Blob
+from app.models.document import Document
+from app.services.search_service import SearchService, search_terms
+
+
+def _with_db(test):
+    """Run an async test body against a fresh in-memory SQLite session"""
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            for model in (Blob, Document):
+                await conn.run_sync(model.__table__.create)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                await test(db)
+        finally:
+            await engine.dispose()
+    asyncio.run(run())
+
+
+async def _seed(db):
+    db.add_all([
+        Document(name="Passport scan", description="Renewed passport, valid until 2033",
+                 category="government", owner_id="user-1"),
+        Document(name="Vaccination record", description="Needed for the passport trip",
+                 category="medical", owner_id="user-1"),
+        Document(name="Gas bill", description=None, category="other", owner_id="user-1"),
+        Document(name="Passport", description="Someone else's", category="government", owner_id="user-2"),
+    ])
+    await db.commit()
+
+
+def _names(results):
+    return [result["document"].name for result in results]
+
+
+def test_search_terms_drop_query_syntax():
+    assert search_terms('Passport "scan" OR 2023*') == ["passport", "scan", "or", "2023"]
+    assert search_terms('"* - ()') == []
+
+
+def test_name_matches_rank_above_description_matches():
+    async def test(db):
+        await _seed(db)
+        results = await SearchService(db).search("user-1", "passport", limit=10)
+
+        assert _names(results) == ["Passport scan", "Vaccination record"]
+        assert results[0]["rank"] > results[1]["rank"]
+        assert results[0]["name_highlight"] == "<mark>Passport</mark> scan"
+        assert "<mark>passport</mark>" in results[0]["snippet"]
+        assert results[1]["name_highlight"] == "Vaccination record"
+
+    _with_db(test)
+
+
+def test_terms_match_as_prefixes_and_all_must_match():
+    async def test(db):
+        await _seed(db)
+        search = SearchService(db)
+
+        assert _names(await search.search("user-1", "vacc rec", limit=10)) == ["Vaccination record"]
+        assert await search.search("user-1", "passport gas", limit=10) == []
+        assert _names(await search.search("user-1", "pass", limit=1)) == ["Passport scan"]
+        assert _names(await search.search("user-1", "pass", limit=10, category="medical")) == [
+            "Vaccination record"
+        ]
+
+        gas = await search.search("user-1", "gas", limit=10)
+        assert gas[0]["snippet"] is None
+
+    _with_db(test)
+
+
+def test_index_follows_updates_and_deletes():
+    async def test(db):
+        await _seed(db)
+        search = SearchService(db)
+
+        await db.execute(update(Document).where(Document.name == "Gas bill").values(name="Electricity bill"))
+        await db.execute(delete(Document).where(Document.name == "Passport scan"))
+        await db.commit()
+
+        assert await search.search("user-1", "gas", limit=10) == []
+        assert _names(await search.search("user-1", "electric", limit=10)) == ["Electricity bill"]
+        assert _names(await search.search("user-1", "passport", limit=10)) == ["Vaccination record"]
+
+    _with_db(test)
+
+
+def test_query_without_words_is_rejected():
+    async def test(db):
+        with pytest.raises(HTTPException) as error:
+            await SearchService(db).search("user-1", "**", limit=10)
+        assert error.value.status_code == 400
+
+    _with_db(test)
@@ -0,0 +1,114 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.services.storage.local import LocalStorageBackend
+from app.services.storage.memory import MemoryStorageBackend
+
+CONTENT = b"%PDF-1.4 " + bytes(range(256)) * 64
+
+
+@pytest.fixture(params=["local", "memory"])
+def backend(request, tmp_path):
+    if request.param == "local":
+        return LocalStorageBackend(root=str(tmp_path))
+    return MemoryStorageBackend()
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+async def _read(stream):
+    return b"".join([chunk async for chunk in stream.chunks])
+
+
+def test_upload_open_delete_roundtrip(backend):
+    upload = UploadFile(file=io.BytesIO(CONTENT), filename="scan.pdf")
+    stored = _run(backend.upload(upload, "documents/u1/scan.pdf"))
+
+    assert stored.size == len(CONTENT)
+    assert stored.content_type == "application/pdf"
+
+    stream = _run(backend.open("documents/u1/scan.pdf"))
+    assert not stream.is_partial
+    assert _run(_read(stream)) == CONTENT
+
+    _run(backend.delete("documents/u1/scan.pdf"))
+    with pytest.raises(HTTPException) as exc:
+        _run(backend.open("documents/u1/scan.pdf"))
+    assert exc.value.status_code == 404
+
+
+def test_ranged_reads(backend):
+    upload = UploadFile(file=io.BytesIO(CONTENT), filename="scan.pdf")
+    _run(backend.upload(upload, "documents/u1/scan.pdf"))
+
+    stream = _run(backend.open("documents/u1/scan.pdf", byte_range="bytes=10-19"))
+    assert stream.content_range == f"bytes 10-19/{len(CONTENT)}"
+    assert _run(_read(stream)) == CONTENT[10:20]
+
+    stream = _run(backend.open("documents/u1/scan.pdf", byte_range="bytes=-5"))
+    assert _run(_read(stream)) == CONTENT[-5:]
+
+    with pytest.raises(HTTPException) as exc:
+        _run(backend.open("documents/u1/scan.pdf", byte_range=f"bytes={len(CONTENT)}-"))
+    assert exc.value.status_code == 416
+
+
+def test_local_full_download_exposes_path(tmp_path):
+    backend = LocalStorageBackend(root=str(tmp_path))
+    upload = UploadFile(file=io.BytesIO(CONTENT), filename="scan.pdf")
+    _run(backend.upload(upload, "documents/u1/scan.pdf"))
+
+    stream = _run(backend.open("documents/u1/scan.pdf"))
+    assert stream.path == str(tmp_path / "documents" / "u1" / "scan.pdf")
+
+
+def test_local_rejects_keys_outside_root(tmp_path):
+    backend = LocalStorageBackend(root=str(tmp_path))
+    with pytest.raises(HTTPException):
+        _run(backend.open("../etc/passwd"))
+
+
+def test_head_reports_size_and_missing_objects(backend):
+    upload = UploadFile(file=io.BytesIO(CONTENT), filename="scan.pdf")
+    _run(backend.upload(upload, "documents/u1/scan.pdf"))
+
+    info = _run(backend.head("documents/u1/scan.pdf"))
+    assert info.size == len(CONTENT)
+    assert _run(backend.head("documents/u1/missing.pdf")) is None
+
+
+def test_presigned_upload_stand_in(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api.v1.storage_router import storage_router
+    from app.services import storage
+
+    backend = MemoryStorageBackend()
+    monkeypatch.setattr(storage, "_backend", backend)
+    app = FastAPI()
+    app.include_router(storage_router, prefix="/api/v1/storage")
+    client = TestClient(app)
+
+    form = _run(backend.create_presigned_upload("documents/u1/uploads/a.pdf", "application/pdf", 1024 * 1024))
+    path = form["url"].split("/api/v1/storage", 1)[1]
+
+    response = client.post(
+        f"/api/v1/storage{path}",
+        data={"Content-Type": "image/png"},
+        files={"file": ("a.pdf", CONTENT, "application/pdf")}
+    )
+    assert response.status_code == 403
+
+    response = client.post(
+        f"/api/v1/storage{path}",
+        data=form["fields"],
+        files={"file": ("a.pdf", CONTENT, "application/pdf")}
+    )
+    assert response.status_code == 204
+    assert _run(backend.head("documents/u1/uploads/a.pdf")).size == len(CONTENT)
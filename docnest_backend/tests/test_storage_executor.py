@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.storage_executor import StorageExecutor
+
+
+def test_blocking_calls_do_not_stall_the_event_loop():
+    executor = StorageExecutor(max_workers=2, max_queue=10)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.gather(*(executor.run(time.sleep, 0.1) for _ in range(2)))
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(scenario()) >= 5
+    assert executor.stats()["completed"] == 2
+    executor.shutdown()
+
+
+def test_queue_limit_rejects_with_503():
+    executor = StorageExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(executor.run(lambda: None))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as exc:
+            await executor.run(lambda: None)
+        assert exc.value.status_code == 503
+        assert executor.stats()["queue_depth"] == 1
+        release.set()
+        await asyncio.gather(blocked, queued)
+
+    asyncio.run(scenario())
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["peak_queue_depth"] == 1
+    executor.shutdown()
+
+
+def test_iterate_drains_blocking_iterator():
+    executor = StorageExecutor(max_workers=1, max_queue=10)
+
+    async def collect():
+        return [item async for item in executor.iterate(iter([b"a", b"b", b"c"]))]
+
+    assert asyncio.run(collect()) == [b"a", b"b", b"c"]
+    executor.shutdown()
+
+
+def test_cancelled_waiters_give_back_their_queue_slots():
+    executor = StorageExecutor(max_workers=1, max_queue=3)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        waiters = [asyncio.ensure_future(executor.run(lambda: None)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert executor.stats()["queue_depth"] == 2
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        assert executor.stats()["queue_depth"] == 0
+        release.set()
+        await blocked
+        assert await executor.run(lambda: "ok") == "ok"
+
+    asyncio.run(scenario())
+    stats = executor.stats()
+    assert (stats["queue_depth"], stats["active"], stats["completed"]) == (0, 0, 2)
+    executor.shutdown()
@@ -0,0 +1,211 @@
+import asyncio
+import gzip
+import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.blob import Blob
+from app.models.document import Document
+from app.models.text_extraction import TextExtraction
+from app.services.extraction_pipeline import STALE_PROCESSING, ExtractionPipeline, queue_extraction
+from app.services.search_service import SearchService
+from app.services.storage.compression import GZIP
+from app.services.storage.memory import MemoryStorageBackend
+from app.services.text_extraction import DOCX_TYPE, PDF_TYPE, ExtractionError, extract_text
+
+
+def _pdf(text: str) -> bytes:
+    """Single-page PDF showing `text` in Helvetica"""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out, offsets = io.BytesIO(), []
+    out.write(b"%PDF-1.4\n")
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def _docx(*paragraphs: str) -> bytes:
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(
+            "word/document.xml",
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f"<w:body>{body}</w:body></w:document>"
+        )
+    return buffer.getvalue()
+
+
+def test_extracts_pdf_docx_and_plain_text():
+    assert extract_text(_pdf("Passport number K1234567"), PDF_TYPE, 1000) == "Passport number K1234567"
+    assert extract_text(_docx("Offer letter", "Start date:  May"), DOCX_TYPE, 1000) == "Offer letter Start date: May"
+    assert extract_text(b"line one\n\x00line two", "text/plain", 1000) == "line one line two"
+    assert extract_text(b"a" * 50, "text/plain", 10) == "a" * 10
+
+
+def test_unreadable_files_raise_extraction_error():
+    with pytest.raises(ExtractionError):
+        extract_text(b"not a pdf", PDF_TYPE, 1000)
+    with pytest.raises(ExtractionError):
+        extract_text(b"\x89PNG", "image/png", 1000)
+
+
+def _with_pipeline(test):
+    """Run a test body with a pipeline over in-memory SQLite and storage"""
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            for model in (Blob, Document, TextExtraction):
+                await conn.run_sync(model.__table__.create)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        storage = MemoryStorageBackend()
+        # Threads stand in for the process pool; the code path is the same
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pipeline = ExtractionPipeline(sessions, max_workers=1, storage=storage, executor=executor)
+            try:
+                await test(sessions, storage, pipeline)
+            finally:
+                await engine.dispose()
+    asyncio.run(run())
+
+
+async def _add_document(sessions, key: str, file_type: str, name: str = "Scan") -> str:
+    async with sessions() as db:
+        document = Document(name=name, category="other", owner_id="user-1", file_path=key, file_type=file_type)
+        db.add(document)
+        await db.flush()
+        await queue_extraction(db, document)
+        await db.commit()
+        return document.id
+
+
+async def _extraction(sessions, document_id: str) -> TextExtraction:
+    async with sessions() as db:
+        return await db.get(TextExtraction, document_id)
+
+
+def test_extracted_text_becomes_searchable():
+    async def test(sessions, storage, pipeline):
+        storage.objects["documents/a.pdf"] = (_pdf("Renewal receipt for vehicle KA01"), PDF_TYPE)
+        storage.objects["documents/b.docx"] = (gzip.compress(_docx("Lease agreement")), DOCX_TYPE)
+        storage.encodings["documents/b.docx"] = GZIP
+        pdf_id = await _add_document(sessions, "documents/a.pdf", PDF_TYPE)
+        docx_id = await _add_document(sessions, "documents/b.docx", DOCX_TYPE)
+
+        assert await pipeline.process(pdf_id) == "done"
+        assert await pipeline.process(docx_id) == "done"
+        assert await pipeline.process(pdf_id) is None
+
+        extraction = await _extraction(sessions, pdf_id)
+        assert (extraction.attempts, extraction.extracted_chars) == (1, len("Renewal receipt for vehicle KA01"))
+
+        async with sessions() as db:
+            results = await SearchService(db).search("user-1", "vehicle", limit=10)
+            assert [r["document"].id for r in results] == [pdf_id]
+            assert "<mark>vehicle</mark>" in results[0]["snippet"]
+            assert [r["document"].id for r in await SearchService(db).search("user-1", "lease", limit=10)] == [docx_id]
+
+    _with_pipeline(test)
+
+
+def test_failures_are_retried_with_backoff_then_given_up():
+    async def test(sessions, storage, pipeline):
+        document_id = await _add_document(sessions, "documents/missing.pdf", PDF_TYPE)
+
+        assert await pipeline.process(document_id) == "pending"
+        extraction = await _extraction(sessions, document_id)
+        assert extraction.attempts == 1 and extraction.last_error
+        # Not due yet
+        assert await pipeline.sweep() == 0
+
+        for _ in range(3):
+            assert await pipeline.process(document_id) == "pending"
+        assert await pipeline.process(document_id) == "failed"
+        assert (await _extraction(sessions, document_id)).attempts == 5
+
+    _with_pipeline(test)
+
+
+def test_corrupt_and_unsupported_files_are_not_retried():
+    async def test(sessions, storage, pipeline):
+        storage.objects["documents/broken.pdf"] = (b"%PDF-1.4 truncated", PDF_TYPE)
+        broken_id = await _add_document(sessions, "documents/broken.pdf", PDF_TYPE)
+        photo_id = await _add_document(sessions, "documents/photo.jpg", "image/jpeg")
+
+        assert await pipeline.process(broken_id) == "failed"
+        assert (await _extraction(sessions, photo_id)).status == "unsupported"
+        assert await pipeline.process(photo_id) is None
+        assert await pipeline.sweep() == 0
+
+    _with_pipeline(test)
+
+
+def test_replaced_file_never_gets_the_old_text():
+    async def test(sessions, storage, pipeline):
+        storage.objects["documents/old.pdf"] = (_pdf("old contract"), PDF_TYPE)
+        document_id = await _add_document(sessions, "documents/old.pdf", PDF_TYPE)
+
+        read = pipeline._read
+
+        async def read_then_replace(key):
+            data = await read(key)
+            # The file is replaced while the old one is being parsed
+            async with sessions() as db:
+                document = await db.get(Document, document_id)
+                document.file_path = "documents/new.pdf"
+                await db.flush()
+                await queue_extraction(db, document)
+                await db.commit()
+            return data
+
+        pipeline._read = read_then_replace
+        assert await pipeline.process(document_id) == "done"
+
+        async with sessions() as db:
+            assert await db.scalar(select(Document.content_text).where(Document.id == document_id)) is None
+        extraction = await _extraction(sessions, document_id)
+        assert (extraction.status, extraction.source_key) == ("pending", "documents/new.pdf")
+
+    _with_pipeline(test)
+
+
+def test_document_claimed_elsewhere_is_not_extracted_twice():
+    async def test(sessions, storage, pipeline):
+        storage.objects["documents/a.pdf"] = (_pdf("Lease agreement"), PDF_TYPE)
+        document_id = await _add_document(sessions, "documents/a.pdf", PDF_TYPE)
+
+        async def claimed_by_another_worker(updated_at):
+            async with sessions() as db:
+                extraction = await db.get(TextExtraction, document_id)
+                extraction.status, extraction.attempts, extraction.updated_at = "processing", 1, updated_at
+                await db.commit()
+
+        await claimed_by_another_worker(datetime.utcnow())
+        assert await pipeline.process(document_id) is None
+        assert (await _extraction(sessions, document_id)).attempts == 1
+
+        # Abandoned by a worker that died mid-extraction: taken over
+        await claimed_by_another_worker(datetime.utcnow() - STALE_PROCESSING - timedelta(minutes=1))
+        assert await pipeline.process(document_id) == "done"
+        assert (await _extraction(sessions, document_id)).attempts == 2
+
+    _with_pipeline(test)
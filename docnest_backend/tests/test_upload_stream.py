@@ -0,0 +1,133 @@
+import asyncio
+import gzip
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.services.storage.s3 import S3_MIN_PART_SIZE, stream_upload_to_s3
+
+
+class RecordingS3Client:
+    """Minimal stand-in for the boto3 client calls used by the upload path"""
+
+    def __init__(self):
+        self.objects = {}
+        self.parts = {}
+        self.aborted = []
+        self.encodings = {}
+
+    def put_object(self, Bucket, Key, Body, ContentType, Metadata, ContentEncoding=None):
+        self.objects[Key] = Body
+        self.encodings[Key] = ContentEncoding
+
+    def create_multipart_upload(self, Bucket, Key, ContentType, Metadata, ContentEncoding=None):
+        self.parts[Key] = []
+        self.encodings[Key] = ContentEncoding
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.parts[Key].append((PartNumber, Body))
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.objects[Key] = b"".join(body for _, body in self.parts[Key])
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted.append(Key)
+
+
+def _upload(content: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename="test.pdf")
+
+
+def test_small_file_uses_single_put():
+    client = RecordingS3Client()
+    content = b"%PDF-1.4 small document"
+
+    size, file_type, sha256, encoding = asyncio.run(
+        stream_upload_to_s3(client, "bucket", _upload(content), "documents/a.pdf")
+    )
+
+    assert client.objects["documents/a.pdf"] == content
+    assert client.parts == {}
+    assert size == len(content)
+    assert file_type == "application/pdf"
+    assert sha256 == hashlib.sha256(content).hexdigest()
+    assert encoding is None
+
+
+def test_large_file_is_sent_in_parts(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 4 * S3_MIN_PART_SIZE)
+    client = RecordingS3Client()
+    content = b"%PDF-1.4 " + b"x" * (2 * S3_MIN_PART_SIZE + 123)
+
+    size, _, sha256, _ = asyncio.run(
+        stream_upload_to_s3(
+            client, "bucket", _upload(content), "documents/b.pdf",
+            chunk_size=S3_MIN_PART_SIZE
+        )
+    )
+
+    part_numbers = [number for number, _ in client.parts["documents/b.pdf"]]
+    assert part_numbers == [1, 2, 3]
+    assert client.objects["documents/b.pdf"] == content
+    assert size == len(content)
+    assert sha256 == hashlib.sha256(content).hexdigest()
+
+
+def test_oversized_upload_is_aborted(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 2 * S3_MIN_PART_SIZE + 1)
+    client = RecordingS3Client()
+    content = b"x" * (4 * S3_MIN_PART_SIZE)
+
+    with pytest.raises(HTTPException):
+        asyncio.run(
+            stream_upload_to_s3(
+                client, "bucket", _upload(content), "documents/c.pdf",
+                chunk_size=S3_MIN_PART_SIZE
+            )
+        )
+
+    assert client.aborted == ["documents/c.pdf"]
+    assert "documents/c.pdf" not in client.objects
+
+
+def test_compressible_upload_is_stored_gzip_encoded(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "MAX_FILE_SIZE", 8 * S3_MIN_PART_SIZE)
+    client = RecordingS3Client()
+    content = b"2026-10-17,invoice line,100.00\n" * 400000
+
+    size, _, sha256, encoding = asyncio.run(
+        stream_upload_to_s3(
+            client, "bucket", _upload(content), "documents/d.txt",
+            chunk_size=S3_MIN_PART_SIZE, compress=True
+        )
+    )
+
+    assert encoding == "gzip"
+    assert client.encodings["documents/d.txt"] == "gzip"
+    assert len(client.objects["documents/d.txt"]) < len(content) // 10
+    assert gzip.decompress(client.objects["documents/d.txt"]) == content
+    assert size == len(content)
+    assert sha256 == hashlib.sha256(content).hexdigest()
+
+
+def test_incompressible_types_are_stored_raw():
+    client = RecordingS3Client()
+    content = b"\xff\xd8\xff\xe0\x00\x10JFIF" + b"\x00" * 4096
+
+    _, file_type, _, encoding = asyncio.run(
+        stream_upload_to_s3(client, "bucket", _upload(content), "documents/e.jpg", compress=True)
+    )
+
+    assert file_type == "image/jpeg"
+    assert encoding is None
+    assert client.objects["documents/e.jpg"] == content
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.exceptions import StorageQuotaExceeded
+from app.models.category import Category
+from app.models.usage import UserUsage
+from app.services.category_service import CategoryService
+from app.services.usage_service import UsageService
+
+
+def _with_db(test):
+    """Run an async test body against a fresh in-memory SQLite session"""
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            for model in (Category, UserUsage):
+                await conn.run_sync(model.__table__.create)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                await test(db)
+        finally:
+            await engine.dispose()
+    asyncio.run(run())
+
+
+def test_usage_totals_and_category_split():
+    async def test(db):
+        usage, categories = UsageService(db), CategoryService(db)
+        for category, size in [("medical", 1000), ("medical", 500), ("receipts", 250)]:
+            await categories.adjust_count("user-1", category, 1, bytes_delta=size)
+            await usage.adjust("user-1", size, 1)
+        # One medical document deleted
+        await categories.adjust_count("user-1", "medical", -1, bytes_delta=-500)
+        await usage.adjust("user-1", -500, -1)
+        await db.commit()
+
+        report = await usage.get_usage("user-1")
+
+        assert report["total_bytes"] == 1250
+        assert report["document_count"] == 2
+        split = {c["name"]: (c["document_count"], c["total_bytes"]) for c in report["categories"]}
+        assert split["medical"] == (1, 1000)
+        assert split["receipts"] == (1, 250)
+        assert split["government"] == (0, 0)
+        assert (await usage.get_usage("user-2"))["total_bytes"] == 0
+
+    _with_db(test)
+
+
+def test_quota_is_checked_against_the_counters(monkeypatch):
+    async def test(db):
+        usage = UsageService(db)
+        await usage.adjust("user-1", 900, 1)
+        await db.commit()
+
+        monkeypatch.setattr(settings, "STORAGE_QUOTA_BYTES", 1000)
+        await usage.check_quota("user-1", 100)
+        with pytest.raises(StorageQuotaExceeded) as exc_info:
+            await usage.check_quota("user-1", 101)
+        assert exc_info.value.status_code == 413
+
+        # A replacement that shrinks the file always fits
+        await usage.check_quota("user-1", -400)
+
+        monkeypatch.setattr(settings, "STORAGE_QUOTA_BYTES", 0)
+        await usage.check_quota("user-1", 10 ** 12)
+
+    _with_db(test)
@@ -47,19 +47,30 @@ class DocumentService {
   Future<List<Document>> getDocuments() async {
     try {
       print('Fetching documents from: ${ApiConfig.documentsUrl}');
-      final response = await http.get(
-        Uri.parse(ApiConfig.documentsUrl),
-        headers: ApiConfig.authHeaders(token),
-      );
+      final documents = <Document>[];
+      String? cursor;
+
+      // The list is paged; X-Next-Cursor points at the next page until the last
+      do {
+        final uri = Uri.parse(ApiConfig.documentsUrl).replace(
+          queryParameters: cursor == null ? null : {'cursor': cursor},
+        );
+        final response = await http.get(
+          uri,
+          headers: ApiConfig.authHeaders(token),
+        );
+
+        if (response.statusCode != 200) {
+          return _handleResponse(response, (json) => []);
+        }
 
-      if (response.statusCode == 200) {
         List<dynamic> data = json.decode(response.body);
-        return data
-            .map((doc) => Document.fromJson(doc as Map<String, dynamic>))
-            .toList();
-      }
+        documents.addAll(data
+            .map((doc) => Document.fromJson(doc as Map<String, dynamic>)));
+        cursor = response.headers['x-next-cursor'];
+      } while (cursor != null);
 
-      return _handleResponse(response, (json) => []);
+      return documents;
     } catch (e) {
       print('Error in getDocuments: $e');
       if (e.toString().contains('Connection refused')) {